@@ -9,6 +9,7 @@ import submissionRoutes from './routes/submissions.js';
 import statisticsRoutes from './routes/statistics.js';
 import sqlRoutes from './routes/sql.js';
 import exercise1StatsRoutes from './routes/exercise1-stats.js';
+import { replicaStats } from './config/database.js';
 
 // Load environment variables
 dotenv.config();
@@ -33,7 +34,8 @@ app.get('/health', (req, res) => {
   res.json({ 
     status: 'OK', 
     timestamp: new Date().toISOString(),
-    message: 'Hands-on Training System API is running'
+    message: 'Hands-on Training System API is running',
+    replica: replicaStats()
   });
 });
 
@@ -1,5 +1,6 @@
 import pg from 'pg';
 import dotenv from 'dotenv';
+import { readRouter } from './replica.js';
 
 dotenv.config();
 
@@ -23,6 +24,36 @@ const dbConfig = {
 // Create connection pool
 const pool = new Pool(dbConfig);
 
+const envInt = (name, fallback) => {
+  const value = parseInt(process.env[name] || '', 10);
+  return Number.isNaN(value) ? fallback : value;
+};
+
+// Optional read-only streaming replica for the statistics endpoints and the SQL console;
+// unset DB_READ_* settings fall back to the primary's
+const readPool = process.env.DB_READ_HOST ? new Pool({
+  ...dbConfig,
+  host: process.env.DB_READ_HOST,
+  port: process.env.DB_READ_PORT || dbConfig.port,
+  database: process.env.DB_READ_NAME || dbConfig.database,
+  user: process.env.DB_READ_USER || dbConfig.user,
+  password: process.env.DB_READ_PASSWORD || dbConfig.password,
+  max: envInt('DB_READ_POOL_MAX', 20),
+  ssl: process.env.DB_READ_HOST.includes('rds.amazonaws.com')
+    ? { rejectUnauthorized: false }
+    : false,
+}) : null;
+
+const maxLagMs = envInt('DB_READ_MAX_LAG_MS', 1000);
+const checkIntervalMs = envInt('DB_READ_LAG_CHECK_MS', 1000);
+const readRouting = readRouter({
+  primary: pool,
+  replica: readPool,
+  maxLagMs,
+  checkIntervalMs,
+  readYourWritesMs: envInt('DB_READ_YOUR_WRITES_MS', maxLagMs + 2 * checkIntervalMs)
+});
+
 // Test database connection
 pool.on('connect', () => {
   console.log('Connected to PostgreSQL database');
@@ -33,13 +64,31 @@ pool.on('error', (err) => {
   process.exit(-1);
 });
 
-// Helper function to execute queries
+readPool?.on('error', (err) => {
+  console.error('Unexpected error on idle replica client', err);
+});
+
+// Helper function to execute queries; `text` is SQL text or a catalog statement from sql(name, values)
 export const query = async (text, params) => {
   const start = Date.now();
   try {
     const res = await pool.query(text, params);
     const duration = Date.now() - start;
-    console.log('Executed query', { text, duration, rows: res.rowCount });
+    console.log('Executed query', { text: text.name || text.text || text, duration, rows: res.rowCount });
+    return res;
+  } catch (error) {
+    console.error('Database query error:', error);
+    throw error;
+  }
+};
+
+// Read-only query that may be served by the replica while it is within DB_READ_MAX_LAG_MS
+export const readQuery = async (text, params) => {
+  const start = Date.now();
+  try {
+    const res = await readRouting.query(target => target.query(text, params));
+    const duration = Date.now() - start;
+    console.log('Executed read query', { text: text.name || text.text || text, duration, rows: res.rowCount });
     return res;
   } catch (error) {
     console.error('Database query error:', error);
@@ -52,9 +101,22 @@ export const getClient = async () => {
   return await pool.connect();
 };
 
+// Run `callback(client)` on a replica connection (or the primary, see readQuery)
+export const withReadClient = (callback) => readRouting.query(async (target) => {
+  const client = await target.connect();
+  try {
+    return await callback(client);
+  } finally {
+    client.release();
+  }
+});
+
+// Replica lag and routing counters for /health
+export const replicaStats = () => readRouting.stats();
+
 // Helper function to close the pool
 export const closePool = async () => {
-  await pool.end();
+  await Promise.all([pool.end(), readRouting.close()]);
 };
 
 export default pool;
\ No newline at end of file
@@ -0,0 +1,124 @@
+// Read routing between the primary pool and an optional read-only streaming replica
+//
+// Reads go to the replica only while its measured replay lag is at most `maxLagMs` (checked every
+// `checkIntervalMs` on the replica itself); before the first check, after a failed check or a
+// connection error, they go to the primary. A student who just wrote is pinned to the primary for
+// `readYourWritesMs`, so their own submission is never missing from what they read next. The
+// window is kept in this process only, which is enough for a single API instance.
+// Without a replica every read goes to the primary.
+//
+// Kept as two identical copies, exercise1-api/replica.js and backend/src/config/replica.js (the two
+// servers are deployed separately and share no package); change both together.
+
+// Lag is 0 when the WAL receiver is streaming and everything received has been replayed (an idle
+// primary does not advance pg_last_xact_replay_timestamp()), or when the "replica" is not in recovery
+// at all. Once the receiver stops, received and replayed LSNs stay equal, so the lag is measured from
+// the last replayed transaction instead. pg_stat_wal_receiver.status is only visible to roles with
+// pg_read_all_stats (e.g. pg_monitor); without it the replica counts as caught up only while busy.
+const LAG_SQL = `
+  SELECT
+    pg_is_in_recovery() AS in_recovery,
+    CASE
+      WHEN NOT pg_is_in_recovery() THEN 0
+      WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn()
+        AND EXISTS (SELECT 1 FROM pg_stat_wal_receiver WHERE status = 'streaming') THEN 0
+      ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()) * 1000, 0)
+    END AS lag_ms
+`;
+
+// Connection-level failures and recovery conflicts are worth retrying on the primary;
+// SQL errors (which carry a severity) would fail there too
+function shouldFallBack(error) {
+  return !error.severity || error.code === '40001';
+}
+
+export function readRouter({ primary, replica = null, maxLagMs, checkIntervalMs, readYourWritesMs }) {
+  const recentWrites = new Map();
+  const counts = { replica: 0, primary: 0, fallback: 0, readYourWrites: 0 };
+  let health = { healthy: false, inRecovery: null, lagMs: null, checkedAt: null, error: null };
+  let timer = null;
+
+  async function checkLag() {
+    try {
+      const { rows } = await replica.query(LAG_SQL);
+      const lagMs = Math.round(Number(rows[0].lag_ms));
+      health = {
+        healthy: lagMs <= maxLagMs,
+        inRecovery: rows[0].in_recovery,
+        lagMs,
+        checkedAt: new Date().toISOString(),
+        error: null
+      };
+    } catch (error) {
+      health = { ...health, healthy: false, checkedAt: new Date().toISOString(), error: error.message };
+    }
+
+    const now = Date.now();
+    for (const [key, until] of recentWrites) {
+      if (until <= now) recentWrites.delete(key);
+    }
+  }
+
+  if (replica) {
+    checkLag();
+    timer = setInterval(checkLag, checkIntervalMs);
+    timer.unref();
+  }
+
+  function pinnedToPrimary(studentKey) {
+    if (studentKey == null) return false;
+    const until = recentWrites.get(studentKey);
+    if (until === undefined) return false;
+    if (until > Date.now()) return true;
+    recentWrites.delete(studentKey);
+    return false;
+  }
+
+  return {
+    // Call after a student's write has committed
+    noteWrite(studentKey) {
+      if (replica && studentKey != null) {
+        recentWrites.set(studentKey, Date.now() + readYourWritesMs);
+      }
+    },
+
+    // `run(pool)` executes the read on the given pool; `studentKey` identifies whose data is read
+    async query(run, studentKey = null) {
+      if (!replica || !health.healthy) {
+        counts.primary++;
+        return run(primary);
+      }
+      if (pinnedToPrimary(studentKey)) {
+        counts.readYourWrites++;
+        return run(primary);
+      }
+      try {
+        const result = await run(replica);
+        counts.replica++;
+        return result;
+      } catch (error) {
+        if (!shouldFallBack(error)) throw error;
+        console.error('Replica read failed, retrying on primary:', error.message);
+        health = { ...health, healthy: false, error: error.message };
+        counts.fallback++;
+        return run(primary);
+      }
+    },
+
+    stats() {
+      return {
+        configured: Boolean(replica),
+        ...health,
+        maxLagMs,
+        readYourWritesMs,
+        pinnedStudents: recentWrites.size,
+        reads: { ...counts }
+      };
+    },
+
+    async close() {
+      clearInterval(timer);
+      if (replica) await replica.end();
+    }
+  };
+}
@@ -0,0 +1,137 @@
+// Catalog of the SQL statements run on the hot request paths
+//
+// Each statement is sent as a node-postgres named query ({ name, text, values }): the first use
+// on a pooled connection prepares it (parse + plan), every later use on that connection only
+// sends Bind/Execute. Statements list their columns explicitly so a migration that adds a column
+// does not invalidate the prepared result type ("cached plan must not change result type").
+//
+// Set DB_PREPARED_STATEMENTS=false behind a transaction-pooling PgBouncer, where a prepared
+// statement would not follow the session to the next server connection.
+
+const PREPARED = !['0', 'false', 'no'].includes((process.env.DB_PREPARED_STATEMENTS || '').toLowerCase());
+
+const STUDENT_COLUMNS = 'id, name, access_key, registered_at, last_active_at';
+const SUBMISSION_COLUMNS = `id, student_id, exercise_id, client_ip_address, operating_system, ami_id,
+  internal_ip_address, instance_type, score, submitted_at, processing_status`;
+
+// Every attempt: the retained rows plus the superseded ones `exercise1 retention` moved to
+// submissions_archive, so boards over all attempts (earliest completions, totals, shared IPs)
+// do not change when attempts are archived
+const ALL_SUBMISSIONS = `(
+    SELECT student_id, exercise_id, score, submitted_at, processing_status,
+           operating_system, ami_id, instance_type, internal_ip_address, elastic_ip_address
+    FROM submissions
+    UNION ALL
+    SELECT student_id, exercise_id, score, submitted_at, processing_status,
+           operating_system, ami_id, instance_type, internal_ip_address, elastic_ip_address
+    FROM submissions_archive
+  )`;
+
+export const statements = {
+  studentByName: `SELECT ${STUDENT_COLUMNS} FROM students WHERE name = $1`,
+
+  insertStudent: `INSERT INTO students (name, access_key) VALUES ($1, $2) RETURNING ${STUDENT_COLUMNS}`,
+
+  lockStudentSummary:
+    'INSERT INTO student_summary (student_id) VALUES ($1) ON CONFLICT (student_id) DO UPDATE SET updated_at = CURRENT_TIMESTAMP',
+
+  previousBestScore:
+    'SELECT COALESCE(MAX(score), 0) AS best_score FROM submissions WHERE student_id = $1 AND exercise_id = $2 AND processing_status = \'processed\'',
+
+  insertSubmission: `
+    INSERT INTO submissions (student_id, exercise_id, client_ip_address, operating_system, ami_id, internal_ip_address, instance_type, score, processing_status)
+    VALUES ($1, $2, $3, $4, $5, $6, $7, $8, 'processed')
+    RETURNING ${SUBMISSION_COLUMNS}
+  `,
+
+  addToStudentSummary:
+    'UPDATE student_summary SET total_submissions = total_submissions + 1, completed_submissions = completed_submissions + CASE WHEN $2::integer > 0 THEN 1 ELSE 0 END, total_score = total_score + $2::integer, highest_score = GREATEST(highest_score, $2::integer), best_total_score = best_total_score + $3::integer, last_submission_at = GREATEST(last_submission_at, $4), updated_at = CURRENT_TIMESTAMP WHERE student_id = $1',
+
+  submissionsByAccessKey: `
+    SELECT sub.id, sub.student_id, sub.exercise_id, sub.client_ip_address, sub.operating_system, sub.ami_id,
+           sub.internal_ip_address, sub.instance_type, sub.score, sub.submitted_at, sub.processing_status,
+           e.title as exercise_title, e.max_score
+    FROM submissions sub JOIN students s ON sub.student_id = s.id JOIN exercises e ON sub.exercise_id = e.id
+    WHERE s.access_key = $1 ORDER BY sub.submitted_at DESC
+  `,
+
+  rankings: `
+    SELECT s.id, s.name, s.access_key, COUNT(DISTINCT sub.exercise_id) as completed_exercises,
+           COALESCE(SUM(sub.score), 0) as total_score, MAX(sub.submitted_at) as last_submission,
+           COALESCE(AVG(EXTRACT(EPOCH FROM (sub.submitted_at - s.registered_at))/60), 0) as average_completion_time
+    FROM students s LEFT JOIN ${ALL_SUBMISSIONS} sub ON s.id = sub.student_id
+    GROUP BY s.id, s.name, s.access_key ORDER BY total_score DESC, last_submission ASC
+  `,
+
+  exerciseProgress: `
+    SELECT e.id as exercise_id, e.title, COUNT(DISTINCT sub.student_id) as completed_count, AVG(sub.score) as average_score
+    FROM exercises e LEFT JOIN ${ALL_SUBMISSIONS} sub ON e.id = sub.exercise_id
+    WHERE e.is_published = true GROUP BY e.id, e.title ORDER BY e.created_at DESC
+  `,
+
+  countStudents: 'SELECT COUNT(*) as count FROM students',
+
+  countPublishedExercises: 'SELECT COUNT(*) as count FROM exercises WHERE is_published = true',
+
+  // student_summary counts every attempt, including ones moved to submissions_archive
+  countSubmissions: 'SELECT COALESCE(SUM(total_submissions), 0) as count FROM student_summary',
+
+  firstExercise: `
+    SELECT id FROM exercises WHERE title LIKE '%Exercise%' OR title LIKE '%exercise%' ORDER BY created_at ASC LIMIT 1
+  `,
+
+  earliestSubmissions: `
+    SELECT s.name, s.access_key, sub.submitted_at, sub.score
+    FROM ${ALL_SUBMISSIONS} sub
+    JOIN students s ON sub.student_id = s.id
+    WHERE sub.exercise_id = $1
+    ORDER BY sub.submitted_at ASC
+    LIMIT 10
+  `,
+
+  completedSubmissions: `
+    SELECT s.name, s.access_key, sub.submitted_at, sub.score,
+           sub.operating_system, sub.ami_id, sub.instance_type,
+           sub.internal_ip_address, sub.elastic_ip_address
+    FROM ${ALL_SUBMISSIONS} sub
+    JOIN students s ON sub.student_id = s.id
+    WHERE sub.exercise_id = $1 AND sub.score > 0
+    ORDER BY sub.submitted_at DESC
+  `,
+
+  highestScoreSubmissions: `
+    SELECT s.name, s.access_key, sub.submitted_at, sub.score
+    FROM ${ALL_SUBMISSIONS} sub
+    JOIN students s ON sub.student_id = s.id
+    WHERE sub.exercise_id = $1
+    ORDER BY sub.score DESC, sub.submitted_at ASC
+    LIMIT 10
+  `,
+
+  sharedElasticIpGroups: `
+    SELECT
+      sub.elastic_ip_address as elastic_ip,
+      COUNT(DISTINCT sub.student_id) as student_count,
+      json_agg(json_build_object(
+        'name', s.name,
+        'access_key', s.access_key,
+        'submitted_at', sub.submitted_at,
+        'score', sub.score
+      ) ORDER BY sub.submitted_at) as students
+    FROM ${ALL_SUBMISSIONS} sub
+    JOIN students s ON sub.student_id = s.id
+    WHERE sub.exercise_id = $1 AND sub.elastic_ip_address IS NOT NULL
+    GROUP BY sub.elastic_ip_address
+    HAVING COUNT(DISTINCT sub.student_id) > 1
+    ORDER BY student_count DESC
+  `
+};
+
+// Query config for query() / client.query(): named (prepared) unless disabled
+export function sql(name, values = []) {
+  const text = statements[name];
+  if (!text) {
+    throw new Error(`Unknown statement: ${name}`);
+  }
+  return PREPARED ? { name, text, values } : { text, values };
+}
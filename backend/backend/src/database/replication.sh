@@ -0,0 +1,7 @@
+#!/bin/bash
+# Allow streaming replication connections from the other compose containers
+# (run once by the postgres image's docker-entrypoint-initdb.d on first start;
+# the image's default pg_hba.conf only matches normal databases, not "replication")
+set -e
+
+echo "host replication all all scram-sha-256" >> "$PGDATA/pg_hba.conf"
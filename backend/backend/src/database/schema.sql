@@ -36,9 +36,10 @@ CREATE TABLE IF NOT EXISTS exercises (
     updated_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP
 );
 
--- Create submissions table
+-- Create submissions table, range-partitioned by month on submitted_at
+-- (the partition key must be part of the primary key)
 CREATE TABLE IF NOT EXISTS submissions (
-    id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+    id UUID NOT NULL DEFAULT gen_random_uuid(),
     student_id UUID REFERENCES students(id) ON DELETE CASCADE,
     exercise_id UUID REFERENCES exercises(id) ON DELETE CASCADE,
     client_ip_address INET NOT NULL,
@@ -52,8 +53,131 @@ CREATE TABLE IF NOT EXISTS submissions (
     screenshot_mimetype VARCHAR(100),
     screenshot_size INTEGER,
     score INTEGER NOT NULL DEFAULT 0,
-    submitted_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
-    processing_status VARCHAR(20) CHECK (processing_status IN ('pending', 'processed', 'failed')) DEFAULT 'pending'
+    submitted_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    processing_status VARCHAR(20) CHECK (processing_status IN ('pending', 'processed', 'failed')) DEFAULT 'pending',
+    PRIMARY KEY (id, submitted_at)
+) PARTITION BY RANGE (submitted_at);
+
+-- Rows outside the created monthly partitions land here instead of failing
+CREATE TABLE IF NOT EXISTS submissions_default PARTITION OF submissions DEFAULT;
+
+-- Create any missing monthly partitions from from_month (or the oldest month in the default
+-- partition) up to months_ahead months from now; the API server calls this at startup and daily
+CREATE OR REPLACE FUNCTION ensure_submission_partitions(
+    from_month DATE DEFAULT date_trunc('month', CURRENT_DATE)::date,
+    months_ahead INTEGER DEFAULT 3
+) RETURNS INTEGER AS $$
+DECLARE
+    month_start DATE := date_trunc('month', from_month)::date;
+    month_end DATE;
+    last_month DATE := (date_trunc('month', CURRENT_DATE) + make_interval(months => months_ahead))::date;
+    partition_name TEXT;
+    has_default BOOLEAN := to_regclass('submissions_default') IS NOT NULL;
+    in_default BOOLEAN;
+    created INTEGER := 0;
+BEGIN
+    -- The API server and `exercise1 retention` may call this concurrently
+    PERFORM pg_advisory_xact_lock(hashtext('ensure_submission_partitions'));
+
+    -- Months that already have rows in the default partition need a partition too (creating it later
+    -- would violate the default partition's constraint), so start from the oldest of them
+    IF has_default THEN
+        month_start := LEAST(month_start, (SELECT date_trunc('month', MIN(submitted_at))::date FROM submissions_default));
+    END IF;
+
+    WHILE month_start <= last_month LOOP
+        partition_name := 'submissions_' || to_char(month_start, 'YYYY_MM');
+        month_end := (month_start + INTERVAL '1 month')::date;
+        IF to_regclass(partition_name) IS NULL THEN
+            in_default := false;
+            IF has_default THEN
+                in_default := EXISTS (
+                    SELECT 1 FROM submissions_default WHERE submitted_at >= month_start AND submitted_at < month_end
+                );
+            END IF;
+            IF in_default THEN
+                -- The month already has rows in the default partition: build the partition as a plain table,
+                -- move those rows into it, then attach it
+                EXECUTE format(
+                    'CREATE TABLE %I (LIKE submissions INCLUDING DEFAULTS INCLUDING CONSTRAINTS)', partition_name
+                );
+                EXECUTE format(
+                    'WITH moved AS (DELETE FROM submissions_default WHERE submitted_at >= %L AND submitted_at < %L RETURNING *) '
+                    || 'INSERT INTO %I SELECT * FROM moved',
+                    month_start, month_end, partition_name
+                );
+                EXECUTE format(
+                    'ALTER TABLE submissions ATTACH PARTITION %I FOR VALUES FROM (%L) TO (%L)',
+                    partition_name, month_start, month_end
+                );
+            ELSE
+                EXECUTE format(
+                    'CREATE TABLE %I PARTITION OF submissions FOR VALUES FROM (%L) TO (%L)',
+                    partition_name, month_start, month_end
+                );
+            END IF;
+            created := created + 1;
+        END IF;
+        month_start := month_end;
+    END LOOP;
+    RETURN created;
+END;
+$$ LANGUAGE plpgsql;
+
+SELECT ensure_submission_partitions();
+
+-- Create archive for superseded submissions (neither the best nor the latest attempt),
+-- filled by the retention job; avatars are not kept, only their size, type and hash
+CREATE TABLE IF NOT EXISTS submissions_archive (
+    id UUID PRIMARY KEY,
+    student_id UUID REFERENCES students(id) ON DELETE CASCADE,
+    exercise_id UUID REFERENCES exercises(id) ON DELETE CASCADE,
+    client_ip_address INET NOT NULL,
+    operating_system VARCHAR(100),
+    ami_id VARCHAR(50),
+    internal_ip_address INET,
+    elastic_ip_address INET,
+    instance_type VARCHAR(50),
+    screenshot_filename VARCHAR(255),
+    screenshot_mimetype VARCHAR(100),
+    screenshot_size INTEGER,
+    screenshot_sha256 CHAR(64),
+    score INTEGER NOT NULL DEFAULT 0,
+    submitted_at TIMESTAMP WITH TIME ZONE NOT NULL,
+    processing_status VARCHAR(20),
+    archived_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP
+);
+
+-- Create per-student summary table (maintained transactionally on each submission)
+CREATE TABLE IF NOT EXISTS student_summary (
+    student_id UUID PRIMARY KEY REFERENCES students(id) ON DELETE CASCADE,
+    total_submissions INTEGER NOT NULL DEFAULT 0,
+    completed_submissions INTEGER NOT NULL DEFAULT 0,
+    total_score BIGINT NOT NULL DEFAULT 0,
+    highest_score INTEGER NOT NULL DEFAULT 0,
+    best_total_score BIGINT NOT NULL DEFAULT 0,
+    last_submission_at TIMESTAMP WITH TIME ZONE,
+    updated_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP
+);
+
+-- Create versioned scoring rules (first matching rule by priority wins; NULL = any)
+CREATE TABLE IF NOT EXISTS scoring_rule_versions (
+    version INTEGER PRIMARY KEY,
+    description TEXT,
+    is_active BOOLEAN NOT NULL DEFAULT FALSE,
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
+    activated_at TIMESTAMP WITH TIME ZONE
+);
+
+CREATE TABLE IF NOT EXISTS scoring_rules (
+    version INTEGER NOT NULL REFERENCES scoring_rule_versions(version) ON DELETE CASCADE,
+    priority INTEGER NOT NULL,
+    has_ec2_info BOOLEAN,
+    has_elastic_ip BOOLEAN,
+    has_avatar BOOLEAN,
+    score INTEGER NOT NULL CHECK (score >= 0),
+    description TEXT,
+    PRIMARY KEY (version, priority)
 );
 
 -- Create indexes for better performance
@@ -64,6 +188,11 @@ CREATE INDEX IF NOT EXISTS idx_submissions_student_id ON submissions(student_id)
 CREATE INDEX IF NOT EXISTS idx_submissions_exercise_id ON submissions(exercise_id);
 CREATE INDEX IF NOT EXISTS idx_submissions_score ON submissions(score DESC);
 CREATE INDEX IF NOT EXISTS idx_submissions_submitted_at ON submissions(submitted_at);
+CREATE INDEX IF NOT EXISTS idx_submissions_student_exercise_score ON submissions(student_id, exercise_id, score DESC);
+CREATE INDEX IF NOT EXISTS idx_submissions_student_exercise_latest ON submissions(student_id, exercise_id, submitted_at DESC);
+CREATE INDEX IF NOT EXISTS idx_submissions_archive_student_exercise ON submissions_archive(student_id, exercise_id);
+CREATE INDEX IF NOT EXISTS idx_student_summary_best_total ON student_summary(best_total_score DESC);
+CREATE UNIQUE INDEX IF NOT EXISTS idx_scoring_rule_versions_active ON scoring_rule_versions(is_active) WHERE is_active;
 
 -- Create a function to update the updated_at timestamp
 CREATE OR REPLACE FUNCTION update_updated_at_column()
@@ -83,4 +212,18 @@ CREATE TRIGGER update_exercises_updated_at
 -- Insert default administrator (password: admin123)
 INSERT INTO administrators (username, password_hash, email) 
 VALUES ('admin', '$2a$10$92IXUNpkjO0rOQ5byMi.Ye4oKoEa3Ro9llC/.og/at2.uheWG/igi', 'admin@example.com')
-ON CONFLICT (username) DO NOTHING;
\ No newline at end of file
+ON CONFLICT (username) DO NOTHING;
+
+-- Insert scoring rules version 1 (same as exercise1-api/exercise1/scoring_rules.json)
+INSERT INTO scoring_rule_versions (version, description, is_active, activated_at)
+SELECT 1, 'Hands-on Exercise 1 initial scoring rules', true, CURRENT_TIMESTAMP
+WHERE NOT EXISTS (SELECT 1 FROM scoring_rule_versions);
+
+INSERT INTO scoring_rules (version, priority, has_ec2_info, has_elastic_ip, has_avatar, score, description) VALUES
+    (1, 10, true, true, true, 100, 'All EC2 info + elastic IP + avatar'),
+    (1, 20, true, true, NULL, 90, 'All EC2 info + elastic IP'),
+    (1, 30, true, NULL, true, 85, 'All EC2 info + avatar'),
+    (1, 40, true, NULL, NULL, 80, 'All required EC2 info'),
+    (1, 50, NULL, NULL, true, 60, 'Avatar but incomplete EC2 info'),
+    (1, 60, NULL, NULL, NULL, 40, 'Anything else')
+ON CONFLICT (version, priority) DO NOTHING;
@@ -9,6 +9,7 @@ import submissionRoutes from './routes/submissions.js';
 import statisticsRoutes from './routes/statistics.js';
 import sqlRoutes from './routes/sql.js';
 import exercise1StatsRoutes from './routes/exercise1-stats.js';
+import { replicaStats } from './config/database.js';
 import quicksuiteStatsRoutes from './routes/quicksuite-stats.js';
 
 // Load environment variables
@@ -31,7 +32,7 @@ app.use(express.urlencoded({ extended: true }));
 
 // Health check endpoint
 app.get('/health', (req, res) => {
-  res.json({ status: 'OK', timestamp: new Date().toISOString() });
+  res.json({ status: 'OK', timestamp: new Date().toISOString(), replica: replicaStats() });
 });
 
 // API routes
@@ -2,6 +2,7 @@ import express from 'express';
 import bcrypt from 'bcryptjs';
 import jwt from 'jsonwebtoken';
 import { query } from '../config/database.js';
+import { sql } from '../database/queries.js';
 
 const router = express.Router();
 
@@ -53,7 +54,7 @@ router.post('/student/register', async (req, res) => {
   try {
     const { name } = req.body;
     const accessKey = Math.random().toString(36).substring(2, 15) + Math.random().toString(36).substring(2, 15);
-    const result = await query('INSERT INTO students (name, access_key) VALUES ($1, $2) RETURNING *', [name, accessKey]);
+    const result = await query(sql('insertStudent', [name, accessKey]));
     res.json({ data: { student: studentToCamelCase(result.rows[0]) } });
   } catch (error) {
     console.error('Register error:', error);
@@ -64,7 +65,7 @@ router.post('/student/register', async (req, res) => {
 router.get('/student/lookup/:name', async (req, res) => {
   try {
     const { name } = req.params;
-    const result = await query('SELECT * FROM students WHERE name = $1', [name]);
+    const result = await query(sql('studentByName', [name]));
     
     if (result.rows.length === 0) {
       return res.status(404).json({ error: 'Student not found' });
@@ -1,12 +1,12 @@
 import express from 'express';
-import { query } from '../config/database.js';
+import { readQuery } from '../config/database.js';
 
 const router = express.Router();
 
 router.get('/', async (req, res) => {
   try {
     // Get earliest submission (top 10)
-    const earliestResult = await query(`
+    const earliestResult = await readQuery(`
       SELECT user_name, company_name, stock_code, report_period, revenue, created_at
       FROM company_reports
       ORDER BY created_at ASC
@@ -14,7 +14,7 @@ router.get('/', async (req, res) => {
     `);
 
     // Get all reports
-    const allReportsResult = await query(`
+    const allReportsResult = await readQuery(`
       SELECT user_name, company_name, stock_code, report_period, revenue, 
              performance_summary, employee_id, created_at
       FROM company_reports
@@ -22,7 +22,7 @@ router.get('/', async (req, res) => {
     `);
 
     // Get highest revenue (top 10)
-    const highestRevenueResult = await query(`
+    const highestRevenueResult = await readQuery(`
       SELECT user_name, company_name, stock_code, report_period, revenue, created_at
       FROM company_reports
       ORDER BY revenue DESC, created_at ASC
@@ -30,7 +30,7 @@ router.get('/', async (req, res) => {
     `);
 
     // Get reports grouped by user
-    const userGroupsResult = await query(`
+    const userGroupsResult = await readQuery(`
       SELECT 
         user_name,
         COUNT(*) as report_count,
@@ -1,5 +1,5 @@
 import express from 'express';
-import { getClient } from '../config/database.js';
+import { readQuery, withReadClient } from '../config/database.js';
 
 const router = express.Router();
 
@@ -53,37 +53,32 @@ router.post('/execute', requireAdmin, async (req, res) => {
       });
     }
 
-    // Execute the query with timeout
+    // Execute the query with timeout, on the read replica when one is configured
     const startTime = Date.now();
-    const client = await getClient();
-    
-    try {
+    const result = await withReadClient(async (client) => {
       // Set query timeout to 30 seconds
       await client.query('SET statement_timeout = 30000');
       
-      const result = await client.query(query);
-      const executionTime = Date.now() - startTime;
-
-      res.json({
-        success: true,
-        data: {
-          rows: result.rows,
-          rowCount: result.rowCount,
-          fields: result.fields?.map(field => ({
-            name: field.name,
-            dataTypeID: field.dataTypeID,
-            dataTypeSize: field.dataTypeSize,
-            dataTypeModifier: field.dataTypeModifier,
-            format: field.format
-          })) || [],
-          executionTime: `${executionTime}ms`,
-          query: query
-        }
-      });
+      return client.query(query);
+    });
+    const executionTime = Date.now() - startTime;
 
-    } finally {
-      client.release();
-    }
+    res.json({
+      success: true,
+      data: {
+        rows: result.rows,
+        rowCount: result.rowCount,
+        fields: result.fields?.map(field => ({
+          name: field.name,
+          dataTypeID: field.dataTypeID,
+          dataTypeSize: field.dataTypeSize,
+          dataTypeModifier: field.dataTypeModifier,
+          format: field.format
+        })) || [],
+        executionTime: `${executionTime}ms`,
+        query: query
+      }
+    });
 
   } catch (error) {
     console.error('SQL execution error:', error);
@@ -128,61 +123,54 @@ router.post('/execute', requireAdmin, async (req, res) => {
 // Get database schema information
 router.get('/schema', requireAdmin, async (req, res) => {
   try {
-    const client = await getClient();
-    
-    try {
-      // Get all tables and their columns
-      const tablesQuery = `
-        SELECT 
-          t.table_name,
-          t.table_type,
-          c.column_name,
-          c.data_type,
-          c.is_nullable,
-          c.column_default,
-          c.ordinal_position
-        FROM information_schema.tables t
-        LEFT JOIN information_schema.columns c ON t.table_name = c.table_name
-        WHERE t.table_schema = 'public'
-        AND t.table_type = 'BASE TABLE'
-        ORDER BY t.table_name, c.ordinal_position;
-      `;
+    // Get all tables and their columns
+    const tablesQuery = `
+      SELECT 
+        t.table_name,
+        t.table_type,
+        c.column_name,
+        c.data_type,
+        c.is_nullable,
+        c.column_default,
+        c.ordinal_position
+      FROM information_schema.tables t
+      LEFT JOIN information_schema.columns c ON t.table_name = c.table_name
+      WHERE t.table_schema = 'public'
+      AND t.table_type = 'BASE TABLE'
+      ORDER BY t.table_name, c.ordinal_position;
+    `;
 
-      const result = await client.query(tablesQuery);
+    const result = await readQuery(tablesQuery);
+    
+    // Group columns by table
+    const schema = {};
+    result.rows.forEach(row => {
+      if (!schema[row.table_name]) {
+        schema[row.table_name] = {
+          name: row.table_name,
+          type: row.table_type,
+          columns: []
+        };
+      }
       
-      // Group columns by table
-      const schema = {};
-      result.rows.forEach(row => {
-        if (!schema[row.table_name]) {
-          schema[row.table_name] = {
-            name: row.table_name,
-            type: row.table_type,
-            columns: []
-          };
-        }
-        
-        if (row.column_name) {
-          schema[row.table_name].columns.push({
-            name: row.column_name,
-            dataType: row.data_type,
-            nullable: row.is_nullable === 'YES',
-            defaultValue: row.column_default,
-            position: row.ordinal_position
-          });
-        }
-      });
-
-      res.json({
-        success: true,
-        data: {
-          tables: Object.values(schema),
-          totalTables: Object.keys(schema).length
-        }
-      });
+      if (row.column_name) {
+        schema[row.table_name].columns.push({
+          name: row.column_name,
+          dataType: row.data_type,
+          nullable: row.is_nullable === 'YES',
+          defaultValue: row.column_default,
+          position: row.ordinal_position
+        });
+      }
+    });
 
-    } finally {
-      client.release();
-    }
+    res.json({
+      success: true,
+      data: {
+        tables: Object.values(schema),
+        totalTables: Object.keys(schema).length
+      }
+    });
 
   } catch (error) {
     console.error('Schema fetch error:', error);
@@ -1,17 +1,12 @@
 import express from 'express';
-import { query } from '../config/database.js';
+import { readQuery } from '../config/database.js';
+import { sql } from '../database/queries.js';
 
 const router = express.Router();
 
 router.get('/rankings', async (req, res) => {
   try {
-    const result = await query(`
-      SELECT s.id, s.name, s.access_key, COUNT(DISTINCT sub.exercise_id) as completed_exercises,
-             COALESCE(SUM(sub.score), 0) as total_score, MAX(sub.submitted_at) as last_submission,
-             COALESCE(AVG(EXTRACT(EPOCH FROM (sub.submitted_at - s.registered_at))/60), 0) as average_completion_time
-      FROM students s LEFT JOIN submissions sub ON s.id = sub.student_id
-      GROUP BY s.id, s.name, s.access_key ORDER BY total_score DESC, last_submission ASC
-    `);
+    const result = await readQuery(sql('rankings'));
     const rankings = result.rows.map((row, index) => ({
       id: row.id, name: row.name, accessKey: row.access_key,
       completedExercises: parseInt(row.completed_exercises),
@@ -28,11 +23,7 @@ router.get('/rankings', async (req, res) => {
 
 router.get('/progress', async (req, res) => {
   try {
-    const result = await query(`
-      SELECT e.id as exercise_id, e.title, COUNT(DISTINCT sub.student_id) as completed_count, AVG(sub.score) as average_score
-      FROM exercises e LEFT JOIN submissions sub ON e.id = sub.exercise_id
-      WHERE e.is_published = true GROUP BY e.id, e.title ORDER BY e.created_at DESC
-    `);
+    const result = await readQuery(sql('exerciseProgress'));
     const progress = result.rows.map(row => ({
       exerciseId: row.exercise_id, title: row.title,
       completedCount: parseInt(row.completed_count),
@@ -48,9 +39,9 @@ router.get('/progress', async (req, res) => {
 router.get('/dashboard', async (req, res) => {
   try {
     const [students, exercises, submissions] = await Promise.all([
-      query('SELECT COUNT(*) as count FROM students'),
-      query('SELECT COUNT(*) as count FROM exercises WHERE is_published = true'),
-      query('SELECT COUNT(*) as count FROM submissions')
+      readQuery(sql('countStudents')),
+      readQuery(sql('countPublishedExercises')),
+      readQuery(sql('countSubmissions'))
     ]);
     res.json({
       data: {
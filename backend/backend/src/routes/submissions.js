@@ -1,5 +1,6 @@
 import express from 'express';
-import { query } from '../config/database.js';
+import { query, getClient } from '../config/database.js';
+import { sql } from '../database/queries.js';
 
 const router = express.Router();
 
@@ -20,26 +21,44 @@ const toCamelCase = (row) => ({
 });
 
 router.post('/', async (req, res) => {
+  let client;
+  let broken;
   try {
+    client = await getClient();
     const { studentId, exerciseId, clientIpAddress, operatingSystem, amiId, internalIpAddress, instanceType, score } = req.body;
-    const result = await query(
-      'INSERT INTO submissions (student_id, exercise_id, client_ip_address, operating_system, ami_id, internal_ip_address, instance_type, score, processing_status) VALUES ($1, $2, $3, $4, $5, $6, $7, $8, \'processed\') RETURNING *',
-      [studentId, exerciseId, clientIpAddress, operatingSystem, amiId, internalIpAddress, instanceType, score || 0]
-    );
+    const submissionScore = score || 0;
+
+    await client.query('BEGIN');
+    // Upserting the summary row locks it, so concurrent submissions by the same student serialize here
+    await client.query(sql('lockStudentSummary', [studentId]));
+    const previousBest = await client.query(sql('previousBestScore', [studentId, exerciseId]));
+    const result = await client.query(sql('insertSubmission', [
+      studentId, exerciseId, clientIpAddress, operatingSystem, amiId, internalIpAddress, instanceType, submissionScore
+    ]));
+    await client.query(sql('addToStudentSummary', [
+      studentId, submissionScore, Math.max(submissionScore - previousBest.rows[0].best_score, 0), result.rows[0].submitted_at
+    ]));
+    await client.query('COMMIT');
     res.json({ data: toCamelCase(result.rows[0]) });
   } catch (error) {
+    if (client) {
+      // Keep the original error; a connection that cannot roll back is discarded on release
+      await client.query('ROLLBACK').catch((rollbackError) => {
+        console.error('Rollback failed:', rollbackError.message);
+        broken = rollbackError;
+      });
+    }
     console.error('Submit exercise error:', error);
     res.status(500).json({ error: 'Internal server error' });
+  } finally {
+    client?.release(broken);
   }
 });
 
 router.get('/student/:accessKey', async (req, res) => {
   try {
     const { accessKey } = req.params;
-    const result = await query(
-      'SELECT sub.*, e.title as exercise_title, e.max_score FROM submissions sub JOIN students s ON sub.student_id = s.id JOIN exercises e ON sub.exercise_id = e.id WHERE s.access_key = $1 ORDER BY sub.submitted_at DESC',
-      [accessKey]
-    );
+    const result = await query(sql('submissionsByAccessKey', [accessKey]));
     res.json({ data: result.rows.map(toCamelCase) });
   } catch (error) {
     console.error('Get submissions error:', error);
@@ -0,0 +1,115 @@
+// Admission control for the Exercise 1 API
+//
+// concurrencyLimit: at most `maxConcurrent` requests of a route group run at once, up to
+//   `maxQueue` more wait for a slot (at most `queueTimeoutMs`), everything else is rejected
+//   immediately with 503 + Retry-After. Keeping the sum of all groups at or below the pg pool
+//   size means requests never wait inside pool.connect() and time out there.
+// rateLimit: per-client-IP token bucket (`ratePerMinute` sustained, `burst` at once),
+//   rejected with 429 + Retry-After.
+
+function reject(res, status, retryAfterSeconds, error, message) {
+  res.set('Retry-After', String(Math.max(1, Math.ceil(retryAfterSeconds))));
+  res.status(status).json({ error, message });
+}
+
+export function concurrencyLimit({ name, maxConcurrent, maxQueue, queueTimeoutMs }) {
+  let active = 0;
+  const queue = [];
+  let rejected = 0;
+
+  function release() {
+    active--;
+    while (active < maxConcurrent && queue.length > 0) {
+      const waiter = queue.shift();
+      clearTimeout(waiter.timer);
+      waiter.admit();
+    }
+  }
+
+  function shed(res) {
+    rejected++;
+    reject(res, 503, queueTimeoutMs / 1000, 'Server busy',
+      `Too many concurrent ${name} requests, please retry later`);
+  }
+
+  const middleware = (req, res, next) => {
+    const admit = () => {
+      active++;
+      let released = false;
+      const done = () => {
+        if (!released) {
+          released = true;
+          release();
+        }
+      };
+      res.on('finish', done);
+      res.on('close', done);
+      next();
+    };
+
+    if (active < maxConcurrent) {
+      return admit();
+    }
+    if (queue.length >= maxQueue) {
+      return shed(res);
+    }
+
+    const waiter = { admit };
+    waiter.timer = setTimeout(() => {
+      const index = queue.indexOf(waiter);
+      if (index !== -1) {
+        queue.splice(index, 1);
+        shed(res);
+      }
+    }, queueTimeoutMs);
+    queue.push(waiter);
+
+    // Client gave up while queued: free the queue position
+    res.on('close', () => {
+      const index = queue.indexOf(waiter);
+      if (index !== -1) {
+        queue.splice(index, 1);
+        clearTimeout(waiter.timer);
+      }
+    });
+  };
+
+  middleware.stats = () => ({ active, queued: queue.length, rejected, maxConcurrent, maxQueue });
+  return middleware;
+}
+
+export function rateLimit({ name, ratePerMinute, burst }) {
+  const ratePerMs = ratePerMinute / 60000;
+  const buckets = new Map();
+  let rejected = 0;
+
+  // Buckets that have refilled completely carry no state; drop them so idle clients don't accumulate
+  const sweeper = setInterval(() => {
+    const now = Date.now();
+    for (const [ip, bucket] of buckets) {
+      if (bucket.tokens + (now - bucket.updatedAt) * ratePerMs >= burst) {
+        buckets.delete(ip);
+      }
+    }
+  }, 60000);
+  sweeper.unref();
+
+  const middleware = (req, res, next) => {
+    const now = Date.now();
+    const bucket = buckets.get(req.ip) || { tokens: burst, updatedAt: now };
+    bucket.tokens = Math.min(burst, bucket.tokens + (now - bucket.updatedAt) * ratePerMs);
+    bucket.updatedAt = now;
+    buckets.set(req.ip, bucket);
+
+    if (bucket.tokens < 1) {
+      rejected++;
+      return reject(res, 429, (1 - bucket.tokens) / ratePerMs / 1000, 'Too many requests',
+        `Too many ${name} requests from this client, please retry later`);
+    }
+    bucket.tokens -= 1;
+    next();
+  };
+
+  middleware.stats = () => ({ clients: buckets.size, rejected, ratePerMinute, burst });
+  return middleware;
+}
@@ -0,0 +1,15 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+student_summary 一致性检查 (Python版本)
+
+等同于 `exercise1 audit summary`，实现位于 exercise1/summary_audit.py。
+"""
+
+import sys
+
+from exercise1.cli import main
+
+if __name__ == '__main__':
+    sys.exit(main(['audit', 'summary'] + sys.argv[1:]))
@@ -0,0 +1,11 @@
+# -*- coding: utf-8 -*-
+
+"""
+Exercise 1 API Python工具集
+
+所有命令通过 `exercise1 <子命令>` (或 `python -m exercise1 <子命令>`) 运行。
+为了保证命令行启动速度，这里不导入任何子模块；requests、psycopg2 等依赖
+只在实际执行需要它们的子命令时才导入。
+"""
+
+__version__ = '1.0.0'
@@ -0,0 +1,7 @@
+# -*- coding: utf-8 -*-
+
+import sys
+
+from exercise1.cli import main
+
+sys.exit(main())
@@ -0,0 +1,131 @@
+# -*- coding: utf-8 -*-
+
+"""
+共用HTTP层: 所有子命令通过 ApiSession 访问 Exercise 1 API
+
+ApiSession 在 requests.Session 之上统一处理服务器地址、超时、gzip压缩和每次调用的耗时记录。
+requests 在创建 ApiSession 时才导入。
+
+JSON请求正文达到 config.gzip_threshold 字节时用gzip压缩并设置 Content-Encoding，
+服务器 (express.json) 解压后仍按解压后的大小执行 10mb 限制。
+
+服务器过载时返回带 Retry-After 的 429/503 (请求尚未被处理，可以安全重试)。
+ApiSession 等待 Retry-After 再加上随重试次数指数增长的随机抖动后重试，
+最多 config.max_retries 次；每次尝试都单独记录在 http_calls 中。
+"""
+
+import email.utils
+import gzip
+import json
+import random
+import time
+from typing import Any, Dict, List, Optional
+
+from exercise1.config import Config
+
+RETRY_STATUSES = (429, 503)
+BACKOFF_BASE = 0.5   # 秒，第n次重试的抖动上限为 BACKOFF_BASE * 2**n
+BACKOFF_MAX = 10.0   # 秒，抖动的上限
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Retry-After 可以是秒数或HTTP日期；无法解析时返回 None"""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, email.utils.parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def backoff_delay(retry_after: float, attempt: int) -> float:
+    """等待完整的 Retry-After，再加上抖动 (只有抖动有上限)，避免被拒绝的客户端同时重试"""
+    jitter = random.uniform(0, min(BACKOFF_MAX, BACKOFF_BASE * 2 ** attempt))
+    return retry_after + jitter
+
+
+class ApiSession:
+    """带耗时记录的HTTP会话；path 以 /api 或 /health 开头，也可以是完整URL"""
+
+    def __init__(self, config: Config):
+        import requests
+
+        self.config = config
+        self.session = requests.Session()
+        if not config.gzip:
+            self.session.headers['Accept-Encoding'] = 'identity'
+        self.http_calls: List[Dict[str, Any]] = []
+
+    def url(self, path: str) -> str:
+        if path.startswith(('http://', 'https://')):
+            return path
+        return f'{self.config.server_url}{path}'
+
+    def encode_json(self, kwargs: Dict[str, Any]) -> None:
+        """把 json= 参数序列化为正文，超过阈值时gzip压缩"""
+        body = json.dumps(kwargs.pop('json'), ensure_ascii=False, allow_nan=False).encode('utf-8')
+        headers = dict(kwargs.get('headers') or {})
+        headers.setdefault('Content-Type', 'application/json')
+        if self.config.gzip and len(body) >= self.config.gzip_threshold:
+            body = gzip.compress(body, compresslevel=6, mtime=0)
+            headers['Content-Encoding'] = 'gzip'
+        kwargs['data'] = body
+        kwargs['headers'] = headers
+
+    def request(self, method: str, path: str, **kwargs):
+        """发送请求；遇到带 Retry-After 的 429/503 时退避重试"""
+        kwargs.setdefault('timeout', self.config.timeout)
+        if kwargs.get('json') is not None:
+            self.encode_json(kwargs)
+        attempt = 0
+        while True:
+            response = self.send(method, path, **kwargs)
+            retry_after = parse_retry_after(response.headers.get('Retry-After'))
+            if response.status_code not in RETRY_STATUSES or retry_after is None \
+                    or attempt >= self.config.max_retries:
+                return response
+            time.sleep(backoff_delay(retry_after, attempt))
+            attempt += 1
+
+    def send(self, method: str, path: str, **kwargs):
+        """发送一次请求并记录耗时和线上字节数"""
+        start = time.perf_counter()
+        status = retry_after = None
+        request_bytes = response_bytes = None
+        try:
+            response = self.session.request(method, self.url(path), **kwargs)
+            status = response.status_code
+            retry_after = response.headers.get('Retry-After')
+            request_bytes = len(response.request.body or b'')
+            # 已读取的线上字节数 (压缩时小于 len(response.content))
+            response_bytes = response.raw.tell()
+            return response
+        finally:
+            self.http_calls.append({
+                'method': method,
+                'path': path,
+                'status': status,
+                'duration_ms': round((time.perf_counter() - start) * 1000, 3),
+                'request_bytes': request_bytes,
+                'response_bytes': response_bytes,
+                'retry_after': retry_after
+            })
+
+    def get(self, path: str, **kwargs):
+        return self.request('GET', path, **kwargs)
+
+    def post(self, path: str, **kwargs):
+        return self.request('POST', path, **kwargs)
+
+    def close(self) -> None:
+        self.session.close()
+
+    def __enter__(self) -> 'ApiSession':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
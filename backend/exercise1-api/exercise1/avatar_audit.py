@@ -0,0 +1,229 @@
+# -*- coding: utf-8 -*-
+
+"""
+头像数据完整性审计和修复 (exercise1 audit avatars)
+
+通过服务器端游标流式读取 submissions 表中的全部头像，在进程池中计算SHA-256并识别
+真实图片格式，报告以下问题:
+
+    truncated          图片数据被截断 (缺少PNG的IEND、JPEG的EOI等结束标记)
+    size_mismatch      screenshot_size 与实际字节数不一致
+    mimetype_mismatch  screenshot_mimetype 与识别出的图片格式不一致
+    unknown_format     无法识别的图片格式
+
+加 --repair 时按批修正 screenshot_size 和 screenshot_mimetype (截断或无法识别的记录只报告，不修改:
+记录的大小是判断截断丢失了多少数据的唯一依据)。
+每批处理完成后写入检查点，中断后用 --resume 从上次位置继续。
+
+用法:
+    exercise1 audit avatars --workers 8 --report avatar-audit.jsonl
+    exercise1 audit avatars --repair --resume
+"""
+
+import hashlib
+import json
+import os
+from collections import Counter, deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+
+from exercise1.config import Config
+
+STREAM_SQL = """
+    SELECT id, screenshot_data, screenshot_size, screenshot_mimetype
+    FROM submissions
+    WHERE screenshot_data IS NOT NULL AND id > %s::uuid
+    ORDER BY id
+"""
+
+REPAIR_SQL = """
+    UPDATE submissions AS s
+    SET screenshot_size = v.size, screenshot_mimetype = v.mimetype
+    FROM (VALUES %s) AS v(id, size, mimetype)
+    WHERE s.id = v.id::uuid
+"""
+
+# 这些问题无法修复，同一条记录的其他问题也不修正
+UNREPAIRABLE = {'truncated', 'unknown_format'}
+
+# 比任何UUID都小，作为首次扫描的起点
+MIN_UUID = '00000000-0000-0000-0000-000000000000'
+
+PNG_SIGNATURE = b'\x89PNG\r\n\x1a\n'
+
+
+def _png_truncated(data: bytes) -> bool:
+    """逐个遍历PNG数据块，未遇到完整的IEND块即视为截断"""
+    pos = len(PNG_SIGNATURE)
+    while pos + 8 <= len(data):
+        length = int.from_bytes(data[pos:pos + 4], 'big')
+        chunk_type = data[pos + 4:pos + 8]
+        pos += 12 + length  # 长度 + 类型 + 数据 + CRC
+        if chunk_type == b'IEND':
+            return pos > len(data)
+    return True
+
+
+def sniff_image(data: bytes) -> Tuple[Optional[str], bool]:
+    """根据文件头识别图片格式，返回 (MIME类型, 是否截断)；无法识别时MIME类型为 None"""
+    if data.startswith(PNG_SIGNATURE):
+        return 'image/png', _png_truncated(data)
+    if data.startswith(b'\xff\xd8\xff'):
+        return 'image/jpeg', not data.rstrip(b'\x00').endswith(b'\xff\xd9')
+    if data.startswith((b'GIF87a', b'GIF89a')):
+        return 'image/gif', not data.endswith(b'\x3b')
+    if data[:4] == b'RIFF' and data[8:12] == b'WEBP':
+        return 'image/webp', int.from_bytes(data[4:8], 'little') + 8 > len(data)
+    if data.startswith(b'BM') and len(data) >= 6:
+        return 'image/bmp', int.from_bytes(data[2:6], 'little') > len(data)
+    return None, False
+
+
+def inspect_row(row: Tuple[str, bytes, Optional[int], Optional[str]]) -> Dict[str, Any]:
+    """检查一条头像记录，返回检查结果 (issues 为空表示没有问题)"""
+    submission_id, data, recorded_size, recorded_mimetype = row
+    detected_mimetype, truncated = sniff_image(data)
+
+    issues = []
+    if truncated:
+        issues.append('truncated')
+    if recorded_size != len(data):
+        issues.append('size_mismatch')
+    if detected_mimetype is None:
+        issues.append('unknown_format')
+    elif recorded_mimetype != detected_mimetype:
+        issues.append('mimetype_mismatch')
+
+    return {
+        'id': submission_id,
+        'sha256': hashlib.sha256(data).hexdigest(),
+        'actual_size': len(data),
+        'recorded_size': recorded_size,
+        'detected_mimetype': detected_mimetype,
+        'recorded_mimetype': recorded_mimetype,
+        'issues': issues
+    }
+
+
+def inspect_batch(rows: List[Tuple[str, bytes, Optional[int], Optional[str]]]) -> List[Dict[str, Any]]:
+    """在工作进程中检查一批记录"""
+    return [inspect_row(row) for row in rows]
+
+
+def repairs_for(results: List[Dict[str, Any]]) -> List[Tuple[str, int, str]]:
+    """需要写回的修正: (id, 实际大小, 正确的MIME类型)；截断和无法识别的记录保持原样"""
+    repairs = []
+    for result in results:
+        issues = set(result['issues'])
+        if issues & UNREPAIRABLE:
+            continue
+        if issues & {'size_mismatch', 'mimetype_mismatch'}:
+            repairs.append((result['id'], result['actual_size'], result['detected_mimetype']))
+    return repairs
+
+
+def load_checkpoint(path: str, resume: bool) -> Dict[str, Any]:
+    """读取检查点；不续跑或检查点不存在时从头开始"""
+    if not resume or not os.path.exists(path):
+        return {'last_id': MIN_UUID, 'scanned': 0, 'repaired': 0, 'issues': {}}
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def save_checkpoint(path: str, checkpoint: Dict[str, Any]) -> None:
+    """先写临时文件再替换，避免中断时留下损坏的检查点"""
+    tmp_path = f'{path}.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(checkpoint, f, indent=2, ensure_ascii=False)
+    os.replace(tmp_path, path)
+
+
+def stream_batches(conn, last_id: str, batch_size: int):
+    """服务器端游标按 id 顺序流式读取头像，每次产出一批"""
+    with conn.cursor(name='avatar_audit') as cursor:
+        cursor.itersize = batch_size
+        cursor.execute(STREAM_SQL, (last_id,))
+        while True:
+            rows = cursor.fetchmany(batch_size)
+            if not rows:
+                return
+            yield [(str(row[0]), bytes(row[1]), row[2], row[3]) for row in rows]
+
+
+def run_avatar_audit(args, config: Config, fake_server=None) -> int:
+    """exercise1 audit avatars"""
+    import psycopg2
+    from psycopg2.extras import execute_values
+
+    checkpoint = load_checkpoint(args.checkpoint, args.resume)
+    issue_counts = Counter(checkpoint['issues'])
+    if args.resume and checkpoint['scanned']:
+        print(f"↩️  从检查点继续: 已扫描 {checkpoint['scanned']} 条, 上次位置 {checkpoint['last_id']}")
+
+    print(f'🔍 审计头像数据 (并发 {args.workers}, 每批 {args.batch_size} 条)...')
+    read_conn = psycopg2.connect(**config.db)
+    write_conn = psycopg2.connect(**config.db) if args.repair else None
+    report = open(args.report, 'a' if args.resume else 'w', encoding='utf-8') if args.report else None
+    examples: List[Dict[str, Any]] = []
+
+    def finish_batch(results: List[Dict[str, Any]]) -> None:
+        bad = [result for result in results if result['issues']]
+        for result in bad:
+            issue_counts.update(result['issues'])
+            if report:
+                report.write(json.dumps(result, ensure_ascii=False) + '\n')
+            if len(examples) < args.limit:
+                examples.append(result)
+        if report:
+            report.flush()
+
+        if write_conn:
+            repairs = repairs_for(bad)
+            if repairs:
+                with write_conn.cursor() as cursor:
+                    execute_values(cursor, REPAIR_SQL, repairs)
+                write_conn.commit()
+                checkpoint['repaired'] += len(repairs)
+
+        checkpoint['last_id'] = results[-1]['id']
+        checkpoint['scanned'] += len(results)
+        checkpoint['issues'] = dict(issue_counts)
+        save_checkpoint(args.checkpoint, checkpoint)
+
+    try:
+        with ProcessPoolExecutor(max_workers=max(1, args.workers)) as pool:
+            # 限制在途批次数量以控制内存；按提交顺序取回结果，保证检查点单调前进
+            pending = deque()
+            for batch in stream_batches(read_conn, checkpoint['last_id'], args.batch_size):
+                pending.append(pool.submit(inspect_batch, batch))
+                if len(pending) >= args.workers * 2:
+                    finish_batch(pending.popleft().result())
+            while pending:
+                finish_batch(pending.popleft().result())
+    finally:
+        read_conn.close()
+        if write_conn:
+            write_conn.close()
+        if report:
+            report.close()
+
+    print(f"✅ 共扫描 {checkpoint['scanned']} 条头像记录")
+    if not issue_counts:
+        print('✅ 没有发现问题')
+    else:
+        print('❌ 发现的问题:')
+        for issue, count in sorted(issue_counts.items()):
+            print(f'   {issue}: {count}')
+        for result in examples:
+            print(f"   {result['id']}: {', '.join(result['issues'])} "
+                  f"(记录 {result['recorded_size']} bytes {result['recorded_mimetype']}, "
+                  f"实际 {result['actual_size']} bytes {result['detected_mimetype']})")
+    if args.repair:
+        print(f"🔧 已修正 {checkpoint['repaired']} 条记录的大小/MIME类型")
+    if args.report:
+        print(f'📝 问题明细: {args.report}')
+
+    unrepaired = issue_counts['truncated'] + issue_counts['unknown_format']
+    if not args.repair:
+        unrepaired += issue_counts['size_mismatch'] + issue_counts['mimetype_mismatch']
+    return 1 if unrepaired else 0
@@ -0,0 +1,159 @@
+# -*- coding: utf-8 -*-
+
+"""
+测试头像数据存储到数据库 (exercise1 audit storage)
+
+提交一个带头像的练习，然后直接从数据库读取并校验头像数据，最后通过API下载校验。
+使用 --fake 时读取替身服务器的sqlite存储，无需PostgreSQL。
+"""
+
+import base64
+
+from exercise1.api import ApiSession
+from exercise1.config import Config
+
+# 创建一个简单的测试头像 (红色1x1像素PNG)
+TEST_AVATAR_BASE64 = 'iVBORw0KGgoAAAANSUhEUgAAAAEAAAABCAYAAAAfFcSJAAAADUlEQVR42mP8/5+hHgAHggJ/PchI7wAAAABJRU5ErkJggg=='
+
+AVATAR_ROW_SQL = """
+    SELECT 
+        screenshot_data,
+        screenshot_filename,
+        screenshot_mimetype,
+        screenshot_size,
+        LENGTH(screenshot_data) as actual_size
+    FROM submissions 
+    WHERE id = {placeholder}
+"""
+
+def fetch_avatar_row(config: Config, submission_id: str, fake_server=None):
+    """从数据库查询头像数据 (替身服务器模式下查询其sqlite存储)"""
+    if fake_server:
+        rows = fake_server.store.query(AVATAR_ROW_SQL.format(placeholder='?'), (submission_id,))
+        return tuple(rows[0]) if rows else None
+
+    import psycopg2
+    conn = psycopg2.connect(**config.db)
+    try:
+        cursor = conn.cursor()
+        cursor.execute(AVATAR_ROW_SQL.format(placeholder='%s'), (submission_id,))
+        return cursor.fetchone()
+    finally:
+        conn.close()
+
+def check_avatar_storage(api: ApiSession, fake_server=None) -> bool:
+    """测试头像数据存储到数据库"""
+    print('🧪 测试头像数据存储到数据库 (Python版本)')
+    print('=' * 60)
+    
+    try:
+        # 1. 注册学员
+        print('1. 注册测试学员...')
+        register_response = api.post(
+            '/api/auth/student/register',
+            json={'name': '测试学员-数据库存储-Python'}
+        )
+        
+        register_data = register_response.json()
+        if not register_data.get('success'):
+            raise Exception(f'注册失败: {register_data.get("message")}')
+        
+        access_key = register_data['student']['accessKey']
+        print(f'✅ 注册成功，Access Key: {access_key}')
+        
+        # 2. 提交带头像的数据
+        print('2. 提交带头像的练习数据...')
+        submission_data = {
+            'studentName': '测试学员-数据库存储-Python',
+            'ec2InstanceInfo': {
+                'operatingSystem': 'Test Linux Python',
+                'amiId': 'ami-test123',
+                'internalIpAddress': '10.0.1.200',
+                'elasticIpAddress': '203.0.113.200',
+                'instanceType': 't3.nano'
+            },
+            'avatarBase64': f'data:image/png;base64,{TEST_AVATAR_BASE64}'
+        }
+        
+        submit_response = api.post(
+            '/api/submissions/exercise1',
+            json=submission_data
+        )
+        
+        submit_data = submit_response.json()
+        if not submit_data.get('success'):
+            raise Exception(f'提交失败: {submit_data.get("message")}')
+        
+        print('✅ 提交成功！')
+        print(f'   分数: {submit_data["score"]}')
+        print(f'   提交ID: {submit_data["submissionId"]}')
+        if submit_data.get('avatarInfo'):
+            avatar_info = submit_data['avatarInfo']
+            print(f'   头像: {avatar_info["filename"]} ({avatar_info["size"]} bytes)')
+        
+        # 3. 直接从数据库查询验证数据
+        print('3. 从数据库验证头像数据...')
+        
+        db_row = fetch_avatar_row(api.config, submit_data['submissionId'], fake_server)
+        
+        if not db_row:
+            raise Exception('数据库中未找到提交记录')
+        
+        screenshot_data, screenshot_filename, screenshot_mimetype, screenshot_size, actual_size = db_row
+        
+        print('✅ 数据库中的头像数据:')
+        print(f'   文件名: {screenshot_filename}')
+        print(f'   MIME类型: {screenshot_mimetype}')
+        print(f'   记录的大小: {screenshot_size} bytes')
+        print(f'   实际大小: {actual_size} bytes')
+        print(f'   数据存在: {"是" if screenshot_data else "否"}')
+        
+        # 4. 验证数据完整性
+        is_data_intact = False
+        if screenshot_data:
+            stored_base64 = base64.b64encode(screenshot_data).decode('utf-8')
+            is_data_intact = stored_base64 == TEST_AVATAR_BASE64
+            print(f'   数据完整性: {"✅ 完整" if is_data_intact else "❌ 损坏"}')
+            
+            if not is_data_intact:
+                print(f'   原始数据: {TEST_AVATAR_BASE64[:50]}...')
+                print(f'   存储数据: {stored_base64[:50]}...')
+        else:
+            print('   ❌ 头像数据为空')
+        
+        # 5. 测试头像下载
+        print('4. 测试头像下载...')
+        is_download_intact = False
+        download_response = api.get(f'/api/submissions/{submit_data["submissionId"]}/avatar')
+        
+        if download_response.status_code == 200:
+            content_type = download_response.headers.get('content-type')
+            content_length = download_response.headers.get('content-length')
+            avatar_data = download_response.content
+            
+            print('✅ 头像下载成功')
+            print(f'   Content-Type: {content_type}')
+            print(f'   Content-Length: {content_length} bytes')
+            print(f'   实际下载大小: {len(avatar_data)} bytes')
+            
+            # 验证下载的数据是否与原始数据一致
+            downloaded_base64 = base64.b64encode(avatar_data).decode('utf-8')
+            is_download_intact = downloaded_base64 == TEST_AVATAR_BASE64
+            print(f'   下载数据完整性: {"✅ 完整" if is_download_intact else "❌ 损坏"}')
+            
+        else:
+            print(f'❌ 头像下载失败: {download_response.status_code}')
+        
+        print()
+        print('🎉 头像数据存储测试完成！')
+        return is_data_intact and is_download_intact
+        
+    except Exception as error:
+        print(f'❌ 测试失败: {error}')
+        return False
+
+
+def run_storage_check(args, config: Config, fake_server=None) -> int:
+    """exercise1 audit storage"""
+    with ApiSession(config) as api:
+        return 0 if check_avatar_storage(api, fake_server) else 1
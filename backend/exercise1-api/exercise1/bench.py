@@ -0,0 +1,197 @@
+# -*- coding: utf-8 -*-
+
+"""
+接口延迟基准测试 (exercise1 bench)
+
+对每个接口以固定并发发送固定数量的请求，报告 p50/p95/p99/最大延迟、吞吐量、
+平均每次请求的线上字节数 (上行/下行)、客户端CPU时间和服务器CPU时间。
+服务器CPU时间取自测试前后 /health 返回的进程累计CPU时间 (cpuMs)，
+同一时段其他客户端的请求也计算在内；服务器不返回 cpuMs 时显示为 "-"。
+--compare-gzip 对每个接口分别在关闭和开启gzip时各测一轮，比较字节数和两端的CPU开销。
+使用 --fake 时替身服务器在同一进程内运行，两列都是整个进程 (客户端+服务器) 的CPU时间，
+无法分开；要分别测量，另外运行 `exercise1 fake --port 3901`，再用 --base-url 指向它。
+
+用法:
+    exercise1 bench --fake
+    exercise1 bench --base-url http://localhost:3001 --requests 200 --concurrency 16 -e rankings
+    exercise1 bench --fake --compare-gzip
+"""
+
+import dataclasses
+import json
+import math
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional
+
+from exercise1.api import ApiSession
+from exercise1.cases import TEST_AVATAR_BASE64, TEST_EC2_INFO
+from exercise1.config import Config
+
+
+def percentile(sorted_values: List[float], p: float) -> float:
+    """最近秩法百分位数，sorted_values 必须已排序"""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(p / 100 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+class BenchFixture:
+    """基准测试共用的学员和提交记录，只创建一次"""
+
+    def __init__(self, api: ApiSession):
+        self.student_name = f'基准测试-{uuid.uuid4().hex[:8]}'
+        response = api.post('/api/auth/student/register', json={'name': self.student_name})
+        response.raise_for_status()
+        self.access_key = response.json()['student']['accessKey']
+        response = api.post('/api/submissions/exercise1', json=self.submission(avatar=True))
+        response.raise_for_status()
+        self.submission_id = response.json()['submissionId']
+
+    def submission(self, avatar: bool = False) -> Dict[str, Any]:
+        payload = {'studentName': self.student_name, 'ec2InstanceInfo': TEST_EC2_INFO}
+        if avatar:
+            payload['avatarBase64'] = f'data:image/png;base64,{TEST_AVATAR_BASE64}'
+        return payload
+
+
+# 接口名 -> 发送一次请求的函数
+ENDPOINTS: Dict[str, Callable[[ApiSession, BenchFixture], Any]] = {
+    'health': lambda api, fx: api.get('/health'),
+    'register': lambda api, fx: api.post('/api/auth/student/register', json={'name': fx.student_name}),
+    'submit': lambda api, fx: api.post('/api/submissions/exercise1', json=fx.submission()),
+    'submit-avatar': lambda api, fx: api.post('/api/submissions/exercise1', json=fx.submission(avatar=True)),
+    'avatar': lambda api, fx: api.get(f'/api/submissions/{fx.submission_id}/avatar'),
+    'student-submissions': lambda api, fx: api.get(f'/api/submissions/student/{fx.access_key}'),
+    'student-statistics': lambda api, fx: api.get(f'/api/statistics/student/{fx.access_key}'),
+    'rankings': lambda api, fx: api.get('/api/statistics/rankings'),
+}
+
+
+def server_cpu_ms(config: Config) -> Optional[float]:
+    """服务器进程的累计CPU时间 (ms)；服务器不报告时返回 None"""
+    try:
+        with ApiSession(config) as api:
+            response = api.get('/health')
+            return response.json().get('cpuMs') if response.ok else None
+    except Exception:
+        return None
+
+
+def bench_endpoint(config: Config, fixture: BenchFixture, name: str,
+                   total_requests: int, concurrency: int) -> Dict[str, Any]:
+    """以 concurrency 个线程发送 total_requests 次请求"""
+    send = ENDPOINTS[name]
+    local = threading.local()
+    sessions: List[ApiSession] = []
+    lock = threading.Lock()
+
+    def one_request(_):
+        if not hasattr(local, 'api'):
+            local.api = ApiSession(config)
+            with lock:
+                sessions.append(local.api)
+        start = time.perf_counter()
+        try:
+            status = send(local.api, fixture).status_code
+        except Exception:
+            status = None
+        return (time.perf_counter() - start) * 1000, status
+
+    server_start = server_cpu_ms(config)
+    start = time.perf_counter()
+    cpu_start = time.process_time()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        samples = list(pool.map(one_request, range(total_requests)))
+    cpu_time = time.process_time() - cpu_start
+    wall_time = time.perf_counter() - start
+    server_end = server_cpu_ms(config)
+    server_cpu = None
+    if server_start is not None and server_end is not None and total_requests:
+        server_cpu = round((server_end - server_start) / total_requests, 3)
+    for api in sessions:
+        api.close()
+
+    calls = [call for api in sessions for call in api.http_calls if call['status'] is not None]
+    latencies = sorted(latency for latency, _ in samples)
+    errors = sum(1 for _, status in samples if status is None or status >= 400)
+    return {
+        'endpoint': name,
+        'gzip': config.gzip,
+        'requests': total_requests,
+        'concurrency': concurrency,
+        'errors': errors,
+        'rps': round(total_requests / wall_time, 1) if wall_time > 0 else 0,
+        'p50_ms': round(percentile(latencies, 50), 3),
+        'p95_ms': round(percentile(latencies, 95), 3),
+        'p99_ms': round(percentile(latencies, 99), 3),
+        'max_ms': round(latencies[-1], 3) if latencies else 0,
+        'request_bytes': round(sum(call['request_bytes'] for call in calls) / len(calls)) if calls else 0,
+        'response_bytes': round(sum(call['response_bytes'] for call in calls) / len(calls)) if calls else 0,
+        'client_cpu_ms': round(cpu_time * 1000 / total_requests, 3) if total_requests else 0,
+        'server_cpu_ms': server_cpu
+    }
+
+
+def format_ms(value: Optional[float], width: int) -> str:
+    return f'{value:>{width}.2f}' if value is not None else f"{'-':>{width}}"
+
+
+def print_results(results: List[Dict[str, Any]]) -> None:
+    print(f"{'接口':<22}{'gzip':>6}{'请求':>8}{'错误':>6}{'吞吐/s':>10}{'p50':>10}{'p95':>10}{'p99':>10}"
+          f"{'max':>10}{'上行B':>10}{'下行B':>10}{'客户端CPU':>12}{'服务器CPU':>12}")
+    print('-' * 142)
+    for r in results:
+        print(f"{r['endpoint']:<22}{'on' if r['gzip'] else 'off':>6}{r['requests']:>8}{r['errors']:>6}{r['rps']:>10}"
+              f"{r['p50_ms']:>10.1f}{r['p95_ms']:>10.1f}{r['p99_ms']:>10.1f}{r['max_ms']:>10.1f}"
+              f"{r['request_bytes']:>10}{r['response_bytes']:>10}"
+              f"{format_ms(r['client_cpu_ms'], 12)}{format_ms(r['server_cpu_ms'], 12)}")
+
+
+def print_gzip_savings(results: List[Dict[str, Any]]) -> None:
+    """--compare-gzip: 每个接口开启gzip后的字节数和CPU变化"""
+    by_key = {(r['endpoint'], r['gzip']): r for r in results}
+    print(f"\n{'接口':<22}{'上行节省':>12}{'下行节省':>12}{'客户端CPU增加':>16}{'服务器CPU增加':>16}")
+    print('-' * 78)
+    for name in dict.fromkeys(r['endpoint'] for r in results):
+        off, on = by_key[(name, False)], by_key[(name, True)]
+        saved = [1 - on[key] / off[key] if off[key] else 0.0 for key in ('request_bytes', 'response_bytes')]
+        server = (on['server_cpu_ms'] - off['server_cpu_ms']
+                  if on['server_cpu_ms'] is not None and off['server_cpu_ms'] is not None else None)
+        print(f"{name:<22}{saved[0]:>12.1%}{saved[1]:>12.1%}"
+              f"{format_ms(on['client_cpu_ms'] - off['client_cpu_ms'], 16)}{format_ms(server, 16)}")
+
+
+def run_bench(args, config: Config, fake_server=None) -> int:
+    """exercise1 bench"""
+    endpoints = args.endpoints or list(ENDPOINTS)
+    unknown = [name for name in endpoints if name not in ENDPOINTS]
+    if unknown:
+        print(f"❌ 未知接口: {', '.join(unknown)} (可选: {', '.join(ENDPOINTS)})")
+        return 2
+
+    print(f'⏱️  基准测试: {config.server_url} ({args.requests} 次请求/接口, 并发 {args.concurrency})\n')
+    with ApiSession(config) as api:
+        fixture = BenchFixture(api)
+
+    configs = [config]
+    if args.compare_gzip:
+        configs = [dataclasses.replace(config, gzip=False), dataclasses.replace(config, gzip=True)]
+    results = [bench_endpoint(variant, fixture, name, args.requests, args.concurrency)
+               for name in endpoints for variant in configs]
+    print_results(results)
+    if args.compare_gzip:
+        print_gzip_savings(results)
+    if fake_server is not None:
+        print('\n⚠️  替身服务器与测试在同一进程内运行，客户端和服务器CPU时间都是整个进程的CPU时间')
+
+    if args.json_report:
+        with open(args.json_report, 'w', encoding='utf-8') as f:
+            json.dump({'server_url': config.server_url, 'results': results}, f, indent=2, ensure_ascii=False)
+            f.write('\n')
+        print(f'\n📝 JSON报告: {args.json_report}')
+
+    return 1 if any(r['errors'] for r in results) else 0
@@ -0,0 +1,197 @@
+# -*- coding: utf-8 -*-
+
+"""
+提交风暴测试 (exercise1 burst)
+
+模拟全班同时点击"提交": 先只运行读请求，测得基线延迟；再在读请求继续运行的同时，
+由大量学员线程不停地提交，比较两个阶段读请求的 p99，并统计准入控制拒绝写请求
+(429/503) 的次数和速度。提交线程和 Exercise1Client 一样使用 ApiSession，
+被拒绝时按 Retry-After 退避重试，每次尝试都计入统计；读请求不重试。
+
+通过条件:
+    1. 写风暴期间读请求的 p99 不超过 max(基线p99 × --max-slowdown, 基线p99 + --slack-ms)
+    2. 读请求全部成功 (读和写使用不同的并发配额)
+    3. 所有 429/503 响应都带 Retry-After，除此之外没有 5xx 或连接错误
+    4. 加 --require-shed 时，至少有一个提交被并发限制拒绝 (503)
+
+所有写请求都来自本机同一个IP，会先触发按IP的令牌桶 (429)；要模拟每个学员一个IP、
+让写请求到达并发限制 (503)，需要在服务器端调大 SUBMIT_RATE_PER_MINUTE 和 SUBMIT_BURST。
+使用 --fake 时替身服务器在本进程内按环境变量配置准入控制，和测试线程竞争CPU，
+结果只用于检查行为是否正确。
+
+用法:
+    exercise1 burst --fake
+    SUBMIT_RATE_PER_MINUTE=1000000 SUBMIT_BURST=1000000 SUBMIT_MAX_CONCURRENT=2 SUBMIT_MAX_QUEUE=4 \
+        exercise1 burst --fake --writers 16 --require-shed
+    exercise1 burst --base-url http://localhost:3001 --writers 64 --duration 5
+"""
+
+import dataclasses
+import itertools
+import json
+import threading
+import time
+import uuid
+from collections import Counter
+from typing import Any, Dict, List, Optional
+
+from exercise1.api import ApiSession
+from exercise1.bench import ENDPOINTS, BenchFixture, percentile
+from exercise1.cases import TEST_EC2_INFO
+from exercise1.config import Config
+
+READ_ENDPOINTS = ('health', 'rankings', 'student-statistics')
+
+
+class Samples:
+    """线程安全的 (延迟ms, 状态码, 是否带Retry-After) 记录"""
+
+    def __init__(self):
+        self.items = []
+        self.lock = threading.Lock()
+
+    def add(self, latency_ms: float, status: Optional[int], retry_after: bool) -> None:
+        with self.lock:
+            self.items.append((latency_ms, status, retry_after))
+
+    def latencies(self, statuses=None) -> List[float]:
+        return sorted(latency for latency, status, _ in self.items if statuses is None or status in statuses)
+
+    def statuses(self) -> Counter:
+        return Counter('error' if status is None else status for _, status, _ in self.items)
+
+    def missing_retry_after(self) -> int:
+        return sum(1 for _, status, retry_after in self.items if status in (429, 503) and not retry_after)
+
+
+def timed(samples: Samples, send) -> None:
+    start = time.perf_counter()
+    try:
+        response = send()
+        status, retry_after = response.status_code, 'Retry-After' in response.headers
+    except Exception:
+        status, retry_after = None, False
+    samples.add((time.perf_counter() - start) * 1000, status, retry_after)
+
+
+def reader(config: Config, fixture: BenchFixture, samples: Samples, stop: threading.Event) -> None:
+    with ApiSession(config) as api:
+        for name in itertools.cycle(READ_ENDPOINTS):
+            if stop.is_set():
+                return
+            timed(samples, lambda: ENDPOINTS[name](api, fixture))
+
+
+def writer(config: Config, student_name: str, samples: Samples, stop: threading.Event) -> None:
+    """不停提交；被拒绝时由 ApiSession 退避重试，每次尝试单独记录"""
+    payload = {'studentName': student_name, 'ec2InstanceInfo': TEST_EC2_INFO}
+    with ApiSession(config) as api:
+        while not stop.is_set():
+            try:
+                api.post('/api/submissions/exercise1', json=payload)
+            except Exception:
+                time.sleep(0.1)  # 已记录在 http_calls 中 (status 为 None)
+        for call in api.http_calls:
+            samples.add(call['duration_ms'], call['status'], call['retry_after'] is not None)
+
+
+def run_phase(config: Config, fixture: BenchFixture, readers: int, writer_names: List[str],
+              duration: float):
+    """运行一个阶段，返回 (读请求记录, 写请求记录)"""
+    reads, writes = Samples(), Samples()
+    stop = threading.Event()
+    read_config = dataclasses.replace(config, max_retries=0)
+    threads = [threading.Thread(target=reader, args=(read_config, fixture, reads, stop)) for _ in range(readers)]
+    threads += [threading.Thread(target=writer, args=(config, name, writes, stop)) for name in writer_names]
+    for thread in threads:
+        thread.start()
+    time.sleep(duration)
+    stop.set()
+    for thread in threads:
+        thread.join()
+    return reads, writes
+
+
+def describe(samples: Samples, statuses=None) -> Dict[str, Any]:
+    latencies = samples.latencies(statuses)
+    return {
+        'count': len(latencies),
+        'p50_ms': round(percentile(latencies, 50), 3),
+        'p99_ms': round(percentile(latencies, 99), 3),
+        'max_ms': round(latencies[-1], 3) if latencies else 0
+    }
+
+
+def run_burst(args, config: Config, fake_server=None) -> int:
+    """exercise1 burst"""
+    print(f'🌩️  提交风暴测试: {config.server_url} (读线程 {args.readers}, 写线程 {args.writers}, '
+          f'每阶段 {args.duration}s)\n')
+
+    with ApiSession(config) as api:
+        fixture = BenchFixture(api)
+        writer_names = []
+        for _ in range(args.writers):
+            name = f'风暴测试-{uuid.uuid4().hex[:8]}'
+            response = api.post('/api/auth/student/register', json={'name': name})
+            response.raise_for_status()
+            writer_names.append(name)
+
+    print('1️⃣  基线: 只有读请求...')
+    baseline_reads, _ = run_phase(config, fixture, args.readers, [], args.duration)
+    print('2️⃣  写风暴: 读请求 + 不停提交...')
+    storm_reads, storm_writes = run_phase(config, fixture, args.readers, writer_names, args.duration)
+
+    baseline, storm = describe(baseline_reads), describe(storm_reads)
+    accepted, shed = describe(storm_writes, {201}), describe(storm_writes, {429, 503})
+    write_statuses = storm_writes.statuses()
+
+    print(f"\n{'':<20}{'请求数':>10}{'p50':>10}{'p99':>10}{'max':>10}")
+    print('-' * 60)
+    for title, row in (('读 (基线)', baseline), ('读 (写风暴)', storm),
+                       ('写 (已接受)', accepted), ('写 (被拒绝)', shed)):
+        print(f"{title:<20}{row['count']:>10}{row['p50_ms']:>10.1f}{row['p99_ms']:>10.1f}{row['max_ms']:>10.1f}")
+    print(f"\n写请求状态: {', '.join(f'{status}: {count}' for status, count in sorted(write_statuses.items(), key=str))}")
+
+    p99_budget = max(baseline['p99_ms'] * args.max_slowdown, baseline['p99_ms'] + args.slack_ms)
+    failures = []
+    if storm['p99_ms'] > p99_budget:
+        failures.append(f"写风暴期间读请求 p99 {storm['p99_ms']:.1f}ms 超出预算 {p99_budget:.1f}ms")
+    read_errors = sum(count for status, count in storm_reads.statuses().items() if status == 'error' or status >= 400)
+    if read_errors:
+        failures.append(f'写风暴期间有 {read_errors} 个读请求失败')
+    missing = storm_writes.missing_retry_after()
+    if missing:
+        failures.append(f'{missing} 个 429/503 响应缺少 Retry-After')
+    unexpected = sum(count for status, count in write_statuses.items()
+                     if status == 'error' or (status >= 500 and status != 503))
+    if unexpected:
+        failures.append(f'{unexpected} 个写请求出现连接错误或非503的5xx')
+    if args.require_shed and not write_statuses[503]:
+        failures.append('没有提交被并发限制拒绝 (503)，写风暴没有到达 SUBMIT_MAX_CONCURRENT + SUBMIT_MAX_QUEUE '
+                        f'(429: {write_statuses[429]}，按IP限速时需要调大 SUBMIT_RATE_PER_MINUTE/SUBMIT_BURST)')
+
+    if args.json_report:
+        with open(args.json_report, 'w', encoding='utf-8') as f:
+            json.dump({
+                'server_url': config.server_url,
+                'readers': args.readers,
+                'writers': args.writers,
+                'duration_s': args.duration,
+                'reads_baseline': baseline,
+                'reads_storm': storm,
+                'writes_accepted': accepted,
+                'writes_shed': shed,
+                'write_statuses': {str(status): count for status, count in write_statuses.items()},
+                'read_p99_budget_ms': round(p99_budget, 3),
+                'failures': failures
+            }, f, indent=2, ensure_ascii=False)
+            f.write('\n')
+        print(f'📝 JSON报告: {args.json_report}')
+
+    print()
+    if failures:
+        for failure in failures:
+            print(f'❌ {failure}')
+        return 1
+    print(f"✅ 写风暴期间读请求 p99 {storm['p99_ms']:.1f}ms (预算 {p99_budget:.1f}ms)，被拒绝的写请求都带 Retry-After")
+    return 0
@@ -0,0 +1,256 @@
+# -*- coding: utf-8 -*-
+
+"""
+Exercise 1 API 功能测试用例 (Python版本)
+
+每个用例都是独立的：使用自己唯一命名的学员，自行完成注册和提交，
+不依赖其他用例的执行顺序，因此可以由 `exercise1 check` 并行执行。
+每次HTTP调用的耗时都记录在 ApiContext.http_calls 中。
+"""
+
+import base64
+import gzip
+import json
+import urllib.parse
+import uuid
+from typing import Any, Callable, Dict, List, Optional
+
+from exercise1.api import ApiSession
+from exercise1.config import Config
+
+# 1x1像素PNG测试头像
+TEST_AVATAR_BASE64 = 'iVBORw0KGgoAAAANSUhEUgAAAAEAAAABCAYAAAAfFcSJAAAADUlEQVR42mNkYPhfDwAChAI9jU77zgAAAABJRU5ErkJggg=='
+
+TEST_EC2_INFO = {
+    'operatingSystem': 'Amazon Linux 2',
+    'amiId': 'ami-0abcdef1234567890',
+    'internalIpAddress': '10.0.1.100',
+    'elasticIpAddress': '203.0.113.100',
+    'instanceType': 't3.micro'
+}
+
+# 注册顺序即默认执行顺序
+CASES: List[Callable[['ApiContext'], None]] = []
+
+
+def case(func: Callable[['ApiContext'], None]) -> Callable[['ApiContext'], None]:
+    """注册一个测试用例"""
+    CASES.append(func)
+    return func
+
+
+class ApiContext:
+    """单个用例的运行环境: 独立的HTTP会话、唯一学员名和调用耗时记录"""
+
+    def __init__(self, config: Config, case_name: str):
+        self.api = ApiSession(config)
+        self.student_name = f'并行测试-{case_name}-{uuid.uuid4().hex[:8]}'
+        self.access_key: Optional[str] = None
+
+    @property
+    def http_calls(self) -> List[Dict[str, Any]]:
+        return self.api.http_calls
+
+    def request(self, method: str, path: str, **kwargs):
+        """发送HTTP请求并记录耗时；path 以 /api 或 /health 开头"""
+        return self.api.request(method, path, **kwargs)
+
+    def close(self):
+        self.api.close()
+
+    # ---- 常用步骤 ----
+
+    def register(self) -> str:
+        response = self.request('POST', '/api/auth/student/register', json={'name': self.student_name})
+        assert response.status_code == 201, f'注册返回 {response.status_code}: {response.text}'
+        self.access_key = response.json()['student']['accessKey']
+        return self.access_key
+
+    def submit(self, ec2_info: Optional[Dict[str, Any]] = None, avatar_base64: Optional[str] = None) -> Dict[str, Any]:
+        payload = {'studentName': self.student_name, 'ec2InstanceInfo': ec2_info or TEST_EC2_INFO}
+        if avatar_base64:
+            payload['avatarBase64'] = f'data:image/png;base64,{avatar_base64}'
+        response = self.request('POST', '/api/submissions/exercise1', json=payload)
+        assert response.status_code == 201, f'提交返回 {response.status_code}: {response.text}'
+        data = response.json()
+        assert data.get('success'), f'提交失败: {data}'
+        return data
+
+
+@case
+def test_health_check(ctx: ApiContext):
+    """健康检查"""
+    response = ctx.request('GET', '/health')
+    assert response.status_code == 200
+    assert response.json()['status'] == 'OK'
+
+
+@case
+def test_student_registration(ctx: ApiContext):
+    """新学员注册返回201，重复注册返回同一访问密钥"""
+    access_key = ctx.register()
+    response = ctx.request('POST', '/api/auth/student/register', json={'name': ctx.student_name})
+    assert response.status_code == 200
+    data = response.json()
+    assert data['isNewRegistration'] is False
+    assert data['student']['accessKey'] == access_key
+
+
+@case
+def test_access_key_lookup(ctx: ApiContext):
+    """按姓名查询访问密钥"""
+    access_key = ctx.register()
+    encoded_name = urllib.parse.quote(ctx.student_name)
+    response = ctx.request('GET', f'/api/auth/student/lookup/{encoded_name}')
+    assert response.status_code == 200
+    assert response.json()['student']['accessKey'] == access_key
+
+
+@case
+def test_lookup_unknown_student(ctx: ApiContext):
+    """查询不存在的学员返回404"""
+    encoded_name = urllib.parse.quote(ctx.student_name)
+    response = ctx.request('GET', f'/api/auth/student/lookup/{encoded_name}')
+    assert response.status_code == 404
+
+
+@case
+def test_submission_without_avatar(ctx: ApiContext):
+    """完整EC2信息+弹性IP，无头像得90分"""
+    data = ctx.submit()
+    assert data['score'] == 90
+    assert data['avatarInfo'] is None
+
+
+@case
+def test_submission_without_elastic_ip(ctx: ApiContext):
+    """完整EC2信息，无弹性IP无头像得80分"""
+    data = ctx.submit(dict(TEST_EC2_INFO, elasticIpAddress=''))
+    assert data['score'] == 80
+
+
+@case
+def test_submission_with_avatar(ctx: ApiContext):
+    """base64头像提交得100分"""
+    data = ctx.submit(avatar_base64=TEST_AVATAR_BASE64)
+    assert data['score'] == 100
+    assert data['avatarInfo']['size'] == len(base64.b64decode(TEST_AVATAR_BASE64))
+
+
+@case
+def test_file_upload_submission(ctx: ApiContext):
+    """multipart文件上传提交得100分"""
+    form = {'studentName': ctx.student_name}
+    for field, value in TEST_EC2_INFO.items():
+        form[f'ec2InstanceInfo[{field}]'] = value
+    files = {'avatar': ('test-avatar.png', base64.b64decode(TEST_AVATAR_BASE64), 'image/png')}
+    response = ctx.request('POST', '/api/submissions/exercise1', data=form, files=files)
+    assert response.status_code == 201, f'提交返回 {response.status_code}: {response.text}'
+    data = response.json()
+    assert data['score'] == 100
+    assert data['avatarInfo']['filename'] == 'test-avatar.png'
+
+
+@case
+def test_submission_validation_error(ctx: ApiContext):
+    """缺少必填字段返回400"""
+    response = ctx.request('POST', '/api/submissions/exercise1', json={'studentName': ctx.student_name})
+    assert response.status_code == 400
+    assert response.json()['error'] == 'Validation failed'
+
+
+@case
+def test_avatar_download(ctx: ApiContext):
+    """下载的头像与上传的数据一致"""
+    submission_id = ctx.submit(avatar_base64=TEST_AVATAR_BASE64)['submissionId']
+    response = ctx.request('GET', f'/api/submissions/{submission_id}/avatar')
+    assert response.status_code == 200
+    assert response.headers.get('content-type', '').startswith('image/png')
+    assert response.content == base64.b64decode(TEST_AVATAR_BASE64)
+
+
+@case
+def test_avatar_download_without_avatar(ctx: ApiContext):
+    """没有头像的提交返回404"""
+    submission_id = ctx.submit()['submissionId']
+    response = ctx.request('GET', f'/api/submissions/{submission_id}/avatar')
+    assert response.status_code == 404
+
+
+@case
+def test_student_submissions(ctx: ApiContext):
+    """提交记录按时间倒序返回全部提交"""
+    access_key = ctx.register()
+    ctx.submit()
+    ctx.submit(avatar_base64=TEST_AVATAR_BASE64)
+    response = ctx.request('GET', f'/api/submissions/student/{access_key}')
+    assert response.status_code == 200
+    submissions = response.json()['submissions']
+    assert len(submissions) == 2
+    assert submissions[0]['avatarInfo'] is not None
+
+
+@case
+def test_student_statistics(ctx: ApiContext):
+    """统计信息汇总全部提交"""
+    access_key = ctx.register()
+    ctx.submit()
+    ctx.submit(avatar_base64=TEST_AVATAR_BASE64)
+    response = ctx.request('GET', f'/api/statistics/student/{access_key}')
+    assert response.status_code == 200
+    stats = response.json()['statistics']
+    assert stats['totalSubmissions'] == 2
+    assert stats['totalScore'] == 190
+    assert stats['highestScore'] == 100
+    assert stats['currentRank'] is not None
+
+
+@case
+def test_rankings(ctx: ApiContext):
+    """排行榜按最高分计入学员"""
+    ctx.submit()
+    ctx.submit(avatar_base64=TEST_AVATAR_BASE64)
+    response = ctx.request('GET', '/api/statistics/rankings')
+    assert response.status_code == 200
+    rankings = response.json()['rankings']
+    entry = next((r for r in rankings if r['studentName'] == ctx.student_name), None)
+    assert entry is not None, '排行榜中未找到测试学员'
+    assert int(entry['totalScore']) == 100
+
+
+@case
+def test_unknown_route(ctx: ApiContext):
+    """未知路由返回404"""
+    response = ctx.request('GET', '/api/does-not-exist')
+    assert response.status_code == 404
+    assert response.json()['error'] == 'Route not found'
+
+
+@case
+def test_gzip_request_body(ctx: ApiContext):
+    """gzip压缩的JSON请求正文解压后正常处理"""
+    body = gzip.compress(json.dumps({'name': ctx.student_name}).encode('utf-8'))
+    response = ctx.request('POST', '/api/auth/student/register', data=body,
+                           headers={'Content-Type': 'application/json', 'Content-Encoding': 'gzip'})
+    assert response.status_code == 201, f'注册返回 {response.status_code}: {response.text}'
+
+
+@case
+def test_gzip_body_limit(ctx: ApiContext):
+    """解压后超过10MB的请求正文返回413"""
+    inflated = b'{"name":"' + b'a' * (10 * 1024 * 1024) + b'"}'
+    response = ctx.request('POST', '/api/auth/student/register', data=gzip.compress(inflated),
+                           headers={'Content-Type': 'application/json', 'Content-Encoding': 'gzip'})
+    assert response.status_code == 413
+
+
+@case
+def test_gzip_response(ctx: ApiContext):
+    """超过1KB的响应按 Accept-Encoding 压缩"""
+    access_key = ctx.register()
+    for _ in range(5):
+        ctx.submit()
+    response = ctx.request('GET', f'/api/submissions/student/{access_key}', headers={'Accept-Encoding': 'gzip'})
+    assert response.status_code == 200
+    assert response.headers.get('Content-Encoding') == 'gzip'
+    assert len(response.json()['submissions']) == 5
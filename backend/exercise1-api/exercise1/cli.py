@@ -0,0 +1,197 @@
+# -*- coding: utf-8 -*-
+
+"""
+exercise1 命令行入口
+
+子命令的参数都在这里声明，但实现模块只在执行该子命令时才导入，
+因此 `exercise1 --help` 不会加载 requests、psycopg2 等依赖。
+"""
+
+import argparse
+import importlib
+import os
+import sys
+from typing import List, Optional
+
+# exercise1-api 目录 (server.js、queries.js 所在目录)
+API_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _add_api_options(parser: argparse.ArgumentParser) -> None:
+    """访问API的子命令共用的参数"""
+    parser.add_argument('--base-url', help='服务器地址或API地址 (默认读取 API_BASE_URL，http://localhost:3001/api)')
+    parser.add_argument('--timeout', type=float, help='单次HTTP请求超时 (秒)')
+    parser.add_argument('--fake', action='store_true', help='在进程内启动本地替身服务器 (无需网络和PostgreSQL)')
+
+
+def _add_command(subparsers, name: str, handler: str, help_text: str,
+                 api: bool = True) -> argparse.ArgumentParser:
+    parser = subparsers.add_parser(name, help=help_text, description=help_text)
+    if api:
+        _add_api_options(parser)
+    parser.set_defaults(handler=handler, uses_api=api)
+    return parser
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog='exercise1',
+        description='Exercise 1 API 工具集: 学员提交、功能测试、服务器检查、基准测试、数据导出和数据审计'
+    )
+    parser.add_argument('--version', action='store_true', help='显示版本号')
+    subparsers = parser.add_subparsers(dest='command', metavar='<命令>')
+
+    submit = _add_command(subparsers, 'submit', 'exercise1.client:run_submit',
+                          '收集EC2信息并提交练习 (学员示例程序)')
+    submit.add_argument('--name', help='学员姓名 (默认读取 STUDENT_NAME)')
+    submit.add_argument('--access-key', help='已有的访问密钥 (默认读取 ACCESS_KEY)')
+    submit.add_argument('--no-avatar', action='store_true', help='不提交头像')
+
+    check = _add_command(subparsers, 'check', 'exercise1.runner:run_check',
+                         '并行运行API功能测试并输出报告')
+    check.add_argument('--workers', type=int, default=8, help='并发数')
+    check.add_argument('-k', dest='keyword', help='只运行名称包含该关键字的用例')
+    check.add_argument('--json', dest='json_report', help='JSON报告输出路径')
+    check.add_argument('--junit', dest='junit_report', help='JUnit XML报告输出路径')
+    check.add_argument('--baseline', default='test-baseline.json', help='耗时基线文件')
+    check.add_argument('--update-baseline', action='store_true', help='用本次通过的用例耗时更新基线')
+    check.add_argument('--slow-factor', type=float, default=1.5, help='超过基线多少倍视为变慢')
+    check.add_argument('--slow-slack-ms', type=float, default=20, help='判定变慢时额外允许的毫秒数')
+
+    _add_command(subparsers, 'probe', 'exercise1.probe:run_probe', '快速检查服务器状态和接口是否可用')
+
+    bench = _add_command(subparsers, 'bench', 'exercise1.bench:run_bench', '接口延迟基准测试')
+    bench.add_argument('-e', '--endpoint', dest='endpoints', action='append',
+                       help='只测试指定接口，可重复 (health, register, submit, submit-avatar, avatar, '
+                            'student-submissions, student-statistics, rankings)')
+    bench.add_argument('-n', '--requests', type=int, default=100, help='每个接口的请求数')
+    bench.add_argument('-c', '--concurrency', type=int, default=8, help='并发数')
+    bench.add_argument('--compare-gzip', action='store_true', help='每个接口分别在关闭和开启gzip时各测一轮')
+    bench.add_argument('--json', dest='json_report', help='JSON报告输出路径')
+
+    bench_sql = _add_command(subparsers, 'bench-sql', 'exercise1.sql_bench:run_sql_bench',
+                             '比较 queries.js 中每条语句即席执行和预编译执行的延迟 (需要数据库和node)', api=False)
+    bench_sql.add_argument('-s', '--statement', dest='statements', action='append',
+                           help='只测试指定语句，可重复 (默认全部)')
+    bench_sql.add_argument('-n', '--iterations', type=int, default=200, help='每条语句每种方式的执行次数')
+    bench_sql.add_argument('--warmup', type=int, default=10, help='不计入统计的预热次数')
+    bench_sql.add_argument('--catalog', default=os.path.join(API_DIR, 'queries.js'), help='语句目录文件 (默认 exercise1-api/queries.js)')
+    bench_sql.add_argument('--json', dest='json_report', help='JSON报告输出路径')
+
+    burst = _add_command(subparsers, 'burst', 'exercise1.burst:run_burst',
+                         '提交风暴测试: 检查大量并发提交时读请求延迟和准入控制')
+    burst.add_argument('--readers', type=int, default=4, help='读请求线程数')
+    burst.add_argument('--writers', type=int, default=32, help='提交线程数 (每个线程一个学员)')
+    burst.add_argument('--duration', type=float, default=3, help='每个阶段的持续时间 (秒)')
+    burst.add_argument('--max-slowdown', type=float, default=3, help='读请求p99允许比基线慢的倍数')
+    burst.add_argument('--slack-ms', type=float, default=100, help='读请求p99允许比基线多出的毫秒数')
+    burst.add_argument('--require-shed', action='store_true', help='没有提交被并发限制拒绝 (503) 时失败')
+    burst.add_argument('--json', dest='json_report', help='JSON报告输出路径')
+
+    replica_load = _add_command(subparsers, 'replica-load', 'exercise1.replica_load:run_replica_load',
+                                '读副本隔离测试: 检查读负载转到副本时提交延迟不受影响')
+    replica_load.add_argument('--readers', type=int, default=16, help='读请求线程数')
+    replica_load.add_argument('--writers', type=int, default=2, help='提交线程数 (每个线程一个学员)')
+    replica_load.add_argument('--interval', type=float, default=1.0, help='每个提交线程两次提交的间隔 (秒)')
+    replica_load.add_argument('--duration', type=float, default=15, help='每个阶段的持续时间 (秒)')
+    replica_load.add_argument('--max-slowdown', type=float, default=1.5, help='提交p99允许比基线慢的倍数')
+    replica_load.add_argument('--slack-ms', type=float, default=50, help='提交p99允许比基线多出的毫秒数')
+    replica_load.add_argument('--require-replica', action='store_true', help='服务器没有配置副本时失败而不是跳过')
+    replica_load.add_argument('--json', dest='json_report', help='JSON报告输出路径')
+
+    export = _add_command(subparsers, 'export', 'exercise1.export:run_export', '导出排行榜或学员提交记录')
+    export.add_argument('what', choices=['rankings', 'submissions'], help='导出内容')
+    export.add_argument('--access-key', help='导出提交记录时使用的访问密钥 (默认读取 ACCESS_KEY)')
+    export.add_argument('--format', choices=['csv', 'json'], default='csv', help='输出格式')
+    export.add_argument('-o', '--output', help='输出文件 (默认标准输出)')
+
+    audit = subparsers.add_parser('audit', help='数据一致性审计', description='数据一致性审计')
+    audit_subparsers = audit.add_subparsers(dest='audit_command', metavar='<审计项>', required=True)
+    summary = _add_command(audit_subparsers, 'summary', 'exercise1.summary_audit:run_summary_audit',
+                           '检查 student_summary 与原始提交记录是否一致 (需要数据库)', api=False)
+    summary.add_argument('--fix', action='store_true', help='按重新计算的结果修正偏差行')
+    summary.add_argument('--limit', type=int, default=20, help='报告中最多显示的学员数')
+    _add_command(audit_subparsers, 'storage', 'exercise1.avatar_storage:run_storage_check',
+                 '提交头像后从数据库和下载接口校验头像数据')
+    avatars = _add_command(audit_subparsers, 'avatars', 'exercise1.avatar_audit:run_avatar_audit',
+                           '并行校验全部头像的格式、完整性、大小和MIME类型 (需要数据库)', api=False)
+    avatars.add_argument('--workers', type=int, default=4, help='校验进程数')
+    avatars.add_argument('--batch-size', type=int, default=200, help='每批读取和校验的记录数')
+    avatars.add_argument('--repair', action='store_true', help='按实际数据修正 screenshot_size 和 screenshot_mimetype')
+    avatars.add_argument('--checkpoint', default='avatar-audit.checkpoint.json', help='检查点文件')
+    avatars.add_argument('--resume', action='store_true', help='从检查点记录的位置继续')
+    avatars.add_argument('--report', help='问题明细输出路径 (JSON Lines)')
+    avatars.add_argument('--limit', type=int, default=20, help='终端中最多显示的问题记录数')
+
+    retention = _add_command(subparsers, 'retention', 'exercise1.retention:run_retention',
+                             '把被取代的提交 (既非最高分也非最新) 分批移入 submissions_archive (需要数据库)',
+                             api=False)
+    retention.add_argument('--dry-run', action='store_true', help='只统计可归档的提交，不修改数据')
+    retention.add_argument('--min-age-hours', type=float, default=24, help='只归档早于该小时数的提交')
+    retention.add_argument('--batch-students', type=int, default=200, help='每批 (一个短事务) 处理的学员数')
+    retention.add_argument('--max-batches', type=int, default=0, help='最多处理的批数 (0 表示不限)')
+    retention.add_argument('--lock-timeout-ms', type=int, default=2000, help='每批事务的 lock_timeout')
+    retention.add_argument('--lock-retries', type=int, default=3, help='拿不到锁时每批的重试次数')
+    retention.add_argument('--pause-ms', type=int, default=50, help='批与批之间的间隔')
+    retention.add_argument('--months-ahead', type=int, default=3, help='预先创建未来几个月的分区')
+
+    rescore = _add_command(subparsers, 'rescore', 'exercise1.rescore:run_rescore',
+                           '按 scoring_rules 中的评分规则批量重新计算已有提交的分数 (需要数据库和numpy)', api=False)
+    rescore.add_argument('--rules-version', type=int, help='评分规则版本 (默认当前启用的版本)')
+    rescore.add_argument('--activate', action='store_true', help='同时把该版本设为启用版本')
+    rescore.add_argument('--dry-run', action='store_true', help='只报告变化，最后回滚')
+    rescore.add_argument('--exercise-title', default='Hands-on Exercise 1', help='重新评分的练习')
+    rescore.add_argument('--json', dest='json_report', help='JSON报告输出路径')
+
+    fake = _add_command(subparsers, 'fake', 'exercise1.fake_server:run_fake',
+                        '在前台运行本地替身服务器', api=False)
+    fake.add_argument('--host', default='127.0.0.1', help='监听地址')
+    fake.add_argument('--port', type=int, default=3001, help='监听端口')
+    fake.add_argument('--db', default=':memory:', help='sqlite 数据库文件 (默认内存)')
+    fake.add_argument('--verbose', action='store_true', help='打印请求日志')
+
+    return parser
+
+
+def load_handler(spec: str):
+    module_name, func_name = spec.split(':')
+    return getattr(importlib.import_module(module_name), func_name)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """命令行入口，返回进程退出码"""
+    parser = build_parser()
+    args = parser.parse_args(argv)
+
+    if args.version:
+        from exercise1 import __version__
+        print(__version__)
+        return 0
+    if not getattr(args, 'handler', None):
+        parser.print_help()
+        return 2
+
+    handler = load_handler(args.handler)
+
+    from exercise1.config import Config
+    config = Config.from_env(getattr(args, 'base_url', None), getattr(args, 'timeout', None))
+
+    fake_server = None
+    if getattr(args, 'fake', False):
+        from exercise1.fake_server import FakeServer
+        fake_server = FakeServer().start()
+        config.api_base_url = fake_server.api_base_url
+        print(f'🧪 使用本地替身服务器: {fake_server.base_url}\n')
+
+    try:
+        return handler(args, config, fake_server) or 0
+    except KeyboardInterrupt:
+        print('\n\n⚠️  已被用户中断')
+        return 130
+    finally:
+        if fake_server:
+            fake_server.stop()
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,67 @@
+# -*- coding: utf-8 -*-
+
+"""
+统一配置: 所有子命令共用的服务器地址、学员信息和数据库连接参数
+
+环境变量:
+    API_BASE_URL   API地址 (默认 http://localhost:3001/api)
+    STUDENT_NAME   学员姓名 (默认 张三)
+    ACCESS_KEY     已有的访问密钥
+    API_GZIP       设为 0 时关闭gzip (请求不压缩，响应要求 identity 编码)
+    API_GZIP_THRESHOLD   请求正文达到多少字节才压缩 (默认 1024)
+    API_MAX_RETRIES      收到带 Retry-After 的 429/503 时最多重试几次 (默认 3)
+    DB_HOST / DB_PORT / DB_NAME / DB_USER / DB_PASSWORD   数据库连接 (与 .env.example 一致)
+"""
+
+import os
+from dataclasses import dataclass, field
+from typing import Any, Dict, Optional
+
+DEFAULT_API_BASE_URL = 'http://localhost:3001/api'
+DEFAULT_GZIP_THRESHOLD = 1024  # 与 server.js 的 COMPRESSION_THRESHOLD 默认值一致
+
+
+def db_config_from_env() -> Dict[str, Any]:
+    """psycopg2.connect 使用的连接参数"""
+    return {
+        'host': os.getenv('DB_HOST', 'localhost'),
+        'port': int(os.getenv('DB_PORT', '5432')),
+        'database': os.getenv('DB_NAME', 'hands_on_training'),
+        'user': os.getenv('DB_USER', 'postgres'),
+        'password': os.getenv('DB_PASSWORD', 'postgres')
+    }
+
+
+@dataclass
+class Config:
+    api_base_url: str = DEFAULT_API_BASE_URL
+    student_name: str = '张三'
+    access_key: Optional[str] = None
+    timeout: float = 10
+    gzip: bool = True
+    gzip_threshold: int = DEFAULT_GZIP_THRESHOLD
+    max_retries: int = 3
+    db: Dict[str, Any] = field(default_factory=db_config_from_env)
+
+    @property
+    def server_url(self) -> str:
+        """不带 /api 后缀的服务器地址，用于 /health"""
+        base = self.api_base_url.rstrip('/')
+        return base[:-len('/api')] if base.endswith('/api') else base
+
+    @classmethod
+    def from_env(cls, base_url: Optional[str] = None, timeout: Optional[float] = None) -> 'Config':
+        """从环境变量读取配置；base_url 可以是服务器地址或API地址"""
+        api_base_url = os.getenv('API_BASE_URL', DEFAULT_API_BASE_URL)
+        if base_url:
+            base_url = base_url.rstrip('/')
+            api_base_url = base_url if base_url.endswith('/api') else f'{base_url}/api'
+        return cls(
+            api_base_url=api_base_url.rstrip('/'),
+            student_name=os.getenv('STUDENT_NAME', '张三'),
+            access_key=os.getenv('ACCESS_KEY') or None,
+            timeout=timeout if timeout is not None else float(os.getenv('API_TIMEOUT', '10')),
+            gzip=os.getenv('API_GZIP', '1').lower() not in ('0', 'false', 'no'),
+            gzip_threshold=int(os.getenv('API_GZIP_THRESHOLD', str(DEFAULT_GZIP_THRESHOLD))),
+            max_retries=int(os.getenv('API_MAX_RETRIES', '3'))
+        )
@@ -0,0 +1,74 @@
+# -*- coding: utf-8 -*-
+
+"""
+导出排行榜和学员提交记录 (exercise1 export)
+
+用法:
+    exercise1 export rankings --format csv -o rankings.csv
+    exercise1 export submissions --access-key <key> --format json
+"""
+
+import csv
+import json
+import sys
+from typing import Any, Dict, List
+
+from exercise1.api import ApiSession
+from exercise1.config import Config
+
+
+def flatten(row: Dict[str, Any], prefix: str = '') -> Dict[str, Any]:
+    """把嵌套对象展开为 a.b 形式的列，便于写入CSV"""
+    flat: Dict[str, Any] = {}
+    for key, value in row.items():
+        column = f'{prefix}{key}'
+        if isinstance(value, dict):
+            flat.update(flatten(value, f'{column}.'))
+        else:
+            flat[column] = value
+    return flat
+
+
+def fetch_rows(api: ApiSession, what: str, access_key: str) -> List[Dict[str, Any]]:
+    if what == 'rankings':
+        response = api.get('/api/statistics/rankings')
+        response.raise_for_status()
+        return response.json()['rankings']
+
+    response = api.get(f'/api/submissions/student/{access_key}')
+    response.raise_for_status()
+    return response.json()['submissions']
+
+
+def write_rows(rows: List[Dict[str, Any]], output_format: str, stream) -> None:
+    if output_format == 'json':
+        json.dump(rows, stream, indent=2, ensure_ascii=False)
+        stream.write('\n')
+        return
+
+    flat_rows = [flatten(row) for row in rows]
+    columns: List[str] = []
+    for row in flat_rows:
+        columns.extend(column for column in row if column not in columns)
+    writer = csv.DictWriter(stream, fieldnames=columns)
+    writer.writeheader()
+    writer.writerows(flat_rows)
+
+
+def run_export(args, config: Config, fake_server=None) -> int:
+    """exercise1 export"""
+    access_key = args.access_key or config.access_key
+    if args.what == 'submissions' and not access_key:
+        print('❌ 导出提交记录需要 --access-key 或 ACCESS_KEY 环境变量', file=sys.stderr)
+        return 2
+
+    with ApiSession(config) as api:
+        rows = fetch_rows(api, args.what, access_key)
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8', newline='') as f:
+            write_rows(rows, args.format, f)
+        print(f'📝 已导出 {len(rows)} 行到 {args.output}')
+    else:
+        write_rows(rows, args.format, sys.stdout)
+    return 0
@@ -0,0 +1,951 @@
+# -*- coding: utf-8 -*-
+
+"""
+Exercise 1 API 本地替身服务器 (Python版本)
+
+只依赖标准库 (http.server + sqlite3)，评分规则 (scoring_rules.json) 和响应格式与 server.js 保持一致，
+用于在没有网络和PostgreSQL的环境中快速运行Python测试脚本。
+
+用法:
+    exercise1 fake --port 3001                     # 独立运行
+    exercise1 check --fake                         # 子命令在进程内启动
+
+    from exercise1.fake_server import FakeServer
+    with FakeServer() as server:
+        print(server.api_base_url)
+"""
+
+import base64
+import binascii
+import email.parser
+import email.policy
+import gzip
+import ipaddress
+import json
+import math
+import os
+import random
+import re
+import sqlite3
+import string
+import threading
+import time
+import uuid
+import zlib
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import unquote, urlsplit
+
+from exercise1.scoring import load_default_rules, score_features, submission_features
+
+EXERCISE1_TITLE = 'Hands-on Exercise 1'
+MAX_AVATAR_SIZE = 5 * 1024 * 1024  # 与 multer 的 fileSize 限制一致
+MAX_BODY_SIZE = 10 * 1024 * 1024   # 与 express.json({ limit: '10mb' }) 一致，按解压后的大小计算
+COMPRESSION_THRESHOLD = 1024       # 与 compression({ threshold: '1kb' }) 一致
+DEFAULT_RULES = load_default_rules()
+
+EC2_FIELDS = ('operatingSystem', 'amiId', 'internalIpAddress', 'elasticIpAddress', 'instanceType')
+
+SCHEMA = """
+    CREATE TABLE students (
+        id TEXT PRIMARY KEY,
+        name TEXT NOT NULL,
+        name_key TEXT NOT NULL,
+        access_key TEXT UNIQUE NOT NULL,
+        registered_at TEXT NOT NULL,
+        last_active_at TEXT NOT NULL
+    );
+    CREATE INDEX idx_students_name_key ON students(name_key);
+
+    CREATE TABLE exercises (
+        id TEXT PRIMARY KEY,
+        title TEXT NOT NULL,
+        is_published INTEGER NOT NULL DEFAULT 1
+    );
+
+    CREATE TABLE submissions (
+        id TEXT PRIMARY KEY,
+        student_id TEXT NOT NULL REFERENCES students(id),
+        exercise_id TEXT NOT NULL REFERENCES exercises(id),
+        client_ip_address TEXT NOT NULL,
+        operating_system TEXT,
+        ami_id TEXT,
+        internal_ip_address TEXT,
+        elastic_ip_address TEXT,
+        instance_type TEXT,
+        screenshot_data BLOB,
+        screenshot_filename TEXT,
+        screenshot_mimetype TEXT,
+        screenshot_size INTEGER,
+        score INTEGER NOT NULL DEFAULT 0,
+        submitted_at TEXT NOT NULL,
+        processing_status TEXT NOT NULL DEFAULT 'processed'
+    );
+    CREATE INDEX idx_submissions_student_id ON submissions(student_id);
+"""
+
+
+def calculate_score(ec2_info: Dict[str, Any], has_avatar: bool) -> int:
+    """与 server.js 相同: 按 scoring_rules.json 中的初始规则评分"""
+    return score_features(DEFAULT_RULES['rules'], submission_features(ec2_info, has_avatar))
+
+
+def generate_access_key() -> str:
+    """与 server.js 的 generateAccessKey 格式相同 (26位小写字母和数字)"""
+    alphabet = string.ascii_lowercase + string.digits
+    return ''.join(random.choice(alphabet) for _ in range(26))
+
+
+def now_iso() -> str:
+    """与 pg 返回的 Date 序列化格式一致"""
+    return datetime.now(timezone.utc).isoformat(timespec='milliseconds').replace('+00:00', 'Z')
+
+
+class BodyError(Exception):
+    """对应 body-parser 的 4xx 错误 (正文过大、无法解码)"""
+
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+
+
+def inflate_body(body: bytes, encoding: str) -> bytes:
+    """按 Content-Encoding 解压请求正文，解压后超过 MAX_BODY_SIZE 时抛出 BodyError(413)"""
+    encoding = encoding.strip().lower() or 'identity'
+    if encoding == 'identity':
+        inflated = body
+    elif encoding in ('gzip', 'deflate'):
+        decompressor = zlib.decompressobj(wbits=47)  # 自动识别gzip和zlib头
+        try:
+            inflated = decompressor.decompress(body, MAX_BODY_SIZE + 1)
+        except zlib.error:
+            raise BodyError(400, 'incorrect header check')
+    else:
+        raise BodyError(415, f'unsupported content encoding "{encoding}"')
+    if len(inflated) > MAX_BODY_SIZE:
+        raise BodyError(413, 'request entity too large')
+    return inflated
+
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        return int(os.getenv(name, ''))
+    except ValueError:
+        return default
+
+
+class ConcurrencyLimit:
+    """对应 admission.js 的 concurrencyLimit: 并发上限 + 有界等待队列 + 排队超时"""
+
+    def __init__(self, name: str, max_concurrent: int, max_queue: int, queue_timeout: float):
+        self.name = name
+        self.max_concurrent = max_concurrent
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self.active = 0
+        self.queued = 0
+        self.rejected = 0
+        self.cond = threading.Condition()
+
+    def acquire(self) -> bool:
+        with self.cond:
+            if self.active < self.max_concurrent:
+                self.active += 1
+                return True
+            if self.queued >= self.max_queue:
+                self.rejected += 1
+                return False
+            self.queued += 1
+            admitted = self.cond.wait_for(lambda: self.active < self.max_concurrent, self.queue_timeout)
+            self.queued -= 1
+            if not admitted:
+                self.rejected += 1
+                return False
+            self.active += 1
+            return True
+
+    def release(self) -> None:
+        with self.cond:
+            self.active -= 1
+            self.cond.notify()
+
+    def stats(self) -> Dict[str, int]:
+        return {'active': self.active, 'queued': self.queued, 'rejected': self.rejected,
+                'maxConcurrent': self.max_concurrent, 'maxQueue': self.max_queue}
+
+
+class RateLimit:
+    """对应 admission.js 的 rateLimit: 按客户端IP的令牌桶"""
+
+    def __init__(self, name: str, rate_per_minute: int, burst: int):
+        self.name = name
+        self.rate_per_minute = rate_per_minute
+        self.burst = burst
+        self.buckets: Dict[str, Tuple[float, float]] = {}
+        self.rejected = 0
+        self.lock = threading.Lock()
+
+    def take(self, ip: str) -> Optional[float]:
+        """取一个令牌；令牌不足时返回需要等待的秒数"""
+        rate_per_second = self.rate_per_minute / 60
+        now = time.monotonic()
+        with self.lock:
+            tokens, updated_at = self.buckets.get(ip, (self.burst, now))
+            tokens = min(self.burst, tokens + (now - updated_at) * rate_per_second)
+            if tokens < 1:
+                self.buckets[ip] = (tokens, now)
+                self.rejected += 1
+                return (1 - tokens) / rate_per_second
+            self.buckets[ip] = (tokens - 1, now)
+            return None
+
+    def stats(self) -> Dict[str, int]:
+        return {'clients': len(self.buckets), 'rejected': self.rejected,
+                'ratePerMinute': self.rate_per_minute, 'burst': self.burst}
+
+
+def admission_from_env() -> Dict[str, Any]:
+    """与 server.js 相同的环境变量和默认值"""
+    queue_timeout = _env_int('ADMISSION_QUEUE_TIMEOUT_MS', 1500) / 1000
+    return {
+        'submissions': ConcurrencyLimit('submission', _env_int('SUBMIT_MAX_CONCURRENT', 8),
+                                        _env_int('SUBMIT_MAX_QUEUE', 40), queue_timeout),
+        'registrations': ConcurrencyLimit('registration', _env_int('REGISTER_MAX_CONCURRENT', 4),
+                                          _env_int('REGISTER_MAX_QUEUE', 20), queue_timeout),
+        'reads': ConcurrencyLimit('read', _env_int('READ_MAX_CONCURRENT', 8),
+                                  _env_int('READ_MAX_QUEUE', 100), queue_timeout),
+        'submitRate': RateLimit('submission', _env_int('SUBMIT_RATE_PER_MINUTE', 120),
+                                _env_int('SUBMIT_BURST', 60))
+    }
+
+
+class ValidationError(Exception):
+    """对应 Joi 校验失败，message 与 Joi 的错误描述格式相同"""
+
+
+def _is_ip(value: str) -> bool:
+    try:
+        ipaddress.ip_network(value, strict=False) if '/' in value else ipaddress.ip_address(value)
+        return True
+    except ValueError:
+        return False
+
+
+def _validate_string(data: Dict[str, Any], key: str, label: str, required: bool = True,
+                     max_length: Optional[int] = None, ip: bool = False,
+                     allow_empty: bool = False, trim: bool = False) -> None:
+    if key not in data or data[key] is None:
+        if required:
+            raise ValidationError(f'"{label}" is required')
+        return
+    value = data[key]
+    if not isinstance(value, str):
+        raise ValidationError(f'"{label}" must be a string')
+    if trim:
+        value = data[key] = value.strip()
+    if value == '':
+        if allow_empty:
+            return
+        raise ValidationError(f'"{label}" is not allowed to be empty')
+    if max_length is not None and len(value) > max_length:
+        raise ValidationError(f'"{label}" length must be less than or equal to {max_length} characters long')
+    if ip and not _is_ip(value):
+        raise ValidationError(f'"{label}" must be a valid ip address with a optional CIDR')
+
+
+def _reject_unknown(data: Dict[str, Any], allowed: Tuple[str, ...], prefix: str = '') -> None:
+    for key in data:
+        if key not in allowed:
+            raise ValidationError(f'"{prefix}{key}" is not allowed')
+
+
+def validate_registration(body: Any) -> Dict[str, Any]:
+    """对应 studentRegistrationSchema"""
+    if not isinstance(body, dict):
+        raise ValidationError('"value" must be of type object')
+    value = dict(body)
+    _validate_string(value, 'name', 'name', max_length=100, trim=True)
+    _reject_unknown(value, ('name',))
+    return value
+
+
+def validate_submission(body: Any, with_avatar: bool) -> Dict[str, Any]:
+    """对应 submissionSchema / submissionWithAvatarSchema"""
+    if not isinstance(body, dict):
+        raise ValidationError('"value" must be of type object')
+    value = dict(body)
+    _validate_string(value, 'studentName', 'studentName', max_length=100)
+
+    ec2_info = value.get('ec2InstanceInfo')
+    if ec2_info is None:
+        raise ValidationError('"ec2InstanceInfo" is required')
+    if not isinstance(ec2_info, dict):
+        raise ValidationError('"ec2InstanceInfo" must be of type object')
+    ec2_info = value['ec2InstanceInfo'] = dict(ec2_info)
+    _validate_string(ec2_info, 'operatingSystem', 'ec2InstanceInfo.operatingSystem')
+    _validate_string(ec2_info, 'amiId', 'ec2InstanceInfo.amiId')
+    _validate_string(ec2_info, 'internalIpAddress', 'ec2InstanceInfo.internalIpAddress', ip=True)
+    _validate_string(ec2_info, 'elasticIpAddress', 'ec2InstanceInfo.elasticIpAddress',
+                     required=False, ip=True, allow_empty=True)
+    _validate_string(ec2_info, 'instanceType', 'ec2InstanceInfo.instanceType')
+    _reject_unknown(ec2_info, EC2_FIELDS, prefix='ec2InstanceInfo.')
+
+    allowed = ('studentName', 'ec2InstanceInfo')
+    if with_avatar:
+        _validate_string(value, 'avatarBase64', 'avatarBase64', required=False, allow_empty=True)
+        allowed += ('avatarBase64',)
+    _reject_unknown(value, allowed)
+    return value
+
+
+def _assign_field(target: Dict[str, Any], name: str, value: str) -> None:
+    """按 multer 的方式把 ec2InstanceInfo[amiId] 这样的字段名展开为嵌套对象"""
+    keys = re.findall(r'[^\[\]]+', name)
+    if not keys:
+        return
+    for key in keys[:-1]:
+        target = target.setdefault(key, {})
+        if not isinstance(target, dict):
+            return
+    target[keys[-1]] = value
+
+
+def parse_multipart(content_type: str, body: bytes) -> Tuple[Dict[str, Any], Optional[Dict[str, Any]]]:
+    """解析 multipart/form-data，返回 (表单字段, avatar 文件)"""
+    message = email.parser.BytesParser(policy=email.policy.HTTP).parsebytes(
+        b'Content-Type: ' + content_type.encode('latin-1') + b'\r\n\r\n' + body
+    )
+    fields: Dict[str, Any] = {}
+    avatar = None
+    for part in message.iter_parts():
+        name = part.get_param('name', header='content-disposition')
+        if not name:
+            continue
+        filename = part.get_filename()
+        payload = part.get_payload(decode=True) or b''
+        if filename is not None:
+            if name != 'avatar':
+                raise ValueError('Unexpected field')
+            avatar = {
+                'buffer': payload,
+                'originalname': filename,
+                'mimetype': part.get_content_type(),
+                'size': len(payload)
+            }
+        else:
+            _assign_field(fields, name, payload.decode(part.get_content_charset() or 'utf-8'))
+    return fields, avatar
+
+
+class FakeStore:
+    """sqlite 存储，所有访问都在一把锁内完成"""
+
+    def __init__(self, path: str = ':memory:'):
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.row_factory = sqlite3.Row
+        self.lock = threading.Lock()
+        with self.lock:
+            self.conn.executescript(SCHEMA)
+
+    def query(self, sql: str, params: Tuple = ()) -> List[sqlite3.Row]:
+        with self.lock:
+            rows = self.conn.execute(sql, params).fetchall()
+            self.conn.commit()
+            return rows
+
+    def find_student_by_name(self, name: str) -> Optional[sqlite3.Row]:
+        rows = self.query('SELECT * FROM students WHERE name_key = ?', (name.lower(),))
+        return rows[0] if rows else None
+
+    def find_student_by_access_key(self, access_key: str) -> Optional[sqlite3.Row]:
+        rows = self.query('SELECT * FROM students WHERE access_key = ?', (access_key,))
+        return rows[0] if rows else None
+
+    def create_student(self, name: str) -> sqlite3.Row:
+        student_id = str(uuid.uuid4())
+        timestamp = now_iso()
+        self.query(
+            'INSERT INTO students (id, name, name_key, access_key, registered_at, last_active_at) '
+            'VALUES (?, ?, ?, ?, ?, ?)',
+            (student_id, name, name.lower(), generate_access_key(), timestamp, timestamp)
+        )
+        return self.query('SELECT * FROM students WHERE id = ?', (student_id,))[0]
+
+    def touch_student(self, student_id: str) -> None:
+        self.query('UPDATE students SET last_active_at = ? WHERE id = ?', (now_iso(), student_id))
+
+    def exercise1_id(self) -> str:
+        rows = self.query('SELECT id FROM exercises WHERE title = ?', (EXERCISE1_TITLE,))
+        if rows:
+            return rows[0]['id']
+        exercise_id = str(uuid.uuid4())
+        self.query('INSERT INTO exercises (id, title, is_published) VALUES (?, ?, 1)',
+                   (exercise_id, EXERCISE1_TITLE))
+        return exercise_id
+
+
+def submission_to_json(sub: sqlite3.Row, default_title: Optional[str] = None) -> Dict[str, Any]:
+    """与 server.js 中 submissionRows.map(...) 的结构一致"""
+    return {
+        'id': sub['id'],
+        'exerciseId': sub['exercise_id'],
+        'exerciseTitle': sub['exercise_title'] or default_title,
+        'score': sub['score'],
+        'submittedAt': sub['submitted_at'],
+        'clientIpAddress': sub['client_ip_address'],
+        'ec2InstanceInfo': {
+            'operatingSystem': sub['operating_system'],
+            'amiId': sub['ami_id'],
+            'internalIpAddress': sub['internal_ip_address'],
+            'elasticIpAddress': sub['elastic_ip_address'],
+            'instanceType': sub['instance_type']
+        },
+        'avatarInfo': {
+            'filename': sub['screenshot_filename'],
+            'size': sub['screenshot_size'],
+            'mimetype': sub['screenshot_mimetype'],
+            'hasAvatar': True
+        } if sub['screenshot_data'] is not None else None,
+        'processingStatus': sub['processing_status']
+    }
+
+
+SUBMISSIONS_FOR_STUDENT_SQL = """
+    SELECT s.*, e.title AS exercise_title
+    FROM submissions s
+    LEFT JOIN exercises e ON s.exercise_id = e.id
+    WHERE s.student_id = ?
+    ORDER BY s.submitted_at DESC
+"""
+
+# DISTINCT ON (student_id, exercise_id) ... ORDER BY score DESC, submitted_at ASC 的 sqlite 写法
+BEST_SCORES_SQL = """
+    SELECT student_id, exercise_id, score, submitted_at
+    FROM (
+        SELECT student_id, exercise_id, score, submitted_at,
+               ROW_NUMBER() OVER (
+                   PARTITION BY student_id, exercise_id ORDER BY score DESC, submitted_at ASC
+               ) AS rn
+        FROM submissions
+        WHERE processing_status = 'processed'
+    )
+    WHERE rn = 1
+"""
+
+RANKINGS_SQL = f"""
+    WITH student_stats AS (
+        SELECT
+            s.id AS student_id,
+            s.name AS student_name,
+            COALESCE(SUM(best_scores.score), 0) AS total_score,
+            COUNT(best_scores.exercise_id) AS completed_exercises,
+            MAX(best_scores.submitted_at) AS last_submission_at
+        FROM students s
+        LEFT JOIN ({BEST_SCORES_SQL}) best_scores ON s.id = best_scores.student_id
+        GROUP BY s.id, s.name
+    )
+    SELECT
+        student_id,
+        student_name,
+        total_score,
+        completed_exercises,
+        last_submission_at,
+        RANK() OVER (
+            ORDER BY total_score DESC, last_submission_at IS NULL, last_submission_at ASC
+        ) AS rank
+    FROM student_stats
+    ORDER BY rank ASC
+"""
+
+
+class FakeRequestHandler(BaseHTTPRequestHandler):
+    """路由与 server.js 一一对应"""
+
+    server_version = 'Exercise1FakeServer/1.0'
+    protocol_version = 'HTTP/1.1'
+    # 头部和正文分两次写出，关闭Nagle避免keep-alive连接上的40ms延迟确认
+    disable_nagle_algorithm = True
+
+    @property
+    def store(self) -> FakeStore:
+        return self.server.store
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+    # ---- 响应辅助函数 ----
+
+    def accepts_gzip(self) -> bool:
+        accepted = [part.split(';')[0].strip() for part in self.headers.get('Accept-Encoding', '').split(',')]
+        return 'gzip' in accepted
+
+    def send_json(self, status: int, payload: Dict[str, Any], headers: Optional[Dict[str, str]] = None) -> None:
+        body = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.send_header('Vary', 'Accept-Encoding')
+        if len(body) >= COMPRESSION_THRESHOLD and self.accepts_gzip():
+            body = gzip.compress(body, compresslevel=6, mtime=0)
+            self.send_header('Content-Encoding', 'gzip')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def send_bytes(self, status: int, body: bytes, headers: Dict[str, str]) -> None:
+        self.send_response(status)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def send_validation_error(self, error: ValidationError) -> None:
+        self.send_json(400, {'error': 'Validation failed', 'details': [str(error)]})
+
+    def send_internal_error(self, message: str) -> None:
+        self.send_json(500, {'error': 'Internal server error', 'message': message})
+
+    def send_unhandled_error(self) -> None:
+        # 对应 server.js 的全局错误处理中间件
+        self.send_json(500, {'error': 'Something went wrong!', 'message': 'Internal server error'})
+
+    def send_body_error(self, error: BodyError) -> None:
+        self.send_json(error.status, {'error': 'Invalid request body', 'message': str(error)})
+
+    def send_rejected(self, status: int, retry_after: float, error: str, message: str) -> None:
+        self.send_json(status, {'error': error, 'message': message},
+                       {'Retry-After': str(max(1, math.ceil(retry_after)))})
+
+    def send_not_found(self) -> None:
+        self.send_json(404, {'error': 'Route not found', 'message': f'Cannot {self.command} {self.path}'})
+
+    # ---- 请求解析 ----
+
+    def read_body(self) -> bytes:
+        length = int(self.headers.get('Content-Length') or 0)
+        return self.rfile.read(length) if length > 0 else b''
+
+    def parse_body(self) -> Tuple[Dict[str, Any], Optional[Dict[str, Any]]]:
+        """返回 (req.body, req.file)；正文过大、无法解码或不是合法JSON时抛出 BodyError"""
+        body = self.read_body()
+        content_type = self.headers.get('Content-Type', '')
+        if content_type.startswith('application/json'):
+            body = inflate_body(body, self.headers.get('Content-Encoding', ''))
+            try:
+                return (json.loads(body.decode('utf-8')) if body else {}), None
+            except ValueError as error:
+                raise BodyError(400, str(error))
+        if len(body) > MAX_BODY_SIZE:
+            raise BodyError(413, 'request entity too large')
+        if content_type.startswith('multipart/form-data'):
+            return parse_multipart(content_type, body)
+        return {}, None
+
+    @property
+    def client_ip(self) -> str:
+        host = self.client_address[0]
+        return f'::ffff:{host}' if ':' not in host else host
+
+    # ---- 准入控制 ----
+
+    @property
+    def admission(self) -> Dict[str, Any]:
+        return self.server.admission
+
+    def run_admitted(self, group: str, handler, *args, unread_body: bool = False):
+        """在并发限制内执行 handler；排队已满或排队超时返回503 (unread_body 时先读出丢弃请求体)"""
+        limit = self.admission[group]
+        if not limit.acquire():
+            if unread_body:
+                self.read_body()
+            return self.send_rejected(503, limit.queue_timeout, 'Server busy',
+                                      f'Too many concurrent {limit.name} requests, please retry later')
+        try:
+            return handler(*args)
+        finally:
+            limit.release()
+
+    # ---- 路由 ----
+
+    def do_GET(self):
+        path = urlsplit(self.path).path
+        segments = [unquote(segment) for segment in path.strip('/').split('/')]
+
+        try:
+            if path == '/health':
+                return self.send_json(200, {
+                    'status': 'OK',
+                    'timestamp': now_iso(),
+                    'message': 'Exercise 1 API Server is running',
+                    'cpuMs': round(time.process_time() * 1000, 3),
+                    'admission': {group: limit.stats() for group, limit in self.admission.items()}
+                })
+            if path == '/api':
+                return self.handle_api_info()
+            if segments[:4] == ['api', 'auth', 'student', 'lookup'] and len(segments) == 5:
+                return self.run_admitted('reads', self.handle_lookup, segments[4])
+            if segments[:3] == ['api', 'submissions', 'student'] and len(segments) == 4:
+                return self.run_admitted('reads', self.handle_student_submissions, segments[3])
+            if segments[:2] == ['api', 'submissions'] and len(segments) == 4 and segments[3] == 'avatar':
+                return self.run_admitted('reads', self.handle_avatar, segments[2])
+            if segments == ['api', 'statistics', 'rankings']:
+                return self.run_admitted('reads', self.handle_rankings)
+            if segments[:3] == ['api', 'statistics', 'student'] and len(segments) == 4:
+                return self.run_admitted('reads', self.handle_student_statistics, segments[3])
+        except Exception:
+            return self.send_unhandled_error()
+        return self.send_not_found()
+
+    def do_POST(self):
+        path = urlsplit(self.path).path
+
+        if path not in ('/api/auth/student/register', '/api/submissions/exercise1'):
+            self.read_body()
+            return self.send_not_found()
+
+        rate_limit = self.admission['submitRate']
+        retry_after = rate_limit.take(self.client_address[0])
+        if retry_after is not None:
+            self.read_body()
+            return self.send_rejected(429, retry_after, 'Too many requests',
+                                      f'Too many {rate_limit.name} requests from this client, please retry later')
+
+        if path == '/api/submissions/exercise1':
+            # 与 server.js 相同: 准入之后才读取和解析请求体 (multer)，被拒绝的提交不缓冲头像
+            return self.run_admitted('submissions', self.handle_submission_request, unread_body=True)
+
+        try:
+            body, _ = self.parse_body()
+        except BodyError as error:
+            return self.send_body_error(error)
+        except Exception:
+            return self.send_unhandled_error()
+        return self.run_admitted('registrations', self.handle_register, body)
+
+    def handle_submission_request(self):
+        try:
+            body, avatar_file = self.parse_body()
+        except BodyError as error:
+            return self.send_body_error(error)
+        except Exception:
+            return self.send_unhandled_error()
+        return self.handle_submission(body, avatar_file)
+
+    def handle_api_info(self):
+        self.send_json(200, {
+            'message': 'Hands-on Training System API - Exercise 1',
+            'version': '1.0.0',
+            'endpoints': [
+                'POST /api/auth/student/register',
+                'GET /api/auth/student/lookup/:name',
+                'POST /api/submissions/exercise1 (supports avatar upload)',
+                'GET /api/submissions/student/:accessKey',
+                'GET /api/submissions/:submissionId/avatar',
+                'GET /api/statistics/rankings',
+                'GET /api/statistics/student/:accessKey'
+            ]
+        })
+
+    def handle_register(self, body: Dict[str, Any]):
+        try:
+            value = validate_registration(body)
+        except ValidationError as error:
+            return self.send_validation_error(error)
+
+        try:
+            student = self.store.find_student_by_name(value['name'])
+            if student:
+                return self.send_json(200, {
+                    'success': True,
+                    'message': 'Welcome back! Here is your existing access key.',
+                    'student': {
+                        'name': student['name'],
+                        'accessKey': student['access_key'],
+                        'registeredAt': student['registered_at']
+                    },
+                    'isNewRegistration': False
+                })
+
+            student = self.store.create_student(value['name'])
+            self.send_json(201, {
+                'success': True,
+                'message': 'Registration successful! Please save your access key.',
+                'student': {
+                    'name': student['name'],
+                    'accessKey': student['access_key'],
+                    'registeredAt': student['registered_at']
+                },
+                'isNewRegistration': True,
+                'instructions': 'Use this access key when submitting exercise solutions via API.'
+            })
+        except Exception:
+            self.send_internal_error('Failed to register student')
+
+    def handle_lookup(self, name: str):
+        name = name.strip()
+        if not name:
+            return self.send_json(400, {'error': 'Validation failed', 'message': 'Student name is required'})
+
+        try:
+            student = self.store.find_student_by_name(name)
+            if not student:
+                return self.send_json(404, {
+                    'error': 'Student not found',
+                    'message': 'No access key exists for this name. Please register first.',
+                    'suggestion': 'Use the registration endpoint to create an access key.'
+                })
+            self.store.touch_student(student['id'])
+            self.send_json(200, {
+                'success': True,
+                'message': 'Access key found successfully',
+                'student': {
+                    'name': student['name'],
+                    'accessKey': student['access_key'],
+                    'registeredAt': student['registered_at'],
+                    'lastActiveAt': now_iso()
+                }
+            })
+        except Exception:
+            self.send_internal_error('Failed to lookup access key')
+
+    def handle_submission(self, body: Dict[str, Any], avatar_file: Optional[Dict[str, Any]]):
+        avatar_data = avatar_filename = avatar_mimetype = avatar_size = None
+
+        if avatar_file:
+            # 对应 multer 的 fileFilter 和 fileSize 限制
+            if not avatar_file['mimetype'].startswith('image/') or avatar_file['size'] > MAX_AVATAR_SIZE:
+                return self.send_unhandled_error()
+            avatar_data = avatar_file['buffer']
+            avatar_filename = avatar_file['originalname']
+            avatar_mimetype = avatar_file['mimetype']
+            avatar_size = avatar_file['size']
+        elif isinstance(body, dict) and body.get('avatarBase64'):
+            try:
+                base64_data = re.sub(r'^data:image/[a-z]+;base64,', '', body['avatarBase64'])
+                avatar_data = base64.b64decode(base64_data + '=' * (-len(base64_data) % 4))
+                avatar_filename = 'avatar.png'
+                avatar_mimetype = 'image/png'
+                avatar_size = len(avatar_data)
+            except (TypeError, binascii.Error):
+                return self.send_json(400, {
+                    'error': 'Invalid base64 avatar data',
+                    'message': 'Failed to decode base64 avatar'
+                })
+
+        try:
+            with_avatar = bool(avatar_file) or bool(isinstance(body, dict) and body.get('avatarBase64'))
+            value = validate_submission(body, with_avatar)
+        except ValidationError as error:
+            return self.send_validation_error(error)
+
+        try:
+            ec2_info = value['ec2InstanceInfo']
+            student = self.store.find_student_by_name(value['studentName'])
+            if not student:
+                student = self.store.create_student(value['studentName'])
+            exercise_id = self.store.exercise1_id()
+            score = calculate_score(ec2_info, avatar_data is not None)
+
+            submission_id = str(uuid.uuid4())
+            submitted_at = now_iso()
+            self.store.query("""
+                INSERT INTO submissions (
+                    id, student_id, exercise_id, client_ip_address,
+                    operating_system, ami_id, internal_ip_address, elastic_ip_address, instance_type,
+                    screenshot_data, screenshot_filename, screenshot_mimetype, screenshot_size,
+                    score, processing_status, submitted_at
+                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, 'processed', ?)
+            """, (
+                submission_id, student['id'], exercise_id, self.client_ip,
+                ec2_info['operatingSystem'], ec2_info['amiId'], ec2_info['internalIpAddress'],
+                ec2_info.get('elasticIpAddress') or None, ec2_info['instanceType'],
+                avatar_data, avatar_filename, avatar_mimetype, avatar_size,
+                score, submitted_at
+            ))
+            self.store.touch_student(student['id'])
+
+            self.send_json(201, {
+                'success': True,
+                'message': 'Submission received and processed successfully',
+                'submissionId': submission_id,
+                'score': score,
+                'timestamp': submitted_at,
+                'studentInfo': {'name': student['name']},
+                'ec2Info': ec2_info,
+                'avatarInfo': {
+                    'filename': avatar_filename,
+                    'size': avatar_size,
+                    'mimetype': avatar_mimetype
+                } if avatar_data is not None else None,
+                'clientIp': self.client_ip
+            })
+        except Exception:
+            self.send_internal_error('Failed to process submission')
+
+    def handle_student_submissions(self, access_key: str):
+        try:
+            student = self.store.find_student_by_access_key(access_key)
+            if not student:
+                return self.send_json(404, {'error': 'Student not found', 'message': 'Invalid access key'})
+            rows = self.store.query(SUBMISSIONS_FOR_STUDENT_SQL, (student['id'],))
+            self.send_json(200, {
+                'success': True,
+                'student': {
+                    'name': student['name'],
+                    'accessKey': student['access_key'],
+                    'registeredAt': student['registered_at']
+                },
+                'submissions': [submission_to_json(row) for row in rows]
+            })
+        except Exception:
+            self.send_internal_error('Failed to fetch submissions')
+
+    def handle_rankings(self):
+        try:
+            rows = self.store.query(RANKINGS_SQL)
+            # pg 把 bigint (SUM/COUNT/RANK) 序列化为字符串，这里保持一致
+            self.send_json(200, {
+                'success': True,
+                'exerciseId': 'all',
+                'totalStudents': len(rows),
+                'rankings': [{
+                    'rank': str(row['rank']),
+                    'studentId': row['student_id'],
+                    'studentName': row['student_name'],
+                    'totalScore': str(row['total_score']),
+                    'completedExercises': str(row['completed_exercises']),
+                    'averageCompletionTime': 0,
+                    'lastSubmissionAt': row['last_submission_at']
+                } for row in rows]
+            })
+        except Exception:
+            self.send_internal_error('Failed to fetch rankings')
+
+    def handle_avatar(self, submission_id: str):
+        try:
+            rows = self.store.query(
+                'SELECT screenshot_data, screenshot_filename, screenshot_mimetype FROM submissions '
+                'WHERE id = ? AND screenshot_data IS NOT NULL',
+                (submission_id,)
+            )
+            if not rows:
+                return self.send_json(404, {
+                    'error': 'Avatar not found',
+                    'message': 'No avatar exists for this submission'
+                })
+            row = rows[0]
+            self.send_bytes(200, row['screenshot_data'], {
+                'Content-Type': row['screenshot_mimetype'] or 'image/png',
+                'Content-Disposition': f'inline; filename="{row["screenshot_filename"] or "avatar.png"}"'
+            })
+        except Exception:
+            self.send_internal_error('Failed to fetch avatar')
+
+    def handle_student_statistics(self, access_key: str):
+        try:
+            student = self.store.find_student_by_access_key(access_key)
+            if not student:
+                return self.send_json(404, {'error': 'Student not found', 'message': 'Invalid access key'})
+
+            rows = self.store.query(SUBMISSIONS_FOR_STUDENT_SQL, (student['id'],))
+            total_submissions = len(rows)
+            completed_exercises = sum(1 for row in rows if row['score'] > 0)
+            total_score = sum(row['score'] for row in rows)
+            total_exercises = self.store.query(
+                'SELECT COUNT(*) AS count FROM exercises WHERE is_published = 1'
+            )[0]['count']
+
+            best_totals = self.store.query(f"""
+                SELECT s.id AS student_id, COALESCE(SUM(b.score), 0) AS total_score
+                FROM students s LEFT JOIN ({BEST_SCORES_SQL}) b ON b.student_id = s.id
+                GROUP BY s.id
+            """)
+            own_total = next(row['total_score'] for row in best_totals if row['student_id'] == student['id'])
+            rank = 1 + sum(1 for row in best_totals if row['total_score'] > own_total)
+
+            self.send_json(200, {
+                'success': True,
+                'student': {
+                    'name': student['name'],
+                    'accessKey': student['access_key'],
+                    'registeredAt': student['registered_at'],
+                    'lastActiveAt': student['last_active_at']
+                },
+                'statistics': {
+                    'totalSubmissions': total_submissions,
+                    'completedExercises': completed_exercises,
+                    'totalExercises': total_exercises,
+                    'completionRate': (completed_exercises / total_exercises) * 100 if total_exercises else 0,
+                    'totalScore': total_score,
+                    'averageScore': total_score / total_submissions if total_submissions else 0,
+                    'highestScore': max([row['score'] for row in rows] + [0]),
+                    'currentRank': str(rank),
+                    'totalParticipants': len(best_totals)
+                },
+                'submissions': [submission_to_json(row, EXERCISE1_TITLE) for row in rows],
+                'progress': {
+                    'exerciseProgress': [],
+                    'scoreHistory': [],
+                    'submissionTimeline': []
+                }
+            })
+        except Exception:
+            self.send_internal_error('Failed to fetch student statistics')
+
+
+class FakeServer:
+    """在后台线程中运行的替身服务器，可作为上下文管理器使用"""
+
+    def __init__(self, host: str = '127.0.0.1', port: int = 0, db_path: str = ':memory:',
+                 verbose: bool = False):
+        self.store = FakeStore(db_path)
+        self.httpd = ThreadingHTTPServer((host, port), FakeRequestHandler)
+        self.httpd.daemon_threads = True
+        self.httpd.store = self.store
+        self.httpd.admission = admission_from_env()
+        self.httpd.verbose = verbose
+        self.thread = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f'http://{host}:{port}'
+
+    @property
+    def api_base_url(self) -> str:
+        return f'{self.base_url}/api'
+
+    def start(self) -> 'FakeServer':
+        self.thread = threading.Thread(target=self.httpd.serve_forever, name='fake-exercise1-api', daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self) -> None:
+        self.httpd.shutdown()
+        self.httpd.server_close()
+        if self.thread:
+            self.thread.join()
+
+    def __enter__(self) -> 'FakeServer':
+        return self.start()
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+
+def run_fake(args, config=None, fake_server=None) -> int:
+    """exercise1 fake: 在前台运行替身服务器"""
+    server = FakeServer(args.host, args.port, args.db, verbose=args.verbose)
+    print(f'🚀 Exercise 1 替身服务器运行在 {server.base_url}')
+    print(f'📋 API地址: {server.api_base_url}')
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        print('\n👋 替身服务器已停止')
+    finally:
+        server.httpd.server_close()
+    return 0
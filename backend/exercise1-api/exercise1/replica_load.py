@@ -0,0 +1,190 @@
+# -*- coding: utf-8 -*-
+
+"""
+读副本隔离测试 (exercise1 replica-load)
+
+服务器配置了只读流复制副本 (DB_READ_HOST) 时，排名、学员统计和提交历史从副本读取，
+提交只使用主库。本测试先只运行提交，测得基线写延迟；再在提交继续的同时由大量读线程
+不停请求排名、学员统计和提交历史，比较两个阶段提交的 p99。每次提交成功后立即读取
+该学员的提交历史，检查刚写入的提交已经可见 (学员写入后的读走主库)。
+
+通过条件:
+    1. 读负载期间提交的 p99 不超过 max(基线p99 × --max-slowdown, 基线p99 + --slack-ms)
+    2. 提交后立即读取的提交历史都包含刚写入的提交
+    3. 读负载期间副本处理了读请求 (/health 中 replica.reads.replica 增加)
+    4. 提交没有连接错误或非503的5xx (429/503 是准入控制，单独统计，不计入延迟)
+
+服务器没有配置副本时 (包括 --fake) 跳过并返回0，--require-replica 时返回1。
+本地副本: `docker compose --profile replica up -d` (backend/docker-compose.yml，副本在5433端口)，
+服务器设置 DB_READ_HOST=localhost DB_READ_PORT=5433。
+所有提交来自本机同一个IP，默认写速率 (--writers 个线程各每秒一次) 低于默认的 SUBMIT_RATE_PER_MINUTE；
+读线程超过 READ_MAX_CONCURRENT 时多出的读请求被准入控制拒绝，可以在服务器端调大。
+
+用法:
+    exercise1 replica-load --base-url http://localhost:3001
+    exercise1 replica-load --readers 32 --duration 20 --json report.json
+"""
+
+import dataclasses
+import itertools
+import json
+import threading
+import time
+import uuid
+from typing import Any, Dict, List, Optional
+
+from exercise1.api import ApiSession
+from exercise1.bench import ENDPOINTS, BenchFixture
+from exercise1.burst import Samples, describe, timed
+from exercise1.cases import TEST_EC2_INFO
+from exercise1.config import Config
+
+READ_ENDPOINTS = ('rankings', 'student-statistics', 'student-submissions')
+
+
+def replica_stats(api: ApiSession) -> Optional[Dict[str, Any]]:
+    """/health 中的副本状态；服务器没有配置副本时返回 None"""
+    response = api.get('/health')
+    response.raise_for_status()
+    replica = response.json().get('replica')
+    return replica if replica and replica.get('configured') else None
+
+
+def reader(config: Config, fixture: BenchFixture, samples: Samples, stop: threading.Event) -> None:
+    with ApiSession(config) as api:
+        for name in itertools.cycle(READ_ENDPOINTS):
+            if stop.is_set():
+                return
+            timed(samples, lambda: ENDPOINTS[name](api, fixture))
+
+
+class Writer:
+    """一个学员: 按固定间隔提交，每次成功后立即读取自己的提交历史"""
+
+    def __init__(self, api: ApiSession):
+        self.name = f'副本测试-{uuid.uuid4().hex[:8]}'
+        response = api.post('/api/auth/student/register', json={'name': self.name})
+        response.raise_for_status()
+        self.access_key = response.json()['student']['accessKey']
+        self.submitted = 0
+        self.stale_reads = 0
+
+    def run(self, config: Config, interval: float, samples: Samples, stop: threading.Event) -> None:
+        payload = {'studentName': self.name, 'ec2InstanceInfo': TEST_EC2_INFO}
+        with ApiSession(config) as api:
+            while not stop.is_set():
+                started = time.perf_counter()
+                timed(samples, lambda: api.post('/api/submissions/exercise1', json=payload))
+                if samples.items[-1][1] == 201:
+                    self.submitted += 1
+                    response = api.get(f'/api/submissions/student/{self.access_key}')
+                    if response.status_code != 200 or len(response.json()['submissions']) < self.submitted:
+                        self.stale_reads += 1
+                stop.wait(max(0.0, interval - (time.perf_counter() - started)))
+
+
+def run_phase(config: Config, fixture: BenchFixture, readers: int, writers: List[Writer],
+              interval: float, duration: float):
+    """运行一个阶段，返回 (读请求记录, 写请求记录)"""
+    reads, writes = Samples(), Samples()
+    stop = threading.Event()
+    threads = [threading.Thread(target=reader, args=(config, fixture, reads, stop)) for _ in range(readers)]
+    # 每个写线程有自己的记录 (判断刚才的提交是否成功)，阶段结束后合并
+    write_samples = [Samples() for _ in writers]
+    threads += [threading.Thread(target=writer.run, args=(config, interval, samples, stop))
+                for writer, samples in zip(writers, write_samples)]
+    for thread in threads:
+        thread.start()
+    time.sleep(duration)
+    stop.set()
+    for thread in threads:
+        thread.join()
+    for samples in write_samples:
+        writes.items.extend(samples.items)
+    return reads, writes
+
+
+def run_replica_load(args, config: Config, fake_server=None) -> int:
+    """exercise1 replica-load"""
+    config = dataclasses.replace(config, max_retries=0)
+    with ApiSession(config) as api:
+        before = replica_stats(api)
+        if before is None:
+            print(f'⚠️  {config.server_url} 没有配置只读副本 (DB_READ_HOST)，跳过读副本隔离测试')
+            return 1 if args.require_replica else 0
+        print(f'📖 读副本隔离测试: {config.server_url} (读线程 {args.readers}, 写线程 {args.writers}, '
+              f'每阶段 {args.duration}s)')
+        print(f"   副本延迟 {before['lagMs']}ms (上限 {before['maxLagMs']}ms)，"
+              f"{'可用' if before['healthy'] else '不可用: ' + str(before.get('error') or '延迟超出上限')}\n")
+        fixture = BenchFixture(api)
+        writers = [Writer(api) for _ in range(args.writers)]
+
+    print('1️⃣  基线: 只有提交...')
+    _, baseline_writes = run_phase(config, fixture, 0, writers, args.interval, args.duration)
+    with ApiSession(config) as api:
+        during = replica_stats(api)
+    print('2️⃣  读负载: 提交 + 不停读取排名和统计...')
+    load_reads, load_writes = run_phase(config, fixture, args.readers, writers, args.interval, args.duration)
+    with ApiSession(config) as api:
+        after = replica_stats(api)
+
+    baseline, loaded = describe(baseline_writes, {201}), describe(load_writes, {201})
+    reads_ok = describe(load_reads, {200})
+    replica_reads = after['reads']['replica'] - during['reads']['replica']
+    primary_reads = after['reads']['primary'] - during['reads']['primary']
+    stale_reads = sum(writer.stale_reads for writer in writers)
+    write_statuses = baseline_writes.statuses() + load_writes.statuses()
+
+    print(f"\n{'':<20}{'请求数':>10}{'p50':>10}{'p99':>10}{'max':>10}")
+    print('-' * 60)
+    for title, row in (('写 (基线)', baseline), ('写 (读负载)', loaded), ('读 (读负载)', reads_ok)):
+        print(f"{title:<20}{row['count']:>10}{row['p50_ms']:>10.1f}{row['p99_ms']:>10.1f}{row['max_ms']:>10.1f}")
+    print(f"\n写请求状态: {', '.join(f'{status}: {count}' for status, count in sorted(write_statuses.items(), key=str))}")
+    print(f"读负载期间的数据库读: 副本 {replica_reads}, 主库 {primary_reads}, "
+          f"写后读主库 {after['reads']['readYourWrites'] - during['reads']['readYourWrites']}, "
+          f"回退主库 {after['reads']['fallback'] - during['reads']['fallback']}; 副本延迟 {after['lagMs']}ms")
+
+    p99_budget = max(baseline['p99_ms'] * args.max_slowdown, baseline['p99_ms'] + args.slack_ms)
+    failures = []
+    if not baseline['count'] or not loaded['count']:
+        failures.append('有阶段没有成功的提交，无法比较写延迟')
+    elif loaded['p99_ms'] > p99_budget:
+        failures.append(f"读负载期间提交 p99 {loaded['p99_ms']:.1f}ms 超出预算 {p99_budget:.1f}ms")
+    if stale_reads:
+        failures.append(f'{stale_reads} 次提交后立即读取的提交历史缺少刚写入的提交')
+    if replica_reads == 0:
+        failures.append('读负载期间副本没有处理任何读请求 (副本延迟超出上限或连接失败)')
+    unexpected = sum(count for status, count in write_statuses.items()
+                     if status == 'error' or (status >= 500 and status != 503))
+    if unexpected:
+        failures.append(f'{unexpected} 个提交出现连接错误或非503的5xx')
+
+    if args.json_report:
+        with open(args.json_report, 'w', encoding='utf-8') as f:
+            json.dump({
+                'server_url': config.server_url,
+                'readers': args.readers,
+                'writers': args.writers,
+                'duration_s': args.duration,
+                'writes_baseline': baseline,
+                'writes_under_read_load': loaded,
+                'reads_under_load': reads_ok,
+                'write_statuses': {str(status): count for status, count in write_statuses.items()},
+                'replica_reads': replica_reads,
+                'primary_reads': primary_reads,
+                'stale_reads': stale_reads,
+                'replica': after,
+                'write_p99_budget_ms': round(p99_budget, 3),
+                'failures': failures
+            }, f, indent=2, ensure_ascii=False)
+            f.write('\n')
+        print(f'📝 JSON报告: {args.json_report}')
+
+    print()
+    if failures:
+        for failure in failures:
+            print(f'❌ {failure}')
+        return 1
+    print(f"✅ 读负载期间提交 p99 {loaded['p99_ms']:.1f}ms (预算 {p99_budget:.1f}ms)，"
+          f'{replica_reads} 个读由副本处理，提交后的读都能看到刚写入的提交')
+    return 0
@@ -0,0 +1,249 @@
+# -*- coding: utf-8 -*-
+
+"""
+按评分规则批量重新计算提交分数 (exercise1 rescore)
+
+评分规则修改后 (在 scoring_rules 中新增一个版本)，用该版本重新计算练习的全部已有提交:
+    1. COPY 导出每条提交的 id、当前分数和三个评分特征
+    2. 用 NumPy np.select 向量化地按规则计算新分数 (第一条匹配的规则生效)
+    3. 只把分数变化的行 COPY 到临时表，用一条 UPDATE ... FROM 写回
+    4. 按重新计算的结果刷新 student_summary (与 `exercise1 audit summary --fix` 相同)
+全部步骤在一个事务中完成；--dry-run 时最后回滚，只报告变化。
+只重新计算 submissions: `exercise1 retention` 归档的提交保留归档时的分数 (归档表没有头像数据，
+而且重新评分后归档的提交可能高于保留的最高分)，每个练习的最高分提交总是保留在 submissions 中。
+报告变化的分数、分数变化的组合 (旧分 -> 新分) 和排行榜上名次变化的学员数。
+
+--activate 同时把该版本设为启用版本，server.js 在 SCORING_RULES_TTL_MS 内读到新规则；
+这段时间内的新提交仍按旧规则评分，可以稍后再运行一次 (只会更新仍不一致的行)。
+需要 numpy 和 psycopg2。
+
+用法:
+    exercise1 rescore --dry-run
+    exercise1 rescore --rules-version 2 --activate
+"""
+
+import io
+import json
+from collections import Counter
+from typing import Any, Dict, List, Optional, Tuple
+
+from exercise1.config import Config
+from exercise1.scoring import FEATURES
+from exercise1.summary_audit import find_drift, fix_drift
+
+RULES_SQL = """
+    SELECT priority, has_ec2_info, has_elastic_ip, has_avatar, score
+    FROM scoring_rules
+    WHERE version = %s
+    ORDER BY priority
+"""
+
+ACTIVE_VERSION_SQL = 'SELECT version FROM scoring_rule_versions WHERE is_active'
+
+# 与 server.js 的特征判断一致
+EXPORT_SQL = """
+    COPY (
+        SELECT
+            id,
+            score,
+            (COALESCE(operating_system, '') <> '' AND COALESCE(ami_id, '') <> ''
+             AND internal_ip_address IS NOT NULL AND COALESCE(instance_type, '') <> '')::int,
+            (elastic_ip_address IS NOT NULL)::int,
+            (screenshot_data IS NOT NULL)::int
+        FROM submissions
+        WHERE exercise_id = {exercise_id}
+    ) TO STDOUT
+"""
+
+CHANGES_TABLE_SQL = """
+    CREATE TEMP TABLE IF NOT EXISTS rescore_changes (
+        id UUID PRIMARY KEY,
+        score INTEGER NOT NULL
+    ) ON COMMIT DROP
+"""
+
+UPDATE_SQL = """
+    UPDATE submissions t
+    SET score = c.score
+    FROM rescore_changes c
+    WHERE t.id = c.id
+"""
+
+# 与 GET /api/statistics/rankings 相同的名次
+LEADERBOARD_SQL = """
+    WITH student_stats AS (
+        SELECT
+            s.id AS student_id,
+            COALESCE(SUM(best_scores.score), 0) AS total_score,
+            MAX(best_scores.submitted_at) AS last_submission_at
+        FROM students s
+        LEFT JOIN (
+            SELECT DISTINCT ON (student_id, exercise_id)
+                student_id, exercise_id, score, submitted_at
+            FROM submissions
+            WHERE processing_status = 'processed'
+            ORDER BY student_id, exercise_id, score DESC, submitted_at ASC
+        ) best_scores ON s.id = best_scores.student_id
+        GROUP BY s.id
+    )
+    SELECT student_id, total_score, RANK() OVER (ORDER BY total_score DESC, last_submission_at ASC)
+    FROM student_stats
+"""
+
+ACTIVATE_SQL = """
+    UPDATE scoring_rule_versions SET is_active = false WHERE is_active AND version <> %(version)s;
+    UPDATE scoring_rule_versions SET is_active = true, activated_at = CURRENT_TIMESTAMP
+    WHERE version = %(version)s AND NOT is_active;
+"""
+
+
+def evaluate_rules(rules: List[Dict[str, Any]], features: Dict[str, Any]):
+    """向量化评分: features 是 {特征名: bool数组}，返回每行第一条匹配规则的分数 (都不匹配时为0)"""
+    import numpy as np
+
+    rows = len(features[FEATURES[0]])
+    conditions = []
+    for rule in rules:
+        condition = np.ones(rows, dtype=bool)
+        for name in FEATURES:
+            if rule[name] is not None:
+                condition &= features[name] == rule[name]
+        conditions.append(condition)
+    return np.select(conditions, [rule['score'] for rule in rules], default=0).astype(np.int32)
+
+
+def export_rows(cursor, exercise_id: str):
+    """COPY 导出 (id数组, 分数数组, 特征字典)"""
+    import numpy as np
+
+    buffer = io.StringIO()
+    cursor.copy_expert(EXPORT_SQL.format(exercise_id=cursor.mogrify('%s', (exercise_id,)).decode()), buffer)
+    data = buffer.getvalue()
+    if not data:
+        return np.empty(0, dtype='U36'), np.empty(0, dtype=np.int32), {name: np.empty(0, dtype=bool) for name in FEATURES}
+
+    ids = np.loadtxt(io.StringIO(data), delimiter='\t', dtype='U36', usecols=0, ndmin=1)
+    values = np.loadtxt(io.StringIO(data), delimiter='\t', dtype=np.int32, usecols=(1, 2, 3, 4), ndmin=2)
+    features = {name: values[:, 1 + index].astype(bool) for index, name in enumerate(FEATURES)}
+    return ids, values[:, 0], features
+
+
+def write_changes(cursor, ids, scores) -> int:
+    """COPY 变化的行到临时表，再用一条 UPDATE ... FROM 写回，返回更新行数"""
+    cursor.execute(CHANGES_TABLE_SQL)
+    cursor.execute('TRUNCATE rescore_changes')
+    lines = ''.join(f'{row_id}\t{score}\n' for row_id, score in zip(ids.tolist(), scores.tolist()))
+    cursor.copy_expert('COPY rescore_changes (id, score) FROM STDIN', io.StringIO(lines))
+    cursor.execute('ANALYZE rescore_changes')
+    cursor.execute(UPDATE_SQL)
+    return cursor.rowcount
+
+
+def leaderboard(cursor) -> Dict[str, Tuple[int, int]]:
+    """{学员ID: (总分, 名次)}"""
+    cursor.execute(LEADERBOARD_SQL)
+    return {str(student_id): (int(total), int(rank)) for student_id, total, rank in cursor.fetchall()}
+
+
+def load_rules(cursor, version: Optional[int]) -> Tuple[Optional[int], List[Dict[str, Any]]]:
+    if version is None:
+        cursor.execute(ACTIVE_VERSION_SQL)
+        row = cursor.fetchone()
+        if row is None:
+            return None, []
+        version = row[0]
+    cursor.execute(RULES_SQL, (version,))
+    columns = [column.name for column in cursor.description]
+    return version, [dict(zip(columns, row)) for row in cursor.fetchall()]
+
+
+def run_rescore(args, config: Config, fake_server=None) -> int:
+    """exercise1 rescore"""
+    import numpy as np
+    import psycopg2
+
+    conn = psycopg2.connect(**config.db)
+    try:
+        with conn.cursor() as cursor:
+            cursor.execute("SELECT to_regclass('scoring_rules')")
+            if cursor.fetchone()[0] is None:
+                print('❌ 没有 scoring_rules 表，请先运行 migrate-scoring-rules.sql')
+                return 1
+            version, rules = load_rules(cursor, args.rules_version)
+            if not rules:
+                print(f'❌ 评分规则版本 {version or "(启用版本)"} 不存在或没有规则')
+                return 1
+
+            cursor.execute('SELECT id FROM exercises WHERE title = %s', (args.exercise_title,))
+            row = cursor.fetchone()
+            if row is None:
+                print(f'❌ 练习不存在: {args.exercise_title}')
+                return 1
+            exercise_id = str(row[0])
+
+            mode = '预览 (最后回滚)' if args.dry_run else '重新评分'
+            print(f'🧮 {mode}: {args.exercise_title}，评分规则版本 {version} ({len(rules)} 条规则)')
+
+            ranks_before = leaderboard(cursor)
+            updated = 0
+            transitions: Counter = Counter()
+            ids, old_scores, features = export_rows(cursor, exercise_id)
+            new_scores = evaluate_rules(rules, features)
+            changed = new_scores != old_scores
+            scanned = len(ids)
+            if changed.any():
+                pairs, counts = np.unique(np.stack([old_scores[changed], new_scores[changed]], axis=1),
+                                          axis=0, return_counts=True)
+                transitions.update({(int(old), int(new)): int(count) for (old, new), count in zip(pairs, counts)})
+                updated = write_changes(cursor, ids[changed], new_scores[changed])
+            print(f'   submissions: {scanned} 条提交, {int(changed.sum())} 条分数变化')
+
+            if args.activate:
+                cursor.execute(ACTIVATE_SQL, {'version': version})
+
+        drift = find_drift(conn)
+        refreshed = fix_drift(conn, [str(student_id) for student_id, _ in drift])[0] if drift else 0
+
+        with conn.cursor() as cursor:
+            ranks_after = leaderboard(cursor)
+
+        if args.dry_run:
+            conn.rollback()
+        else:
+            conn.commit()
+    finally:
+        conn.close()
+
+    rank_changes = sum(1 for student_id, (_, rank) in ranks_after.items()
+                       if ranks_before.get(student_id, (0, None))[1] != rank)
+    total_changes = sum(1 for student_id, (total, _) in ranks_after.items()
+                        if ranks_before.get(student_id, (None, 0))[0] != total)
+
+    print(f'\n{"旧分":>8}{"新分":>8}{"提交数":>10}')
+    print('-' * 26)
+    for (old, new), count in sorted(transitions.items()):
+        print(f'{old:>8}{new:>8}{count:>10}')
+
+    verb = '将' if args.dry_run else '已'
+    print(f'\n✅ 检查 {scanned} 条提交: {verb}更新 {updated} 条分数, 刷新 {refreshed} 名学员的汇总, '
+          f'{total_changes} 名学员总分变化, {rank_changes} 名学员名次变化')
+    if args.activate:
+        print(f'📌 评分规则版本 {version} {"将" if args.dry_run else "已"}设为启用版本')
+
+    if args.json_report:
+        with open(args.json_report, 'w', encoding='utf-8') as f:
+            json.dump({
+                'exercise': args.exercise_title,
+                'version': version,
+                'dry_run': args.dry_run,
+                'submissions_scanned': scanned,
+                'scores_changed': updated,
+                'transitions': [{'old': old, 'new': new, 'count': count}
+                                for (old, new), count in sorted(transitions.items())],
+                'summaries_refreshed': refreshed,
+                'totals_changed': total_changes,
+                'ranks_changed': rank_changes
+            }, f, indent=2, ensure_ascii=False)
+            f.write('\n')
+        print(f'📝 JSON报告: {args.json_report}')
+    return 0
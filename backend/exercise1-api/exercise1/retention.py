@@ -0,0 +1,208 @@
+# -*- coding: utf-8 -*-
+
+"""
+提交记录保留策略 (exercise1 retention)
+
+每个 (学员, 练习) 在 submissions 中只保留两条提交: 最高分的一次 (与排行榜
+DISTINCT ON ... ORDER BY score DESC, submitted_at ASC 选中的是同一条) 和最新的一次。
+其余被取代的提交分批移入 submissions_archive，头像数据不保留，只保留大小、类型和SHA-256。
+student_summary 中的计数不受影响。
+
+每批处理 --batch-students 名学员，在一个设置了 lock_timeout 的短事务中
+DELETE ... RETURNING 并写入归档表；拿不到锁时回滚，稍后重试该批，不会长时间阻塞提交接口。
+归档表中已有相同 id 或写入归档的行数与删除的行数不一致时回滚该批并报告，最后返回1。
+开始前调用 ensure_submission_partitions() 创建未来几个月的分区 (server.js 启动时和每天也会调用)；
+创建失败时报告错误并继续归档，最后返回1。
+需要先运行 migrate-partition-submissions.sql。
+
+用法:
+    exercise1 retention --dry-run
+    exercise1 retention --min-age-hours 24 --batch-students 200
+"""
+
+import time
+from typing import List, Optional, Tuple
+
+from exercise1.config import Config
+
+# 比任何UUID都小，作为按学员分批的起点
+MIN_UUID = '00000000-0000-0000-0000-000000000000'
+
+STUDENT_BATCH_SQL = 'SELECT id FROM students WHERE id > %s::uuid ORDER BY id LIMIT %s'
+
+SUPERSEDED_CTE = """
+    WITH ranked AS (
+        SELECT
+            id,
+            submitted_at,
+            row_number() OVER (
+                PARTITION BY student_id, exercise_id
+                ORDER BY (processing_status = 'processed') IS TRUE DESC, score DESC, submitted_at ASC
+            ) AS best_rank,
+            row_number() OVER (
+                PARTITION BY student_id, exercise_id
+                ORDER BY submitted_at DESC
+            ) AS latest_rank
+        FROM submissions
+        WHERE student_id = ANY(%(student_ids)s::uuid[])
+    ),
+    superseded AS (
+        SELECT id, submitted_at
+        FROM ranked
+        WHERE best_rank > 1
+          AND latest_rank > 1
+          AND submitted_at < CURRENT_TIMESTAMP - %(min_age_hours)s * INTERVAL '1 hour'
+    )
+"""
+
+ARCHIVE_COLUMNS = (
+    'id', 'student_id', 'exercise_id', 'client_ip_address', 'operating_system', 'ami_id',
+    'internal_ip_address', 'elastic_ip_address', 'instance_type',
+    'screenshot_filename', 'screenshot_mimetype', 'screenshot_size',
+    'score', 'submitted_at', 'processing_status'
+)
+
+# 返回 (删除行数, 归档行数, 头像字节数)；归档表中已有相同 id 时违反主键，整批回滚
+MOVE_SQL = SUPERSEDED_CTE + f"""
+    , moved AS (
+        DELETE FROM submissions s
+        USING superseded x
+        WHERE s.id = x.id AND s.submitted_at = x.submitted_at
+        RETURNING s.*
+    ),
+    archived AS (
+        INSERT INTO submissions_archive ({', '.join(ARCHIVE_COLUMNS)}, screenshot_sha256)
+        SELECT {', '.join(ARCHIVE_COLUMNS)}, encode(sha256(screenshot_data), 'hex')
+        FROM moved
+        RETURNING COALESCE(screenshot_size, 0) AS size
+    )
+    SELECT (SELECT COUNT(*) FROM moved), COUNT(*), COALESCE(SUM(size), 0)
+    FROM archived
+"""
+
+DRY_RUN_SQL = SUPERSEDED_CTE + """
+    SELECT COUNT(*), COUNT(*), COALESCE(SUM(s.screenshot_size), 0)
+    FROM superseded x
+    JOIN submissions s ON s.id = x.id AND s.submitted_at = x.submitted_at
+"""
+
+
+class ArchiveError(Exception):
+    """一批提交没有完整写入归档表 (该批已回滚)"""
+
+
+def ensure_partitions(conn, months_ahead: int) -> Optional[int]:
+    """创建缺少的月分区，返回新建数量；没有 ensure_submission_partitions() 时返回 None"""
+    with conn.cursor() as cursor:
+        cursor.execute("SELECT to_regproc('ensure_submission_partitions')")
+        if cursor.fetchone()[0] is None:
+            return None
+        cursor.execute('SELECT ensure_submission_partitions(months_ahead => %s)', (months_ahead,))
+        created = cursor.fetchone()[0]
+    conn.commit()
+    return created
+
+
+def move_batch(conn, student_ids: List[str], args) -> Optional[Tuple[int, int]]:
+    """移动一批学员的被取代提交，返回 (行数, 头像字节数)；多次拿不到锁时返回 None，
+    没有完整归档时回滚并抛出 ArchiveError"""
+    from psycopg2 import errors
+
+    params = {'student_ids': student_ids, 'min_age_hours': args.min_age_hours}
+    for attempt in range(args.lock_retries + 1):
+        try:
+            with conn.cursor() as cursor:
+                cursor.execute('SET LOCAL lock_timeout = %s', (f'{args.lock_timeout_ms}ms',))
+                cursor.execute(DRY_RUN_SQL if args.dry_run else MOVE_SQL, params)
+                deleted, archived, size = cursor.fetchone()
+            if archived != deleted:
+                conn.rollback()
+                raise ArchiveError(f'删除 {deleted} 条提交，但只归档了 {archived} 条')
+            if args.dry_run:
+                conn.rollback()
+            else:
+                conn.commit()
+            return archived, int(size)
+        except errors.LockNotAvailable:
+            conn.rollback()
+            time.sleep(args.pause_ms / 1000 * 2 ** (attempt + 1))
+        except errors.UniqueViolation as error:
+            conn.rollback()
+            raise ArchiveError(f'归档表中已有相同的提交: {str(error).strip()}') from error
+    return None
+
+
+def format_bytes(size: float) -> str:
+    for unit in ('B', 'KB', 'MB'):
+        if size < 1024:
+            return f'{size:.0f}{unit}' if unit == 'B' else f'{size:.1f}{unit}'
+        size /= 1024
+    return f'{size:.1f}GB'
+
+
+def run_retention(args, config: Config, fake_server=None) -> int:
+    """exercise1 retention"""
+    import psycopg2
+
+    conn = psycopg2.connect(**config.db)
+    try:
+        with conn.cursor() as cursor:
+            cursor.execute("SELECT to_regclass('submissions_archive')")
+            if cursor.fetchone()[0] is None:
+                print('❌ 没有 submissions_archive 表，请先运行 migrate-partition-submissions.sql')
+                return 1
+        conn.commit()
+
+        partition_error = None
+        try:
+            created = ensure_partitions(conn, args.months_ahead)
+        except psycopg2.Error as error:
+            conn.rollback()
+            partition_error = str(error).strip()
+            print(f'❌ 创建分区失败，继续归档: {partition_error}')
+        else:
+            if created is not None:
+                print(f'📅 已确保未来 {args.months_ahead} 个月的分区存在 (新建 {created} 个)')
+
+        mode = '预览 (不修改数据)' if args.dry_run else '归档'
+        print(f'🗄️  {mode}: 超过 {args.min_age_hours} 小时、既非最高分也非最新的提交, 每批 {args.batch_students} 名学员')
+
+        last_id = MIN_UUID
+        students = moved = freed = batches = skipped = failed = 0
+        while True:
+            with conn.cursor() as cursor:
+                cursor.execute(STUDENT_BATCH_SQL, (last_id, args.batch_students))
+                student_ids = [str(row[0]) for row in cursor.fetchall()]
+            conn.commit()
+            if not student_ids:
+                break
+
+            try:
+                result = move_batch(conn, student_ids, args)
+            except ArchiveError as error:
+                print(f'❌ 学员 {student_ids[0]} ~ {student_ids[-1]} 这一批已回滚: {error}')
+                failed += 1
+            else:
+                if result is None:
+                    skipped += 1
+                else:
+                    moved += result[0]
+                    freed += result[1]
+            students += len(student_ids)
+            batches += 1
+            last_id = student_ids[-1]
+            if args.max_batches and batches >= args.max_batches:
+                break
+            time.sleep(args.pause_ms / 1000)
+    finally:
+        conn.close()
+
+    verb = '可归档' if args.dry_run else '已归档'
+    print(f'✅ 检查 {students} 名学员 ({batches} 批): {verb} {moved} 条提交, 头像数据 {format_bytes(freed)}')
+    if skipped:
+        print(f'⚠️  {skipped} 批因锁等待超时被跳过，下次运行时会重新处理')
+    if failed:
+        print(f'❌ {failed} 批没有完整归档，已回滚，请检查 submissions_archive 中重复的 id')
+    if partition_error:
+        print('⚠️  分区没有创建，请检查上面的错误')
+    return 1 if skipped or failed or partition_error else 0
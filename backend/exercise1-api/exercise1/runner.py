@@ -0,0 +1,162 @@
+# -*- coding: utf-8 -*-
+
+"""
+并行运行 Exercise 1 API 功能测试 (exercise1 check)
+
+用例定义在 exercise1/cases.py 中，由线程池并行执行。记录每个用例和每次HTTP调用的耗时，
+输出 JSON / JUnit 报告，并与保存的基线比较，标记变慢的用例。
+
+用法:
+    exercise1 check --fake
+    exercise1 check --base-url http://localhost:3001 --workers 8
+    exercise1 check --fake --update-baseline
+"""
+
+import json
+import os
+import time
+import traceback
+import xml.etree.ElementTree as ET
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List
+
+from exercise1 import cases
+from exercise1.config import Config
+
+DEFAULT_BASELINE = 'test-baseline.json'
+
+
+def run_case(func, config: Config) -> Dict[str, Any]:
+    """在独立的 ApiContext 中运行一个用例"""
+    ctx = cases.ApiContext(config, func.__name__)
+    start = time.perf_counter()
+    status, message, details = 'passed', None, None
+    try:
+        func(ctx)
+    except AssertionError as error:
+        status, message, details = 'failed', str(error) or 'assertion failed', traceback.format_exc()
+    except Exception as error:
+        status, message, details = 'error', f'{type(error).__name__}: {error}', traceback.format_exc()
+    finally:
+        ctx.close()
+
+    return {
+        'name': func.__name__,
+        'description': (func.__doc__ or '').strip(),
+        'status': status,
+        'message': message,
+        'details': details,
+        'duration_ms': round((time.perf_counter() - start) * 1000, 3),
+        'http_calls': ctx.http_calls
+    }
+
+
+def load_baseline(path: str) -> Dict[str, float]:
+    """读取基线 {用例名: 耗时毫秒}，文件不存在时返回空字典"""
+    if not os.path.exists(path):
+        return {}
+    with open(path, encoding='utf-8') as f:
+        return json.load(f).get('tests', {})
+
+
+def save_baseline(path: str, results: List[Dict[str, Any]]) -> None:
+    baseline = {r['name']: r['duration_ms'] for r in results if r['status'] == 'passed'}
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump({'tests': baseline}, f, indent=2, ensure_ascii=False, sort_keys=True)
+        f.write('\n')
+
+
+def flag_slow(results: List[Dict[str, Any]], baseline: Dict[str, float],
+              factor: float, slack_ms: float) -> None:
+    """耗时超过 基线*factor+slack_ms 的用例标记为 slow"""
+    for result in results:
+        reference = baseline.get(result['name'])
+        result['baseline_ms'] = reference
+        result['slow'] = reference is not None and result['duration_ms'] > reference * factor + slack_ms
+
+
+def write_json_report(path: str, results: List[Dict[str, Any]], summary: Dict[str, Any]) -> None:
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump({'summary': summary, 'tests': results}, f, indent=2, ensure_ascii=False)
+        f.write('\n')
+
+
+def write_junit_report(path: str, results: List[Dict[str, Any]], summary: Dict[str, Any]) -> None:
+    suite = ET.Element('testsuite', {
+        'name': 'exercise1-api',
+        'tests': str(summary['total']),
+        'failures': str(summary['failed']),
+        'errors': str(summary['errors']),
+        'time': f"{summary['wall_time_ms'] / 1000:.3f}"
+    })
+    for result in results:
+        testcase = ET.SubElement(suite, 'testcase', {
+            'classname': 'exercise1.cases',
+            'name': result['name'],
+            'time': f"{result['duration_ms'] / 1000:.3f}"
+        })
+        if result['status'] == 'failed':
+            ET.SubElement(testcase, 'failure', {'message': result['message']}).text = result['details']
+        elif result['status'] == 'error':
+            ET.SubElement(testcase, 'error', {'message': result['message']}).text = result['details']
+
+        properties = ET.SubElement(testcase, 'properties')
+        ET.SubElement(properties, 'property', {'name': 'slow', 'value': str(result['slow']).lower()})
+        if result['baseline_ms'] is not None:
+            ET.SubElement(properties, 'property', {'name': 'baseline_ms', 'value': str(result['baseline_ms'])})
+        ET.SubElement(testcase, 'system-out').text = '\n'.join(
+            f"{call['method']} {call['path']} -> {call['status']} ({call['duration_ms']}ms)"
+            for call in result['http_calls']
+        )
+    ET.ElementTree(suite).write(path, encoding='utf-8', xml_declaration=True)
+
+
+def print_summary(results: List[Dict[str, Any]], summary: Dict[str, Any]) -> None:
+    icons = {'passed': '✅', 'failed': '❌', 'error': '💥'}
+    for result in results:
+        slow = ' 🐢 慢于基线' if result['slow'] else ''
+        print(f"{icons[result['status']]} {result['name']} ({result['duration_ms']:.1f}ms, "
+              f"{len(result['http_calls'])} 次请求){slow}")
+        if result['message']:
+            print(f"   {result['message']}")
+
+    print()
+    print(f"📋 共 {summary['total']} 个用例: {summary['passed']} 通过, "
+          f"{summary['failed']} 失败, {summary['errors']} 错误, {summary['slow']} 个变慢")
+    print(f"⏱️  总耗时 {summary['wall_time_ms']:.1f}ms ({summary['workers']} 个并发)")
+
+
+def run_check(args, config: Config, fake_server=None) -> int:
+    """exercise1 check，返回进程退出码"""
+    selected = [func for func in cases.CASES if not args.keyword or args.keyword in func.__name__]
+    print(f'🚀 并行运行 {len(selected)} 个用例: {config.server_url}\n')
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=max(1, args.workers)) as pool:
+        results = list(pool.map(lambda func: run_case(func, config), selected))
+    wall_time_ms = round((time.perf_counter() - start) * 1000, 3)
+
+    flag_slow(results, load_baseline(args.baseline), args.slow_factor, args.slow_slack_ms)
+    summary = {
+        'server_url': config.server_url,
+        'workers': args.workers,
+        'total': len(results),
+        'passed': sum(1 for r in results if r['status'] == 'passed'),
+        'failed': sum(1 for r in results if r['status'] == 'failed'),
+        'errors': sum(1 for r in results if r['status'] == 'error'),
+        'slow': sum(1 for r in results if r['slow']),
+        'wall_time_ms': wall_time_ms
+    }
+
+    print_summary(results, summary)
+    if args.json_report:
+        write_json_report(args.json_report, results, summary)
+        print(f'📝 JSON报告: {args.json_report}')
+    if args.junit_report:
+        write_junit_report(args.junit_report, results, summary)
+        print(f'📝 JUnit报告: {args.junit_report}')
+    if args.update_baseline:
+        save_baseline(args.baseline, results)
+        print(f'📌 基线已更新: {args.baseline}')
+
+    return 0 if summary['failed'] == 0 and summary['errors'] == 0 else 1
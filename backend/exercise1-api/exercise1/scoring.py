@@ -0,0 +1,45 @@
+# -*- coding: utf-8 -*-
+
+"""
+声明式评分规则
+
+规则集是按 priority 排序的规则列表，每条规则对三个特征 (has_ec2_info、has_elastic_ip、has_avatar)
+给出 true/false/null (null 表示不限)，第一条匹配的规则决定分数。
+scoring_rules.json 是初始版本 (version 1)：migrate-scoring-rules.sql 用它初始化 scoring_rules 表，
+server.js 在读不到数据库中的规则时使用它，本地替身服务器直接使用它。
+"""
+
+import json
+import os
+from typing import Any, Dict, List
+
+FEATURES = ('has_ec2_info', 'has_elastic_ip', 'has_avatar')
+
+RULES_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'scoring_rules.json')
+
+REQUIRED_EC2_FIELDS = ('operatingSystem', 'amiId', 'internalIpAddress', 'instanceType')
+
+
+def load_default_rules() -> Dict[str, Any]:
+    """读取 scoring_rules.json，规则按 priority 排序"""
+    with open(RULES_FILE, encoding='utf-8') as f:
+        ruleset = json.load(f)
+    ruleset['rules'].sort(key=lambda rule: rule['priority'])
+    return ruleset
+
+
+def submission_features(ec2_info: Dict[str, Any], has_avatar: bool) -> Dict[str, bool]:
+    """与 server.js 相同的特征判断"""
+    return {
+        'has_ec2_info': all(ec2_info.get(field) for field in REQUIRED_EC2_FIELDS),
+        'has_elastic_ip': bool((ec2_info.get('elasticIpAddress') or '').strip()),
+        'has_avatar': has_avatar
+    }
+
+
+def score_features(rules: List[Dict[str, Any]], features: Dict[str, bool]) -> int:
+    """第一条匹配的规则的分数；没有规则匹配时为0"""
+    for rule in rules:
+        if all(rule.get(name) is None or rule[name] == features[name] for name in FEATURES):
+            return rule['score']
+    return 0
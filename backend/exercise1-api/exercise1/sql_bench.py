@@ -0,0 +1,207 @@
+# -*- coding: utf-8 -*-
+
+"""
+SQL语句目录基准测试 (exercise1 bench-sql)
+
+从 queries.js 读取 server.js 使用的语句目录，对每条语句交替执行
+即席查询 (每次都由服务器重新解析和规划) 和 PREPARE 一次后的 EXECUTE，
+比较两者的延迟。服务器上 node-postgres 的命名查询在每个连接上也是只准备一次。
+
+全部语句在一个事务中执行，结束时回滚: 测试用的学员、提交和汇总行都不会留在数据库中。
+需要 node (读取 queries.js) 和可写的数据库。
+
+用法:
+    exercise1 bench-sql
+    exercise1 bench-sql -n 500 -s rankings -s studentByName --json sql-bench.json
+"""
+
+import json
+import pathlib
+import re
+import subprocess
+import time
+import uuid
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Tuple
+
+from exercise1.bench import percentile
+from exercise1.cases import TEST_AVATAR_BASE64, TEST_EC2_INFO
+from exercise1.config import Config
+
+EXERCISE_TITLE = 'Hands-on Exercise 1'
+
+LOAD_CATALOG_JS = (
+    "const { statements } = await import(process.argv[1]);"
+    "process.stdout.write(JSON.stringify(statements));"
+)
+
+
+def load_catalog(path: str) -> Dict[str, str]:
+    """用 node 导入 queries.js，返回 {语句名: SQL}"""
+    url = pathlib.Path(path).resolve().as_uri()
+    result = subprocess.run(['node', '--input-type=module', '-e', LOAD_CATALOG_JS, url],
+                            capture_output=True, text=True, check=True)
+    return json.loads(result.stdout)
+
+
+def adhoc_sql(text: str) -> str:
+    """$1, $2 ... 换成 psycopg2 的 %(p1)s ... (同一参数可以出现多次)"""
+    return re.sub(r'\$(\d+)', r'%(p\1)s', text.replace('%', '%%'))
+
+
+class SqlFixture:
+    """在基准测试事务中创建的学员、练习和提交记录"""
+
+    def __init__(self, cursor):
+        import base64
+        from psycopg2 import Binary
+
+        self.avatar = Binary(base64.b64decode(TEST_AVATAR_BASE64))
+        self.avatar_size = len(base64.b64decode(TEST_AVATAR_BASE64))
+        self.student_name = f'基准测试-{uuid.uuid4().hex[:8]}'
+        self.access_key = uuid.uuid4().hex[:26]
+        cursor.execute('INSERT INTO students (name, access_key) VALUES (%s, %s) RETURNING id',
+                       (self.student_name, self.access_key))
+        self.student_id = cursor.fetchone()[0]
+
+        cursor.execute('SELECT id FROM exercises WHERE title = %s', (EXERCISE_TITLE,))
+        row = cursor.fetchone()
+        if row is None:
+            cursor.execute("""
+                INSERT INTO exercises (title, description, requirements, difficulty, max_score, is_published)
+                VALUES (%s, 'benchmark', 'benchmark', 'beginner', 100, true) RETURNING id
+            """, (EXERCISE_TITLE,))
+            row = cursor.fetchone()
+        self.exercise_id = row[0]
+
+        cursor.execute('INSERT INTO student_summary (student_id) VALUES (%s) ON CONFLICT DO NOTHING',
+                       (self.student_id,))
+        cursor.execute("""
+            INSERT INTO submissions (student_id, exercise_id, client_ip_address, screenshot_data, score, processing_status)
+            VALUES (%s, %s, '203.0.113.10', %s, 100, 'processed') RETURNING id
+        """, (self.student_id, self.exercise_id, self.avatar))
+        self.submission_id = cursor.fetchone()[0]
+
+    def submission(self, score: int) -> Tuple[Any, ...]:
+        return (
+            self.student_id, self.exercise_id, '203.0.113.10',
+            TEST_EC2_INFO['operatingSystem'], TEST_EC2_INFO['amiId'],
+            TEST_EC2_INFO['internalIpAddress'], TEST_EC2_INFO['elasticIpAddress'], TEST_EC2_INFO['instanceType'],
+            self.avatar, 'avatar.png', 'image/png', self.avatar_size, score, 'processed'
+        )
+
+
+# 语句名 -> 第 i 次执行的参数；不在这里的语句 (例如只在空库上运行一次的 insertExercise) 不测
+PARAMS: Dict[str, Callable[[SqlFixture, int], Tuple[Any, ...]]] = {
+    'studentByName': lambda fx, i: (fx.student_name,),
+    'studentByAccessKey': lambda fx, i: (fx.access_key,),
+    'accessKeyExists': lambda fx, i: (uuid.uuid4().hex[:26],),
+    'insertStudent': lambda fx, i: (f'基准测试-{uuid.uuid4().hex[:8]}', uuid.uuid4().hex[:26]),
+    'touchStudent': lambda fx, i: (fx.student_id,),
+    'exerciseByTitle': lambda fx, i: (EXERCISE_TITLE,),
+    'lockStudentSummary': lambda fx, i: (fx.student_id,),
+    'previousBestScore': lambda fx, i: (fx.student_id, fx.exercise_id),
+    'insertSubmission': lambda fx, i: fx.submission(90),
+    'addToStudentSummary': lambda fx, i: (fx.student_id, 90, 0, datetime.now(timezone.utc)),
+    'submissionsByStudent': lambda fx, i: (fx.student_id,),
+    'rankings': lambda fx, i: (),
+    'activeScoringRules': lambda fx, i: (),
+    'avatarBySubmission': lambda fx, i: (fx.submission_id,),
+    'studentSummaryByAccessKey': lambda fx, i: (fx.access_key,),
+}
+
+
+def timed(cursor, sql: str, params) -> float:
+    start = time.perf_counter()
+    cursor.execute(sql, params)
+    if cursor.description is not None:
+        cursor.fetchall()
+    return (time.perf_counter() - start) * 1000
+
+
+def bench_statement(cursor, fixture: SqlFixture, name: str, text: str,
+                    iterations: int, warmup: int) -> Dict[str, Any]:
+    """交替执行即席查询和 EXECUTE，返回两者的延迟统计"""
+    prepared_name = f'bench_{name}'
+    start = time.perf_counter()
+    cursor.execute(f'PREPARE {prepared_name} AS {text}')
+    prepare_ms = (time.perf_counter() - start) * 1000
+
+    adhoc = adhoc_sql(text)
+    adhoc_ms, prepared_ms = [], []
+    for i in range(warmup + iterations):
+        values = PARAMS[name](fixture, i)
+        execute = f"EXECUTE {prepared_name}" + (f" ({', '.join(['%s'] * len(values))})" if values else '')
+        runs = [(adhoc_ms, adhoc, {f'p{n}': v for n, v in enumerate(values, 1)}), (prepared_ms, execute, values)]
+        if i % 2:
+            runs.reverse()
+        for samples, sql, params in runs:
+            elapsed = timed(cursor, sql, params)
+            if i >= warmup:
+                samples.append(elapsed)
+
+    adhoc_ms.sort()
+    prepared_ms.sort()
+    adhoc_p50, prepared_p50 = percentile(adhoc_ms, 50), percentile(prepared_ms, 50)
+    return {
+        'statement': name,
+        'iterations': iterations,
+        'prepare_ms': round(prepare_ms, 3),
+        'adhoc_p50_ms': round(adhoc_p50, 3),
+        'adhoc_p99_ms': round(percentile(adhoc_ms, 99), 3),
+        'prepared_p50_ms': round(prepared_p50, 3),
+        'prepared_p99_ms': round(percentile(prepared_ms, 99), 3),
+        'saving': round(1 - prepared_p50 / adhoc_p50, 4) if adhoc_p50 else 0.0
+    }
+
+
+def print_results(results: List[Dict[str, Any]]) -> None:
+    print(f"{'语句':<28}{'次数':>8}{'即席p50':>10}{'即席p99':>10}{'预编译p50':>12}{'预编译p99':>12}{'节省':>9}")
+    print('-' * 89)
+    for r in results:
+        print(f"{r['statement']:<28}{r['iterations']:>8}{r['adhoc_p50_ms']:>10.3f}{r['adhoc_p99_ms']:>10.3f}"
+              f"{r['prepared_p50_ms']:>12.3f}{r['prepared_p99_ms']:>12.3f}{r['saving']:>9.1%}")
+
+
+def run_sql_bench(args, config: Config, fake_server=None) -> int:
+    """exercise1 bench-sql"""
+    import psycopg2
+
+    try:
+        catalog = load_catalog(args.catalog)
+    except (OSError, subprocess.CalledProcessError) as e:
+        print(f'❌ 无法读取语句目录 {args.catalog}: {e}')
+        return 2
+
+    names = args.statements or [name for name in catalog if name in PARAMS]
+    unknown = [name for name in names if name not in catalog or name not in PARAMS]
+    if unknown:
+        print(f"❌ 未知或不支持的语句: {', '.join(unknown)} (可选: {', '.join(n for n in catalog if n in PARAMS)})")
+        return 2
+    skipped = [name for name in catalog if name not in PARAMS]
+
+    db = config.db
+    print(f"⏱️  SQL基准测试: {db['host']}:{db['port']}/{db['database']} ({args.iterations} 次/语句, 预热 {args.warmup} 次)")
+    if skipped:
+        print(f"   不测: {', '.join(skipped)}")
+    print()
+
+    conn = psycopg2.connect(**db)
+    try:
+        with conn.cursor() as cursor:
+            fixture = SqlFixture(cursor)
+            results = [bench_statement(cursor, fixture, name, catalog[name], args.iterations, args.warmup)
+                       for name in names]
+    finally:
+        conn.rollback()
+        conn.close()
+
+    print_results(results)
+
+    if args.json_report:
+        with open(args.json_report, 'w', encoding='utf-8') as f:
+            json.dump({'database': f"{db['host']}:{db['port']}/{db['database']}", 'results': results},
+                      f, indent=2, ensure_ascii=False)
+            f.write('\n')
+        print(f'\n📝 JSON报告: {args.json_report}')
+    return 0
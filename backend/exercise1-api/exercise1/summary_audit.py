@@ -0,0 +1,182 @@
+# -*- coding: utf-8 -*-
+
+"""
+student_summary 一致性检查 (exercise1 audit summary)
+
+从原始 submissions 表批量重新计算每个学员的汇总数据，
+与 student_summary 表比较并报告偏差；加 --fix 参数时修正偏差行。
+存在 submissions_archive 表时 (migrate-partition-submissions.sql)，
+`exercise1 retention` 归档的提交同样计入计数和总分；best_total_score 只按 submissions 计算
+(每个练习的最高分提交总是保留，归档的分数不随 `exercise1 rescore` 更新)，
+与 previousBestScore 和排行榜一致。
+"""
+
+from exercise1.config import Config
+
+SUMMARY_COLUMNS = (
+    'total_submissions',
+    'completed_submissions',
+    'total_score',
+    'highest_score',
+    'best_total_score',
+    'last_submission_at'
+)
+
+SUBMISSION_COLUMNS = 'student_id, exercise_id, score, submitted_at, processing_status'
+
+# 全部提交 = 保留的提交 + 归档的提交
+SUBMISSIONS_WITH_ARCHIVE = f"""(
+    SELECT {SUBMISSION_COLUMNS} FROM submissions
+    UNION ALL
+    SELECT {SUBMISSION_COLUMNS} FROM submissions_archive
+)"""
+
+# 一次扫描 submissions 重新计算全部学员的汇总数据 (最高分只看保留的提交)
+EXPECTED_SUMMARY_SQL = """
+    SELECT
+        totals.student_id,
+        totals.total_submissions,
+        totals.completed_submissions,
+        totals.total_score,
+        totals.highest_score,
+        COALESCE(best.best_total_score, 0) AS best_total_score,
+        totals.last_submission_at
+    FROM (
+        SELECT
+            student_id,
+            COUNT(*) AS total_submissions,
+            COUNT(*) FILTER (WHERE score > 0) AS completed_submissions,
+            COALESCE(SUM(score), 0) AS total_score,
+            COALESCE(MAX(score), 0) AS highest_score,
+            MAX(submitted_at) AS last_submission_at
+        FROM {submissions} all_submissions
+        WHERE student_id IS NOT NULL
+        GROUP BY student_id
+    ) totals
+    LEFT JOIN (
+        SELECT student_id, SUM(best_score) AS best_total_score
+        FROM (
+            SELECT student_id, exercise_id, MAX(score) AS best_score
+            FROM submissions
+            WHERE processing_status = 'processed'
+            GROUP BY student_id, exercise_id
+        ) per_exercise
+        GROUP BY student_id
+    ) best ON best.student_id = totals.student_id
+"""
+
+# 只返回存在偏差的学员 (包括缺失的汇总行和多余的汇总行)
+DRIFT_SQL = f"""
+    WITH expected AS ({EXPECTED_SUMMARY_SQL})
+    SELECT
+        COALESCE(e.student_id, a.student_id) AS student_id,
+        {', '.join(f'e.{col} AS expected_{col}, a.{col} AS actual_{col}' for col in SUMMARY_COLUMNS)}
+    FROM expected e
+    FULL OUTER JOIN student_summary a ON a.student_id = e.student_id
+    WHERE e.student_id IS NULL
+       OR a.student_id IS NULL
+       OR {' OR '.join(f'e.{col} IS DISTINCT FROM a.{col}' for col in SUMMARY_COLUMNS)}
+    ORDER BY 1
+"""
+
+# 先锁定要修正的汇总行 (与提交接口的 lockStudentSummary 相同的行锁，缺失的行同时插入)，
+# 之后的语句使用新的快照重新计算: 在锁等待期间提交的计数不会被旧的快照覆盖
+LOCK_SUMMARIES_SQL = """
+    INSERT INTO student_summary (student_id)
+    SELECT unnest(%s::uuid[])
+    ON CONFLICT (student_id) DO UPDATE SET updated_at = CURRENT_TIMESTAMP
+"""
+
+FIX_SQL = f"""
+    INSERT INTO student_summary (student_id, {', '.join(SUMMARY_COLUMNS)})
+    SELECT student_id, {', '.join(SUMMARY_COLUMNS)}
+    FROM ({EXPECTED_SUMMARY_SQL}) expected
+    WHERE student_id = ANY(%s::uuid[])
+    ON CONFLICT (student_id) DO UPDATE SET
+        {', '.join(f'{col} = EXCLUDED.{col}' for col in SUMMARY_COLUMNS)},
+        updated_at = CURRENT_TIMESTAMP
+"""
+
+# 没有任何提交记录的汇总行 (例如提交被删除后) 直接清理
+DELETE_ORPHANS_SQL = """
+    DELETE FROM student_summary a
+    WHERE a.student_id = ANY(%s::uuid[])
+      AND NOT EXISTS (SELECT 1 FROM {submissions} s WHERE s.student_id = a.student_id)
+"""
+
+
+def submissions_source(conn) -> str:
+    """重新计算时使用的提交记录: 有归档表时包括归档的提交"""
+    with conn.cursor() as cursor:
+        cursor.execute("SELECT to_regclass('submissions_archive')")
+        has_archive = cursor.fetchone()[0] is not None
+    return SUBMISSIONS_WITH_ARCHIVE if has_archive else 'submissions'
+
+
+def find_drift(conn):
+    """返回所有存在偏差的学员: [(student_id, {column: (expected, actual)})]"""
+    sql = DRIFT_SQL.format(submissions=submissions_source(conn))
+    with conn.cursor() as cursor:
+        cursor.execute(sql)
+        rows = cursor.fetchall()
+
+    drift = []
+    for row in rows:
+        student_id = row[0]
+        differences = {}
+        for index, column in enumerate(SUMMARY_COLUMNS):
+            expected, actual = row[1 + index * 2], row[2 + index * 2]
+            if expected != actual:
+                differences[column] = (expected, actual)
+        drift.append((student_id, differences))
+    return drift
+
+
+def fix_drift(conn, student_ids):
+    """按重新计算的结果修正偏差行，返回 (更新行数, 删除行数)；由调用方提交事务
+
+    在 READ COMMITTED 下每条语句使用新的快照，所以先锁定汇总行，再在后面的语句中重新计算。
+    """
+    source = submissions_source(conn)
+    with conn.cursor() as cursor:
+        cursor.execute(LOCK_SUMMARIES_SQL, (student_ids,))
+        cursor.execute(FIX_SQL.format(submissions=source), (student_ids,))
+        updated = cursor.rowcount
+        cursor.execute(DELETE_ORPHANS_SQL.format(submissions=source), (student_ids,))
+        deleted = cursor.rowcount
+    return updated, deleted
+
+
+def print_report(drift, limit):
+    """打印偏差报告"""
+    if not drift:
+        print('✅ student_summary 与 submissions 完全一致')
+        return
+
+    print(f'❌ 发现 {len(drift)} 名学员的汇总数据存在偏差')
+    for student_id, differences in drift[:limit]:
+        print(f'   学员ID: {student_id}')
+        for column, (expected, actual) in differences.items():
+            print(f'      {column}: 期望 {expected}, 实际 {actual}')
+    if len(drift) > limit:
+        print(f'   ... 另有 {len(drift) - limit} 名学员未显示')
+
+
+def run_summary_audit(args, config: Config, fake_server=None) -> int:
+    """exercise1 audit summary"""
+    import psycopg2
+
+    print('🔍 检查 student_summary 一致性...')
+    conn = psycopg2.connect(**config.db)
+    try:
+        drift = find_drift(conn)
+        print_report(drift, args.limit)
+
+        if drift and args.fix:
+            updated, deleted = fix_drift(conn, [str(student_id) for student_id, _ in drift])
+            conn.commit()
+            print(f'🔧 已修正 {updated} 行, 清理 {deleted} 行')
+    finally:
+        conn.close()
+
+    return 1 if drift and not args.fix else 0
@@ -0,0 +1,184 @@
+-- 数据库迁移脚本：submissions 按月分区，并创建 submissions_archive 归档表
+--
+-- 1. submissions 改为按 submitted_at 按月范围分区，主键改为 (id, submitted_at)
+--    (分区键必须包含在主键中；按 id 查询仍走各分区的主键索引)
+-- 2. ensure_submission_partitions() 按需创建月分区，并把默认分区中这些月份的行移入新分区；
+--    server.js 启动时和之后每天调用一次，`exercise1 retention` 运行时也会调用
+-- 3. submissions_archive 保存被取代的提交 (既不是最高分也不是最新一次)，不含头像数据，
+--    只保留头像的大小、类型和SHA-256，由 `exercise1 retention` 分批迁入
+--
+-- 运行前请先备份 (pg_dump)。迁移在一个事务中完成，迁移期间提交接口会等待表锁。
+-- 原表保留为 submissions_unpartitioned，验证无误后执行:
+--     DROP TABLE submissions_unpartitioned;
+
+BEGIN;
+
+-- 归档表 (可重复执行)
+CREATE TABLE IF NOT EXISTS submissions_archive (
+    id UUID PRIMARY KEY,
+    student_id UUID REFERENCES students(id) ON DELETE CASCADE,
+    exercise_id UUID REFERENCES exercises(id) ON DELETE CASCADE,
+    client_ip_address INET NOT NULL,
+    operating_system VARCHAR(100),
+    ami_id VARCHAR(50),
+    internal_ip_address INET,
+    elastic_ip_address INET,
+    instance_type VARCHAR(50),
+    screenshot_filename VARCHAR(255),
+    screenshot_mimetype VARCHAR(100),
+    screenshot_size INTEGER,
+    screenshot_sha256 CHAR(64),
+    score INTEGER NOT NULL DEFAULT 0,
+    submitted_at TIMESTAMP WITH TIME ZONE NOT NULL,
+    processing_status VARCHAR(20),
+    archived_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE INDEX IF NOT EXISTS idx_submissions_archive_student_exercise ON submissions_archive(student_id, exercise_id);
+
+DO $$
+DECLARE
+    idx RECORD;
+BEGIN
+    IF EXISTS (SELECT 1 FROM pg_partitioned_table WHERE partrelid = to_regclass('submissions')) THEN
+        RAISE NOTICE 'submissions 已经是分区表，跳过分区迁移';
+        RETURN;
+    END IF;
+
+    -- 原表及其索引改名，腾出索引名称
+    ALTER TABLE submissions RENAME TO submissions_unpartitioned;
+    FOR idx IN
+        SELECT indexname FROM pg_indexes
+        WHERE schemaname = current_schema() AND tablename = 'submissions_unpartitioned'
+    LOOP
+        EXECUTE format('ALTER INDEX %I RENAME TO %I', idx.indexname, left(idx.indexname, 50) || '_unpartitioned');
+    END LOOP;
+
+    CREATE TABLE submissions (
+        id UUID NOT NULL DEFAULT gen_random_uuid(),
+        student_id UUID REFERENCES students(id) ON DELETE CASCADE,
+        exercise_id UUID REFERENCES exercises(id) ON DELETE CASCADE,
+        client_ip_address INET NOT NULL,
+        operating_system VARCHAR(100),
+        ami_id VARCHAR(50),
+        internal_ip_address INET,
+        elastic_ip_address INET,
+        instance_type VARCHAR(50),
+        screenshot_data BYTEA,
+        screenshot_filename VARCHAR(255),
+        screenshot_mimetype VARCHAR(100),
+        screenshot_size INTEGER,
+        score INTEGER NOT NULL DEFAULT 0,
+        submitted_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT CURRENT_TIMESTAMP,
+        processing_status VARCHAR(20) CHECK (processing_status IN ('pending', 'processed', 'failed')) DEFAULT 'pending',
+        PRIMARY KEY (id, submitted_at)
+    ) PARTITION BY RANGE (submitted_at);
+
+    -- 超出已创建月分区范围的数据落入默认分区，不会插入失败
+    CREATE TABLE submissions_default PARTITION OF submissions DEFAULT;
+
+    CREATE INDEX idx_submissions_student_id ON submissions(student_id);
+    CREATE INDEX idx_submissions_exercise_id ON submissions(exercise_id);
+    CREATE INDEX idx_submissions_score ON submissions(score DESC);
+    CREATE INDEX idx_submissions_submitted_at ON submissions(submitted_at);
+    CREATE INDEX idx_submissions_student_exercise_score ON submissions(student_id, exercise_id, score DESC);
+    -- 保留策略按 (学员, 练习) 查找最新一次提交
+    CREATE INDEX idx_submissions_student_exercise_latest ON submissions(student_id, exercise_id, submitted_at DESC);
+END $$;
+
+-- 为 [from_month 与默认分区中最早的月份, 当前月 + months_ahead] 中缺少的月份创建分区，返回新建的分区数
+CREATE OR REPLACE FUNCTION ensure_submission_partitions(
+    from_month DATE DEFAULT date_trunc('month', CURRENT_DATE)::date,
+    months_ahead INTEGER DEFAULT 3
+) RETURNS INTEGER AS $$
+DECLARE
+    month_start DATE := date_trunc('month', from_month)::date;
+    month_end DATE;
+    last_month DATE := (date_trunc('month', CURRENT_DATE) + make_interval(months => months_ahead))::date;
+    partition_name TEXT;
+    has_default BOOLEAN := to_regclass('submissions_default') IS NOT NULL;
+    in_default BOOLEAN;
+    created INTEGER := 0;
+BEGIN
+    -- server.js 和 `exercise1 retention` 可能同时调用，串行执行
+    PERFORM pg_advisory_xact_lock(hashtext('ensure_submission_partitions'));
+
+    -- 默认分区中已有的行所在的月份也要建分区 (否则以后再建该月分区会违反默认分区的约束)，从其中最早的月份开始
+    IF has_default THEN
+        month_start := LEAST(month_start, (SELECT date_trunc('month', MIN(submitted_at))::date FROM submissions_default));
+    END IF;
+
+    WHILE month_start <= last_month LOOP
+        partition_name := 'submissions_' || to_char(month_start, 'YYYY_MM');
+        month_end := (month_start + INTERVAL '1 month')::date;
+        IF to_regclass(partition_name) IS NULL THEN
+            in_default := false;
+            IF has_default THEN
+                in_default := EXISTS (
+                    SELECT 1 FROM submissions_default WHERE submitted_at >= month_start AND submitted_at < month_end
+                );
+            END IF;
+            IF in_default THEN
+                -- 该月已有行落在默认分区: 先建成普通表，把这些行从默认分区移过去，再挂为分区
+                EXECUTE format(
+                    'CREATE TABLE %I (LIKE submissions INCLUDING DEFAULTS INCLUDING CONSTRAINTS)', partition_name
+                );
+                EXECUTE format(
+                    'WITH moved AS (DELETE FROM submissions_default WHERE submitted_at >= %L AND submitted_at < %L RETURNING *) '
+                    || 'INSERT INTO %I SELECT * FROM moved',
+                    month_start, month_end, partition_name
+                );
+                EXECUTE format(
+                    'ALTER TABLE submissions ATTACH PARTITION %I FOR VALUES FROM (%L) TO (%L)',
+                    partition_name, month_start, month_end
+                );
+            ELSE
+                EXECUTE format(
+                    'CREATE TABLE %I PARTITION OF submissions FOR VALUES FROM (%L) TO (%L)',
+                    partition_name, month_start, month_end
+                );
+            END IF;
+            created := created + 1;
+        END IF;
+        month_start := month_end;
+    END LOOP;
+    RETURN created;
+END;
+$$ LANGUAGE plpgsql;
+
+-- 为原表中最早的月份到未来3个月创建分区，再复制数据
+DO $$
+BEGIN
+    IF to_regclass('submissions_unpartitioned') IS NULL THEN
+        PERFORM ensure_submission_partitions();
+        RETURN;
+    END IF;
+
+    PERFORM ensure_submission_partitions(
+        (SELECT COALESCE(MIN(submitted_at), CURRENT_TIMESTAMP)::date FROM submissions_unpartitioned)
+    );
+
+    INSERT INTO submissions (
+        id, student_id, exercise_id, client_ip_address, operating_system, ami_id,
+        internal_ip_address, elastic_ip_address, instance_type,
+        screenshot_data, screenshot_filename, screenshot_mimetype, screenshot_size,
+        score, submitted_at, processing_status
+    )
+    SELECT
+        id, student_id, exercise_id, client_ip_address, operating_system, ami_id,
+        internal_ip_address, elastic_ip_address, instance_type,
+        screenshot_data, screenshot_filename, screenshot_mimetype, screenshot_size,
+        score, COALESCE(submitted_at, CURRENT_TIMESTAMP), processing_status
+    FROM submissions_unpartitioned
+    WHERE NOT EXISTS (SELECT 1 FROM submissions s WHERE s.id = submissions_unpartitioned.id);
+END $$;
+
+COMMIT;
+
+ANALYZE submissions;
+
+-- 验证迁移结果: 各分区的行数
+SELECT tableoid::regclass AS partition, COUNT(*) AS rows
+FROM submissions
+GROUP BY tableoid
+ORDER BY 1;
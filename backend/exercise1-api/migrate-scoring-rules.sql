@@ -0,0 +1,55 @@
+-- 数据库迁移脚本：版本化的声明式评分规则
+--
+-- scoring_rule_versions 每个版本一行，同一时间只有一个版本 is_active；
+-- scoring_rules 保存每个版本的规则，按 priority 从小到大匹配，第一条匹配的规则决定分数。
+-- has_ec2_info / has_elastic_ip / has_avatar 为 NULL 表示该条件不限。
+-- server.js 缓存当前版本的规则 (SCORING_RULES_TTL_MS)，`exercise1 rescore` 按指定版本重新计算已有提交的分数。
+--
+-- 版本1与 exercise1/scoring_rules.json 一致 (原先写在提交接口中的 100/90/85/80/60/40 规则)。
+-- 可重复执行。
+
+BEGIN;
+
+CREATE TABLE IF NOT EXISTS scoring_rule_versions (
+    version INTEGER PRIMARY KEY,
+    description TEXT,
+    is_active BOOLEAN NOT NULL DEFAULT FALSE,
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
+    activated_at TIMESTAMP WITH TIME ZONE
+);
+
+-- 最多一个启用的版本
+CREATE UNIQUE INDEX IF NOT EXISTS idx_scoring_rule_versions_active ON scoring_rule_versions(is_active) WHERE is_active;
+
+CREATE TABLE IF NOT EXISTS scoring_rules (
+    version INTEGER NOT NULL REFERENCES scoring_rule_versions(version) ON DELETE CASCADE,
+    priority INTEGER NOT NULL,
+    has_ec2_info BOOLEAN,
+    has_elastic_ip BOOLEAN,
+    has_avatar BOOLEAN,
+    score INTEGER NOT NULL CHECK (score >= 0),
+    description TEXT,
+    PRIMARY KEY (version, priority)
+);
+
+INSERT INTO scoring_rule_versions (version, description, is_active, activated_at)
+SELECT 1, 'Hands-on Exercise 1 initial scoring rules', true, CURRENT_TIMESTAMP
+WHERE NOT EXISTS (SELECT 1 FROM scoring_rule_versions);
+
+INSERT INTO scoring_rules (version, priority, has_ec2_info, has_elastic_ip, has_avatar, score, description) VALUES
+    (1, 10, true, true, true, 100, 'All EC2 info + elastic IP + avatar'),
+    (1, 20, true, true, NULL, 90, 'All EC2 info + elastic IP'),
+    (1, 30, true, NULL, true, 85, 'All EC2 info + avatar'),
+    (1, 40, true, NULL, NULL, 80, 'All required EC2 info'),
+    (1, 50, NULL, NULL, true, 60, 'Avatar but incomplete EC2 info'),
+    (1, 60, NULL, NULL, NULL, 40, 'Anything else')
+ON CONFLICT (version, priority) DO NOTHING;
+
+COMMIT;
+
+-- 验证: 当前启用的规则
+SELECT r.version, r.priority, r.has_ec2_info, r.has_elastic_ip, r.has_avatar, r.score, r.description
+FROM scoring_rules r
+JOIN scoring_rule_versions v ON v.version = r.version
+WHERE v.is_active
+ORDER BY r.priority;
@@ -0,0 +1,69 @@
+-- 数据库迁移脚本：创建 student_summary 汇总表
+-- 每个学员一行，由提交接口在同一事务中维护，
+-- GET /api/statistics/student/:accessKey 直接按主键读取，不再扫描全部提交记录
+
+CREATE TABLE IF NOT EXISTS student_summary (
+    student_id UUID PRIMARY KEY REFERENCES students(id) ON DELETE CASCADE,
+    total_submissions INTEGER NOT NULL DEFAULT 0,
+    completed_submissions INTEGER NOT NULL DEFAULT 0,
+    total_score BIGINT NOT NULL DEFAULT 0,
+    highest_score INTEGER NOT NULL DEFAULT 0,
+    best_total_score BIGINT NOT NULL DEFAULT 0,
+    last_submission_at TIMESTAMP WITH TIME ZONE,
+    updated_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP
+);
+
+-- 排名 = 1 + best_total_score 比自己高的学员数，用索引做范围计数
+CREATE INDEX IF NOT EXISTS idx_student_summary_best_total ON student_summary(best_total_score DESC);
+
+-- 提交时查询该学员在该练习上的历史最高分
+CREATE INDEX IF NOT EXISTS idx_submissions_student_exercise_score ON submissions(student_id, exercise_id, score DESC);
+
+-- 用现有提交记录回填汇总数据 (可重复执行)
+INSERT INTO student_summary (
+    student_id, total_submissions, completed_submissions, total_score,
+    highest_score, best_total_score, last_submission_at
+)
+SELECT
+    totals.student_id,
+    totals.total_submissions,
+    totals.completed_submissions,
+    totals.total_score,
+    totals.highest_score,
+    COALESCE(best.best_total_score, 0),
+    totals.last_submission_at
+FROM (
+    SELECT
+        student_id,
+        COUNT(*) AS total_submissions,
+        COUNT(*) FILTER (WHERE score > 0) AS completed_submissions,
+        COALESCE(SUM(score), 0) AS total_score,
+        COALESCE(MAX(score), 0) AS highest_score,
+        MAX(submitted_at) AS last_submission_at
+    FROM submissions
+    WHERE student_id IS NOT NULL
+    GROUP BY student_id
+) totals
+LEFT JOIN (
+    SELECT student_id, SUM(best_score) AS best_total_score
+    FROM (
+        SELECT student_id, exercise_id, MAX(score) AS best_score
+        FROM submissions
+        WHERE processing_status = 'processed'
+        GROUP BY student_id, exercise_id
+    ) per_exercise
+    GROUP BY student_id
+) best ON best.student_id = totals.student_id
+ON CONFLICT (student_id) DO UPDATE SET
+    total_submissions = EXCLUDED.total_submissions,
+    completed_submissions = EXCLUDED.completed_submissions,
+    total_score = EXCLUDED.total_score,
+    highest_score = EXCLUDED.highest_score,
+    best_total_score = EXCLUDED.best_total_score,
+    last_submission_at = EXCLUDED.last_submission_at,
+    updated_at = CURRENT_TIMESTAMP;
+
+-- 验证回填结果
+SELECT COUNT(*) AS summary_rows,
+       (SELECT COUNT(DISTINCT student_id) FROM submissions) AS students_with_submissions
+FROM student_summary;
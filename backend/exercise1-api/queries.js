@@ -0,0 +1,161 @@
+// Catalog of the SQL statements the Exercise 1 API runs on every request
+//
+// Each statement is sent as a node-postgres named query ({ name, text, values }): the first use
+// on a pooled connection prepares it (parse + plan), every later use on that connection only
+// sends Bind/Execute. Statements list their columns explicitly so a migration that adds a column
+// does not invalidate the prepared result type ("cached plan must not change result type").
+//
+// Set DB_PREPARED_STATEMENTS=false behind a transaction-pooling PgBouncer, where a prepared
+// statement would not follow the session to the next server connection.
+
+const PREPARED = !['0', 'false', 'no'].includes((process.env.DB_PREPARED_STATEMENTS || '').toLowerCase());
+
+const STUDENT_COLUMNS = 'id, name, access_key, registered_at, last_active_at';
+
+export const statements = {
+  studentByName: `SELECT ${STUDENT_COLUMNS} FROM students WHERE LOWER(name) = LOWER($1)`,
+
+  studentByAccessKey: `SELECT ${STUDENT_COLUMNS} FROM students WHERE access_key = $1`,
+
+  accessKeyExists: 'SELECT id FROM students WHERE access_key = $1',
+
+  insertStudent: `
+    INSERT INTO students (name, access_key)
+    VALUES ($1, $2)
+    RETURNING id, name, access_key, registered_at
+  `,
+
+  touchStudent: 'UPDATE students SET last_active_at = CURRENT_TIMESTAMP WHERE id = $1',
+
+  exerciseByTitle: 'SELECT id FROM exercises WHERE title = $1',
+
+  insertExercise: `
+    INSERT INTO exercises (title, description, requirements, difficulty, max_score, is_published, created_by)
+    VALUES ($1, $2, $3, $4, $5, $6, $7)
+    RETURNING id
+  `,
+
+  lockStudentSummary: `
+    INSERT INTO student_summary (student_id)
+    VALUES ($1)
+    ON CONFLICT (student_id) DO UPDATE SET updated_at = CURRENT_TIMESTAMP
+  `,
+
+  previousBestScore: `
+    SELECT COALESCE(MAX(score), 0) AS best_score
+    FROM submissions
+    WHERE student_id = $1 AND exercise_id = $2 AND processing_status = 'processed'
+  `,
+
+  insertSubmission: `
+    INSERT INTO submissions (
+      student_id, exercise_id, client_ip_address,
+      operating_system, ami_id, internal_ip_address, elastic_ip_address, instance_type,
+      screenshot_data, screenshot_filename, screenshot_mimetype, screenshot_size,
+      score, processing_status, submitted_at
+    )
+    VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9, $10, $11, $12, $13, $14, CURRENT_TIMESTAMP)
+    RETURNING id, submitted_at
+  `,
+
+  addToStudentSummary: `
+    UPDATE student_summary SET
+      total_submissions = total_submissions + 1,
+      completed_submissions = completed_submissions + CASE WHEN $2::integer > 0 THEN 1 ELSE 0 END,
+      total_score = total_score + $2::integer,
+      highest_score = GREATEST(highest_score, $2::integer),
+      best_total_score = best_total_score + $3::integer,
+      last_submission_at = GREATEST(last_submission_at, $4),
+      updated_at = CURRENT_TIMESTAMP
+    WHERE student_id = $1
+  `,
+
+  submissionsByStudent: `
+    SELECT
+      s.id, s.exercise_id, s.score, s.submitted_at, s.client_ip_address,
+      s.operating_system, s.ami_id, s.internal_ip_address, s.elastic_ip_address, s.instance_type,
+      s.screenshot_filename, s.screenshot_mimetype, s.screenshot_size,
+      s.screenshot_data IS NOT NULL as has_avatar,
+      s.processing_status,
+      e.title as exercise_title
+    FROM submissions s
+    LEFT JOIN exercises e ON s.exercise_id = e.id
+    WHERE s.student_id = $1
+    ORDER BY s.submitted_at DESC
+  `,
+
+  rankings: `
+    WITH student_stats AS (
+      SELECT
+        s.id as student_id,
+        s.name as student_name,
+        COALESCE(SUM(best_scores.score), 0) as total_score,
+        COUNT(best_scores.exercise_id) as completed_exercises,
+        MAX(best_scores.submitted_at) as last_submission_at
+      FROM students s
+      LEFT JOIN (
+        SELECT DISTINCT ON (student_id, exercise_id)
+          student_id, exercise_id, score, submitted_at
+        FROM submissions
+        WHERE processing_status = 'processed'
+        ORDER BY student_id, exercise_id, score DESC, submitted_at ASC
+      ) best_scores ON s.id = best_scores.student_id
+      GROUP BY s.id, s.name
+    )
+    SELECT
+      student_id,
+      student_name,
+      total_score,
+      completed_exercises,
+      0 as average_completion_time,
+      last_submission_at,
+      RANK() OVER (ORDER BY total_score DESC, last_submission_at ASC) as rank
+    FROM student_stats
+    ORDER BY rank ASC
+  `,
+
+  avatarBySubmission: `
+    SELECT screenshot_data, screenshot_filename, screenshot_mimetype
+    FROM submissions
+    WHERE id = $1 AND screenshot_data IS NOT NULL
+  `,
+
+  activeScoringRules: `
+    SELECT r.version, r.priority, r.has_ec2_info, r.has_elastic_ip, r.has_avatar, r.score
+    FROM scoring_rules r
+    JOIN scoring_rule_versions v ON v.version = r.version
+    WHERE v.is_active
+    ORDER BY r.priority
+  `,
+
+  studentSummaryByAccessKey: `
+    SELECT
+      st.id,
+      st.name,
+      st.access_key,
+      st.registered_at,
+      st.last_active_at,
+      COALESCE(ss.total_submissions, 0) as total_submissions,
+      COALESCE(ss.completed_submissions, 0) as completed_submissions,
+      COALESCE(ss.total_score, 0) as total_score,
+      COALESCE(ss.highest_score, 0) as highest_score,
+      1 + (
+        SELECT COUNT(*) FROM student_summary other
+        WHERE other.best_total_score > COALESCE(ss.best_total_score, 0)
+      ) as rank,
+      (SELECT COUNT(*) FROM students) as total_participants,
+      (SELECT COUNT(*) FROM exercises WHERE is_published = true) as total_exercises
+    FROM students st
+    LEFT JOIN student_summary ss ON ss.student_id = st.id
+    WHERE st.access_key = $1
+  `
+};
+
+// Query config for client.query() / executeQuery(): named (prepared) unless disabled
+export function sql(name, values = []) {
+  const text = statements[name];
+  if (!text) {
+    throw new Error(`Unknown statement: ${name}`);
+  }
+  return PREPARED ? { name, text, values } : { text, values };
+}
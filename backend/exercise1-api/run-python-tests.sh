@@ -1,6 +1,22 @@
 #!/bin/bash
 
 # Exercise 1 API Python测试运行脚本
+#
+# 用法:
+#   ./run-python-tests.sh          # 测试真实服务器 (需要服务器和数据库)
+#   ./run-python-tests.sh --fake   # 使用本地替身服务器 (无需网络和PostgreSQL)
+#   REQUIRE_REPLICA=1 ./run-python-tests.sh   # 服务器没有配置只读副本时读副本隔离测试失败而不是跳过
+#                                             # (本地副本: cd .. && docker compose --profile replica up -d，见 README)
+#
+# 功能测试由 `exercise1 check` 并行执行，报告写入 test-reports/ 目录；
+# 头像存储测试和学员示例程序与之同时运行。命令行启动时间测试、提交风暴测试和读副本隔离测试对负载敏感，单独运行。
+
+TEST_ARGS=""
+if [ "$1" == "--fake" ]; then
+    TEST_ARGS="--fake"
+fi
+
+cd "$(dirname "$0")"
 
 echo "🐍 Exercise 1 API Python测试套件"
 echo "=================================="
@@ -17,20 +33,103 @@ if ! command -v pip3 &> /dev/null; then
     exit 1
 fi
 
-echo "📦 安装Python依赖..."
-pip3 install -r requirements.txt
+# 只有 requirements.txt 变化后才重新安装依赖
+STAMP_FILE=".python-deps.stamp"
+REQUIREMENTS_HASH=$(sha256sum requirements.txt | cut -d' ' -f1)
+if [ "$(cat $STAMP_FILE 2>/dev/null)" != "$REQUIREMENTS_HASH" ]; then
+    echo "📦 安装Python依赖..."
+    pip3 install -r requirements.txt && echo "$REQUIREMENTS_HASH" > $STAMP_FILE
+else
+    echo "📦 Python依赖未变化，跳过安装"
+fi
+
+REPORT_DIR="test-reports"
+
+# 耗时基线: 替身服务器使用仓库中的 test-baseline-fake.json；
+# 真实服务器使用 test-baseline.json，第一次运行时记录 (提交到仓库后供以后的运行比较)
+if [ -n "$TEST_ARGS" ]; then
+    BASELINE_ARGS="--baseline test-baseline-fake.json"
+elif [ -f test-baseline.json ]; then
+    BASELINE_ARGS="--baseline test-baseline.json"
+else
+    echo "📌 没有 test-baseline.json，本次运行记录耗时基线"
+    BASELINE_ARGS="--baseline test-baseline.json --update-baseline"
+fi
+mkdir -p $REPORT_DIR
+
+if [ -n "$TEST_ARGS" ]; then
+    FAKE_PORT=${FAKE_PORT:-3901}
+    python3 -m exercise1 fake --port $FAKE_PORT > $REPORT_DIR/fake-server.log 2>&1 &
+    FAKE_PID=$!
+    trap "kill $FAKE_PID 2>/dev/null" EXIT
+    sleep 1
+    EXAMPLE_API_BASE_URL="http://127.0.0.1:$FAKE_PORT/api"
+else
+    EXAMPLE_API_BASE_URL=${API_BASE_URL:-http://localhost:3001/api}
+fi
 
 echo ""
-echo "🧪 运行API测试..."
-python3 test-api.py
+echo "⏱️  运行命令行启动时间测试和离线规则测试..."
+FAILED_STARTUP=0
+python3 test-cli-startup.py || FAILED_STARTUP=1
+python3 test-avatar-audit.py || FAILED_STARTUP=1
+python3 test-scoring-rules.py || FAILED_STARTUP=1
+# replica.js 在管理后台 (backend/src/config/replica.js) 中有一份相同的副本
+if ! cmp -s replica.js ../backend/src/config/replica.js; then
+    echo "❌ replica.js 与 ../backend/src/config/replica.js 不一致，请同时修改两份"
+    FAILED_STARTUP=1
+fi
 
 echo ""
-echo "💾 运行头像存储测试..."
-python3 test-avatar-storage.py
+echo "🚀 并行运行测试..."
+python3 -m exercise1 check $TEST_ARGS $BASELINE_ARGS \
+    --json $REPORT_DIR/api-tests.json \
+    --junit $REPORT_DIR/api-tests.xml > $REPORT_DIR/api-tests.log 2>&1 &
+API_PID=$!
+
+python3 -m exercise1 audit storage $TEST_ARGS > $REPORT_DIR/avatar-storage.log 2>&1 &
+AVATAR_PID=$!
+
+API_BASE_URL="$EXAMPLE_API_BASE_URL" STUDENT_NAME="Python测试学员" \
+    python3 -m exercise1 submit > $REPORT_DIR/student-example.log 2>&1 &
+EXAMPLE_PID=$!
+
+FAILED=$FAILED_STARTUP
+for job in "API测试:$API_PID:api-tests" "头像存储测试:$AVATAR_PID:avatar-storage" "学员示例程序:$EXAMPLE_PID:student-example"; do
+    IFS=':' read -r title pid log <<< "$job"
+    wait $pid
+    status=$?
+    echo ""
+    echo "=== $title ==="
+    cat $REPORT_DIR/$log.log
+    if [ $status -ne 0 ]; then
+        echo "❌ $title 失败 (退出码 $status)"
+        FAILED=1
+    fi
+done
 
 echo ""
-echo "👤 运行学员示例程序..."
-STUDENT_NAME="Python测试学员" python3 student-example.py
+echo "🌩️  运行提交风暴测试..."
+if [ -n "$TEST_ARGS" ]; then
+    # 替身服务器: 关闭按IP限速 (所有写线程来自同一个IP)，调小并发配额，让写风暴到达并发限制并检查503
+    SUBMIT_RATE_PER_MINUTE=1000000 SUBMIT_BURST=1000000 SUBMIT_MAX_CONCURRENT=2 SUBMIT_MAX_QUEUE=4 \
+        python3 test-admission-burst.py $TEST_ARGS --writers 16 --require-shed \
+        --json $REPORT_DIR/admission-burst.json || FAILED=1
+else
+    python3 test-admission-burst.py --json $REPORT_DIR/admission-burst.json || FAILED=1
+fi
 
 echo ""
-echo "✅ 所有Python测试完成！"
\ No newline at end of file
+REPLICA_ARGS=""
+if [ -n "$REQUIRE_REPLICA" ]; then
+    REPLICA_ARGS="--require-replica"
+fi
+echo "📖 运行读副本隔离测试 (服务器没有配置只读副本时跳过)..."
+python3 test-replica-isolation.py $TEST_ARGS $REPLICA_ARGS --json $REPORT_DIR/replica-isolation.json || FAILED=1
+
+echo ""
+if [ $FAILED -ne 0 ]; then
+    echo "❌ 部分Python测试失败，详见 $REPORT_DIR/"
+    exit 1
+fi
+echo "✅ 所有Python测试完成！"
@@ -0,0 +1,65 @@
+// Declarative, versioned scoring rules for Exercise 1 submissions
+//
+// A rule set is a list of rules ordered by priority. Each rule constrains the three submission
+// features (has_ec2_info, has_elastic_ip, has_avatar) to true/false, or leaves them unconstrained
+// (null); the first matching rule gives the score. The active version lives in the
+// scoring_rules / scoring_rule_versions tables (migrate-scoring-rules.sql) and is cached for
+// `ttlMs`; exercise1/scoring_rules.json holds version 1 and is used until the tables can be read.
+// After `exercise1 rescore --activate`, submissions within one TTL may still use the old version.
+
+import { readFileSync } from 'fs';
+
+export const FEATURES = ['has_ec2_info', 'has_elastic_ip', 'has_avatar'];
+
+export const DEFAULT_RULESET = (() => {
+  const ruleset = JSON.parse(readFileSync(new URL('./exercise1/scoring_rules.json', import.meta.url), 'utf8'));
+  ruleset.rules.sort((a, b) => a.priority - b.priority);
+  return ruleset;
+})();
+
+export function submissionFeatures(ec2InstanceInfo, hasAvatar) {
+  return {
+    has_ec2_info: Boolean(ec2InstanceInfo.operatingSystem && ec2InstanceInfo.amiId &&
+      ec2InstanceInfo.internalIpAddress && ec2InstanceInfo.instanceType),
+    has_elastic_ip: Boolean(ec2InstanceInfo.elasticIpAddress && ec2InstanceInfo.elasticIpAddress.trim() !== ''),
+    has_avatar: Boolean(hasAvatar)
+  };
+}
+
+export function scoreFeatures(ruleset, features) {
+  const rule = ruleset.rules.find(candidate =>
+    FEATURES.every(name => candidate[name] === null || candidate[name] === features[name]));
+  return rule ? rule.score : 0;
+}
+
+// `loadRows` returns the active rule rows ordered by priority (empty when no version is active)
+export function scoringRules({ loadRows, ttlMs }) {
+  let cached = { ruleset: DEFAULT_RULESET, loadedAt: 0 };
+  let refreshing = null;
+
+  async function refresh() {
+    try {
+      const rows = await loadRows();
+      if (rows.length > 0) {
+        cached = { ruleset: { version: rows[0].version, rules: rows }, loadedAt: Date.now() };
+      } else {
+        cached = { ...cached, loadedAt: Date.now() };
+      }
+    } catch (error) {
+      // Keep scoring with the last known rules and retry after another ttlMs, so a database outage
+      // does not turn every submission into a failed rules query
+      console.error('Failed to load scoring rules:', error.message);
+      cached = { ...cached, loadedAt: Date.now() };
+    } finally {
+      refreshing = null;
+    }
+  }
+
+  return async function currentRules() {
+    if (Date.now() - cached.loadedAt >= ttlMs) {
+      refreshing = refreshing || refresh();
+      await refreshing;
+    }
+    return cached.ruleset;
+  };
+}
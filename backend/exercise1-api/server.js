@@ -1,11 +1,16 @@
 import express from 'express';
 import cors from 'cors';
 import helmet from 'helmet';
+import compression from 'compression';
 import morgan from 'morgan';
 import multer from 'multer';
 import { Pool } from 'pg';
 import Joi from 'joi';
 import dotenv from 'dotenv';
+import { concurrencyLimit, rateLimit } from './admission.js';
+import { sql } from './queries.js';
+import { scoringRules, scoreFeatures, submissionFeatures } from './scoring.js';
+import { readRouter } from './replica.js';
 
 // Load environment variables
 dotenv.config();
@@ -13,6 +18,11 @@ dotenv.config();
 const app = express();
 const PORT = process.env.PORT || 3001;
 
+// Request bodies may be gzip/deflate encoded; the limit applies to the decompressed size
+const REQUEST_BODY_LIMIT = process.env.REQUEST_BODY_LIMIT || '10mb';
+// Responses smaller than this are sent uncompressed
+const COMPRESSION_THRESHOLD = process.env.COMPRESSION_THRESHOLD || '1kb';
+
 // Database connection using existing database
 const pool = new Pool({
   host: process.env.DB_HOST || 'localhost',
@@ -25,6 +35,72 @@ const pool = new Pool({
   connectionTimeoutMillis: 2000,
 });
 
+function envInt(name, fallback) {
+  const value = parseInt(process.env[name] || '', 10);
+  return Number.isNaN(value) ? fallback : value;
+}
+
+// Optional read-only streaming replica for rankings, statistics and submission history;
+// unset DB_READ_* settings fall back to the primary's
+const replicaPool = process.env.DB_READ_HOST ? new Pool({
+  host: process.env.DB_READ_HOST,
+  port: parseInt(process.env.DB_READ_PORT || process.env.DB_PORT || '5432'),
+  database: process.env.DB_READ_NAME || process.env.DB_NAME || 'hands_on_training',
+  user: process.env.DB_READ_USER || process.env.DB_USER || 'postgres',
+  password: process.env.DB_READ_PASSWORD || process.env.DB_PASSWORD || 'postgres',
+  max: envInt('DB_READ_POOL_MAX', 20),
+  idleTimeoutMillis: 30000,
+  connectionTimeoutMillis: 2000,
+}) : null;
+
+const REPLICA_MAX_LAG_MS = envInt('DB_READ_MAX_LAG_MS', 1000);
+const REPLICA_CHECK_INTERVAL_MS = envInt('DB_READ_LAG_CHECK_MS', 1000);
+const readRouting = readRouter({
+  primary: pool,
+  replica: replicaPool,
+  maxLagMs: REPLICA_MAX_LAG_MS,
+  checkIntervalMs: REPLICA_CHECK_INTERVAL_MS,
+  // Long enough for a write to reach a replica that is within the lag tolerance
+  readYourWritesMs: envInt('DB_READ_YOUR_WRITES_MS', REPLICA_MAX_LAG_MS + 2 * REPLICA_CHECK_INTERVAL_MS)
+});
+
+// Admission control: the three concurrency groups together never need more than the 20 pool
+// connections, so a burst of submissions is queued or shed here (fast 503/429 with Retry-After)
+// instead of timing out in pool.connect() and stalling reads. With a read replica (DB_READ_HOST)
+// the read group mostly uses the replica pool instead.
+const QUEUE_TIMEOUT_MS = envInt('ADMISSION_QUEUE_TIMEOUT_MS', 1500);
+const admission = {
+  submissions: concurrencyLimit({
+    name: 'submission',
+    maxConcurrent: envInt('SUBMIT_MAX_CONCURRENT', 8),
+    maxQueue: envInt('SUBMIT_MAX_QUEUE', 40),
+    queueTimeoutMs: QUEUE_TIMEOUT_MS
+  }),
+  registrations: concurrencyLimit({
+    name: 'registration',
+    maxConcurrent: envInt('REGISTER_MAX_CONCURRENT', 4),
+    maxQueue: envInt('REGISTER_MAX_QUEUE', 20),
+    queueTimeoutMs: QUEUE_TIMEOUT_MS
+  }),
+  reads: concurrencyLimit({
+    name: 'read',
+    maxConcurrent: envInt('READ_MAX_CONCURRENT', 8),
+    maxQueue: envInt('READ_MAX_QUEUE', 100),
+    queueTimeoutMs: QUEUE_TIMEOUT_MS
+  }),
+  submitRate: rateLimit({
+    name: 'submission',
+    ratePerMinute: envInt('SUBMIT_RATE_PER_MINUTE', 120),
+    burst: envInt('SUBMIT_BURST', 60)
+  })
+};
+
+// Active scoring rules, re-read from the database at most once per SCORING_RULES_TTL_MS
+const currentScoringRules = scoringRules({
+  loadRows: () => executeQuery(sql('activeScoringRules')),
+  ttlMs: envInt('SCORING_RULES_TTL_MS', 30000)
+});
+
 // Configure multer for avatar uploads
 const upload = multer({
   storage: multer.memoryStorage(),
@@ -51,16 +127,20 @@ app.use(cors({
   credentials: true
 }));
 app.use(morgan('combined'));
-app.use(express.json({ limit: '10mb' }));
-app.use(express.urlencoded({ extended: true, limit: '10mb' }));
+app.use(compression({ threshold: COMPRESSION_THRESHOLD }));
+// Reject over-rate clients before their bodies are read and parsed
+app.post(['/api/auth/student/register', '/api/submissions/exercise1'], admission.submitRate);
+app.use(express.json({ limit: REQUEST_BODY_LIMIT, inflate: true }));
+app.use(express.urlencoded({ extended: true, limit: REQUEST_BODY_LIMIT, inflate: true }));
 
 // Utility functions
 function generateAccessKey() {
   return Math.random().toString(36).substring(2, 15) + Math.random().toString(36).substring(2, 15);
 }
 
-async function executeQuery(query, params = []) {
-  const client = await pool.connect();
+// `query` is either SQL text or a catalog statement from sql(name, values)
+async function executeQuery(query, params, target = pool) {
+  const client = await target.connect();
   try {
     const result = await client.query(query, params);
     return result.rows;
@@ -69,6 +149,34 @@ async function executeQuery(query, params = []) {
   }
 }
 
+// Read that may be served by the replica; `studentKey` (access key) pins a student who just
+// wrote to the primary
+function readQuery(query, studentKey = null) {
+  return readRouting.query(target => executeQuery(query, undefined, target), studentKey);
+}
+
+async function withTransaction(callback) {
+  const client = await pool.connect();
+  let broken;
+  try {
+    await client.query('BEGIN');
+    const result = await callback(client);
+    await client.query('COMMIT');
+    return result;
+  } catch (error) {
+    try {
+      await client.query('ROLLBACK');
+    } catch (rollbackError) {
+      // Keep the original error; a connection that cannot roll back is discarded on release
+      console.error('Rollback failed:', rollbackError.message);
+      broken = rollbackError;
+    }
+    throw error;
+  } finally {
+    client.release(broken);
+  }
+}
+
 // Validation schemas
 const studentRegistrationSchema = Joi.object({
   name: Joi.string().required().min(1).max(100).trim()
@@ -99,10 +207,17 @@ const submissionWithAvatarSchema = Joi.object({
 
 // Health check endpoint
 app.get('/health', (req, res) => {
+  const { user, system } = process.cpuUsage();
   res.json({ 
     status: 'OK', 
     timestamp: new Date().toISOString(),
-    message: 'Exercise 1 API Server is running'
+    message: 'Exercise 1 API Server is running',
+    // Cumulative process CPU time, sampled by `exercise1 bench` to measure the server-side cost
+    cpuMs: (user + system) / 1000,
+    admission: Object.fromEntries(
+      Object.entries(admission).map(([group, limiter]) => [group, limiter.stats()])
+    ),
+    replica: readRouting.stats()
   });
 });
 
@@ -124,7 +239,7 @@ app.get('/api', (req, res) => {
 });
 
 // Student registration
-app.post('/api/auth/student/register', async (req, res) => {
+app.post('/api/auth/student/register', admission.registrations, async (req, res) => {
   try {
     console.log('Student registration request:', req.body);
 
@@ -140,8 +255,7 @@ app.post('/api/auth/student/register', async (req, res) => {
     const { name } = value;
 
     // Check if student already exists
-    const existingQuery = 'SELECT * FROM students WHERE LOWER(name) = LOWER($1)';
-    const existingRows = await executeQuery(existingQuery, [name]);
+    const existingRows = await executeQuery(sql('studentByName', [name]));
     
     if (existingRows.length > 0) {
       const student = existingRows[0];
@@ -166,20 +280,14 @@ app.post('/api/auth/student/register', async (req, res) => {
       if (attempts > 10) {
         throw new Error('Unable to generate unique access key');
       }
-      const checkQuery = 'SELECT id FROM students WHERE access_key = $1';
-      const checkRows = await executeQuery(checkQuery, [accessKey]);
+      const checkRows = await executeQuery(sql('accessKeyExists', [accessKey]));
       if (checkRows.length === 0) break;
     } while (true);
 
     // Create new student
-    const insertQuery = `
-      INSERT INTO students (name, access_key)
-      VALUES ($1, $2)
-      RETURNING id, name, access_key, registered_at
-    `;
-    
-    const rows = await executeQuery(insertQuery, [name, accessKey]);
+    const rows = await executeQuery(sql('insertStudent', [name, accessKey]));
     const student = rows[0];
+    readRouting.noteWrite(student.access_key);
 
     res.status(201).json({
       success: true,
@@ -203,7 +311,7 @@ app.post('/api/auth/student/register', async (req, res) => {
 });
 
 // Access key lookup
-app.get('/api/auth/student/lookup/:name', async (req, res) => {
+app.get('/api/auth/student/lookup/:name', admission.reads, async (req, res) => {
   try {
     const name = req.params.name?.trim();
     
@@ -217,8 +325,7 @@ app.get('/api/auth/student/lookup/:name', async (req, res) => {
     console.log('Access key lookup for:', name);
 
     // Find student by name
-    const query = 'SELECT * FROM students WHERE LOWER(name) = LOWER($1)';
-    const rows = await executeQuery(query, [name]);
+    const rows = await executeQuery(sql('studentByName', [name]));
     
     if (rows.length === 0) {
       return res.status(404).json({
@@ -231,8 +338,7 @@ app.get('/api/auth/student/lookup/:name', async (req, res) => {
     const student = rows[0];
 
     // Update last active time
-    const updateQuery = 'UPDATE students SET last_active_at = CURRENT_TIMESTAMP WHERE id = $1';
-    await executeQuery(updateQuery, [student.id]);
+    await executeQuery(sql('touchStudent', [student.id]));
 
     res.json({
       success: true,
@@ -255,7 +361,7 @@ app.get('/api/auth/student/lookup/:name', async (req, res) => {
 });
 
 // Exercise 1 submission with avatar upload support
-app.post('/api/submissions/exercise1', upload.single('avatar'), async (req, res) => {
+app.post('/api/submissions/exercise1', admission.submissions, upload.single('avatar'), async (req, res) => {
   try {
     // Get client IP address
     const clientIp = req.ip || 
@@ -314,18 +420,12 @@ app.post('/api/submissions/exercise1', upload.single('avatar'), async (req, res)
 
     // Find or create student by name
     let student;
-    const studentQuery = 'SELECT * FROM students WHERE LOWER(name) = LOWER($1)';
-    const studentRows = await executeQuery(studentQuery, [studentName]);
+    const studentRows = await executeQuery(sql('studentByName', [studentName]));
     
     if (studentRows.length === 0) {
       // Create new student if not exists
       const accessKey = generateAccessKey();
-      const insertQuery = `
-        INSERT INTO students (name, access_key)
-        VALUES ($1, $2)
-        RETURNING id, name, access_key, registered_at
-      `;
-      const newStudentRows = await executeQuery(insertQuery, [studentName, accessKey]);
+      const newStudentRows = await executeQuery(sql('insertStudent', [studentName, accessKey]));
       student = newStudentRows[0];
     } else {
       student = studentRows[0];
@@ -333,19 +433,13 @@ app.post('/api/submissions/exercise1', upload.single('avatar'), async (req, res)
 
     // Get or create exercise 1
     let exerciseId;
-    const exerciseQuery = "SELECT id FROM exercises WHERE title = 'Hands-on Exercise 1'";
-    const exerciseRows = await executeQuery(exerciseQuery);
+    const exerciseRows = await executeQuery(sql('exerciseByTitle', ['Hands-on Exercise 1']));
     
     if (exerciseRows.length > 0) {
       exerciseId = exerciseRows[0].id;
     } else {
       // Create default exercise 1
-      const createExerciseQuery = `
-        INSERT INTO exercises (title, description, requirements, difficulty, max_score, is_published, created_by)
-        VALUES ($1, $2, $3, $4, $5, $6, $7)
-        RETURNING id
-      `;
-      const newExerciseRows = await executeQuery(createExerciseQuery, [
+      const newExerciseRows = await executeQuery(sql('insertExercise', [
         'Hands-on Exercise 1',
         'Submit EC2 instance information via API call',
         'Develop a local program that calls the submission API with student information and EC2 instance details',
@@ -353,67 +447,50 @@ app.post('/api/submissions/exercise1', upload.single('avatar'), async (req, res)
         100,
         true,
         'system'
-      ]);
+      ]));
       exerciseId = newExerciseRows[0].id;
     }
 
-    // Calculate score based on completion criteria
-    let score = 0;
-    const hasAllRequiredEC2Info = ec2InstanceInfo.operatingSystem && 
-                                 ec2InstanceInfo.amiId && 
-                                 ec2InstanceInfo.internalIpAddress && 
-                                 ec2InstanceInfo.instanceType;
-    
-    const hasElasticIP = ec2InstanceInfo.elasticIpAddress && ec2InstanceInfo.elasticIpAddress.trim() !== '';
-    
-    if (hasAllRequiredEC2Info && hasElasticIP && avatarData) {
-      score = 100; // Full score for all EC2 info + elastic IP + avatar
-    } else if (hasAllRequiredEC2Info && hasElasticIP) {
-      score = 90; // High score for all EC2 info + elastic IP but no avatar
-    } else if (hasAllRequiredEC2Info && avatarData) {
-      score = 85; // Good score for all required EC2 info + avatar but no elastic IP
-    } else if (hasAllRequiredEC2Info) {
-      score = 80; // Good score for all required EC2 info only
-    } else if (avatarData) {
-      score = 60; // Partial score for avatar but incomplete EC2 data
-    } else {
-      score = 40; // Lower score for incomplete data and no avatar
-    }
-
-    // Create submission record with current timestamp
-    const submissionQuery = `
-      INSERT INTO submissions (
-        student_id, exercise_id, client_ip_address, 
-        operating_system, ami_id, internal_ip_address, elastic_ip_address, instance_type,
-        screenshot_data, screenshot_filename, screenshot_mimetype, screenshot_size,
-        score, processing_status, submitted_at
-      )
-      VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9, $10, $11, $12, $13, $14, CURRENT_TIMESTAMP)
-      RETURNING id, submitted_at
-    `;
-    
-    const submissionRows = await executeQuery(submissionQuery, [
-      student.id,
-      exerciseId,
-      clientIp,
-      ec2InstanceInfo.operatingSystem,
-      ec2InstanceInfo.amiId,
-      ec2InstanceInfo.internalIpAddress,
-      ec2InstanceInfo.elasticIpAddress || null,
-      ec2InstanceInfo.instanceType,
-      avatarData,
-      avatarFilename,
-      avatarMimetype,
-      avatarSize,
-      score,
-      'processed'
-    ]);
-
-    const submission = submissionRows[0];
-
-    // Update student's last active time
-    const updateStudentQuery = 'UPDATE students SET last_active_at = CURRENT_TIMESTAMP WHERE id = $1';
-    await executeQuery(updateStudentQuery, [student.id]);
+    // Score with the active rule set (scoring_rules table, cached)
+    const score = scoreFeatures(await currentScoringRules(),
+      submissionFeatures(ec2InstanceInfo, avatarData !== null));
+
+    // Create submission record and update the student's summary row in one transaction
+    const submission = await withTransaction(async (client) => {
+      // Upserting the summary row locks it, so concurrent submissions by the same student serialize here
+      await client.query(sql('lockStudentSummary', [student.id]));
+
+      const previousBestResult = await client.query(sql('previousBestScore', [student.id, exerciseId]));
+      const previousBest = previousBestResult.rows[0].best_score;
+
+      const submissionResult = await client.query(sql('insertSubmission', [
+        student.id,
+        exerciseId,
+        clientIp,
+        ec2InstanceInfo.operatingSystem,
+        ec2InstanceInfo.amiId,
+        ec2InstanceInfo.internalIpAddress,
+        ec2InstanceInfo.elasticIpAddress || null,
+        ec2InstanceInfo.instanceType,
+        avatarData,
+        avatarFilename,
+        avatarMimetype,
+        avatarSize,
+        score,
+        'processed'
+      ]));
+      const inserted = submissionResult.rows[0];
+
+      await client.query(sql('addToStudentSummary', [
+        student.id, score, Math.max(score - previousBest, 0), inserted.submitted_at
+      ]));
+
+      // Update student's last active time
+      await client.query(sql('touchStudent', [student.id]));
+
+      return inserted;
+    });
+    readRouting.noteWrite(student.access_key);
 
     // Return success response
     res.status(201).json({
@@ -444,13 +521,12 @@ app.post('/api/submissions/exercise1', upload.single('avatar'), async (req, res)
 });
 
 // Get student submissions
-app.get('/api/submissions/student/:accessKey', async (req, res) => {
+app.get('/api/submissions/student/:accessKey', admission.reads, async (req, res) => {
   try {
     const { accessKey } = req.params;
 
     // Find student by access key
-    const studentQuery = 'SELECT * FROM students WHERE access_key = $1';
-    const studentRows = await executeQuery(studentQuery, [accessKey]);
+    const studentRows = await readQuery(sql('studentByAccessKey', [accessKey]), accessKey);
     
     if (studentRows.length === 0) {
       return res.status(404).json({
@@ -461,15 +537,8 @@ app.get('/api/submissions/student/:accessKey', async (req, res) => {
 
     const student = studentRows[0];
 
-    // Get all submissions for this student
-    const submissionsQuery = `
-      SELECT s.*, e.title as exercise_title
-      FROM submissions s
-      LEFT JOIN exercises e ON s.exercise_id = e.id
-      WHERE s.student_id = $1
-      ORDER BY s.submitted_at DESC
-    `;
-    const submissionRows = await executeQuery(submissionsQuery, [student.id]);
+    // Get all submissions for this student (without the avatar blobs)
+    const submissionRows = await readQuery(sql('submissionsByStudent', [student.id]), accessKey);
 
     res.json({
       success: true,
@@ -492,7 +561,7 @@ app.get('/api/submissions/student/:accessKey', async (req, res) => {
           elasticIpAddress: sub.elastic_ip_address,
           instanceType: sub.instance_type
         },
-        avatarInfo: sub.screenshot_data ? {
+        avatarInfo: sub.has_avatar ? {
           filename: sub.screenshot_filename,
           size: sub.screenshot_size,
           mimetype: sub.screenshot_mimetype,
@@ -512,41 +581,11 @@ app.get('/api/submissions/student/:accessKey', async (req, res) => {
 });
 
 // Get rankings
-app.get('/api/statistics/rankings', async (req, res) => {
+app.get('/api/statistics/rankings', admission.reads, async (req, res) => {
   try {
     console.log('Fetching rankings');
 
-    const rankingsQuery = `
-      WITH student_stats AS (
-        SELECT 
-          s.id as student_id,
-          s.name as student_name,
-          COALESCE(SUM(best_scores.score), 0) as total_score,
-          COUNT(best_scores.exercise_id) as completed_exercises,
-          MAX(best_scores.submitted_at) as last_submission_at
-        FROM students s
-        LEFT JOIN (
-          SELECT DISTINCT ON (student_id, exercise_id)
-            student_id, exercise_id, score, submitted_at
-          FROM submissions
-          WHERE processing_status = 'processed'
-          ORDER BY student_id, exercise_id, score DESC, submitted_at ASC
-        ) best_scores ON s.id = best_scores.student_id
-        GROUP BY s.id, s.name
-      )
-      SELECT 
-        student_id,
-        student_name,
-        total_score,
-        completed_exercises,
-        0 as average_completion_time,
-        last_submission_at,
-        RANK() OVER (ORDER BY total_score DESC, last_submission_at ASC) as rank
-      FROM student_stats
-      ORDER BY rank ASC
-    `;
-    
-    const rows = await executeQuery(rankingsQuery);
+    const rows = await readQuery(sql('rankings'));
 
     res.json({
       success: true,
@@ -573,19 +612,14 @@ app.get('/api/statistics/rankings', async (req, res) => {
 });
 
 // Get avatar image
-app.get('/api/submissions/:submissionId/avatar', async (req, res) => {
+app.get('/api/submissions/:submissionId/avatar', admission.reads, async (req, res) => {
   try {
     const { submissionId } = req.params;
 
     console.log('Fetching avatar for submission:', submissionId);
 
     // Get submission with avatar data
-    const query = `
-      SELECT screenshot_data, screenshot_filename, screenshot_mimetype
-      FROM submissions 
-      WHERE id = $1 AND screenshot_data IS NOT NULL
-    `;
-    const rows = await executeQuery(query, [submissionId]);
+    const rows = await executeQuery(sql('avatarBySubmission', [submissionId]));
     
     if (rows.length === 0) {
       return res.status(404).json({
@@ -615,15 +649,14 @@ app.get('/api/submissions/:submissionId/avatar', async (req, res) => {
 });
 
 // Get student statistics
-app.get('/api/statistics/student/:accessKey', async (req, res) => {
+app.get('/api/statistics/student/:accessKey', admission.reads, async (req, res) => {
   try {
     const { accessKey } = req.params;
 
     console.log('Fetching student statistics for:', accessKey);
 
-    // Find student by access key
-    const studentQuery = 'SELECT * FROM students WHERE access_key = $1';
-    const studentRows = await executeQuery(studentQuery, [accessKey]);
+    // Student, pre-aggregated summary and rank in a single indexed lookup
+    const studentRows = await readQuery(sql('studentSummaryByAccessKey', [accessKey]), accessKey);
     
     if (studentRows.length === 0) {
       return res.status(404).json({
@@ -634,54 +667,15 @@ app.get('/api/statistics/student/:accessKey', async (req, res) => {
 
     const student = studentRows[0];
 
-    // Get student's submissions and statistics
-    const submissionsQuery = `
-      SELECT s.*, e.title as exercise_title
-      FROM submissions s
-      LEFT JOIN exercises e ON s.exercise_id = e.id
-      WHERE s.student_id = $1
-      ORDER BY s.submitted_at DESC
-    `;
-    const submissionRows = await executeQuery(submissionsQuery, [student.id]);
-
-    // Calculate statistics
-    const totalSubmissions = submissionRows.length;
-    const completedExercises = submissionRows.filter(sub => sub.score > 0).length;
-    const totalScore = submissionRows.reduce((sum, sub) => sum + sub.score, 0);
+    // Submission history without the avatar blobs
+    const submissionRows = await readQuery(sql('submissionsByStudent', [student.id]), accessKey);
+
+    const totalSubmissions = student.total_submissions;
+    const completedExercises = student.completed_submissions;
+    const totalScore = parseInt(student.total_score, 10);
     const averageScore = totalSubmissions > 0 ? totalScore / totalSubmissions : 0;
-    const highestScore = Math.max(...submissionRows.map(sub => sub.score), 0);
-
-    // Get total exercises count
-    const exerciseCountQuery = 'SELECT COUNT(*) as count FROM exercises WHERE is_published = true';
-    const exerciseCountRows = await executeQuery(exerciseCountQuery);
-    const totalExercises = parseInt(exerciseCountRows[0].count, 10);
-
-    // Calculate rank
-    const rankQuery = `
-      WITH rankings AS (
-        SELECT 
-          s.id as student_id,
-          COALESCE(SUM(best_scores.score), 0) as total_score,
-          RANK() OVER (ORDER BY COALESCE(SUM(best_scores.score), 0) DESC) as rank
-        FROM students s
-        LEFT JOIN (
-          SELECT DISTINCT ON (student_id, exercise_id)
-            student_id, exercise_id, score
-          FROM submissions
-          WHERE processing_status = 'processed'
-          ORDER BY student_id, exercise_id, score DESC, submitted_at ASC
-        ) best_scores ON s.id = best_scores.student_id
-        GROUP BY s.id
-      )
-      SELECT 
-        rank,
-        (SELECT COUNT(*) FROM students) as total_participants
-      FROM rankings
-      WHERE student_id = $1
-    `;
-    
-    const rankRows = await executeQuery(rankQuery, [student.id]);
-    const rankInfo = rankRows.length > 0 ? rankRows[0] : { rank: null, total_participants: 0 };
+    const highestScore = student.highest_score;
+    const totalExercises = parseInt(student.total_exercises, 10);
 
     res.json({
       success: true,
@@ -699,8 +693,8 @@ app.get('/api/statistics/student/:accessKey', async (req, res) => {
         totalScore: totalScore,
         averageScore: averageScore,
         highestScore: highestScore,
-        currentRank: rankInfo.rank,
-        totalParticipants: parseInt(rankInfo.total_participants, 10)
+        currentRank: student.rank,
+        totalParticipants: parseInt(student.total_participants, 10)
       },
       submissions: submissionRows.map(sub => ({
         id: sub.id,
@@ -716,7 +710,7 @@ app.get('/api/statistics/student/:accessKey', async (req, res) => {
           elasticIpAddress: sub.elastic_ip_address,
           instanceType: sub.instance_type
         },
-        avatarInfo: sub.screenshot_data ? {
+        avatarInfo: sub.has_avatar ? {
           filename: sub.screenshot_filename,
           size: sub.screenshot_size,
           mimetype: sub.screenshot_mimetype,
@@ -742,6 +736,14 @@ app.get('/api/statistics/student/:accessKey', async (req, res) => {
 
 // Error handling middleware
 app.use((err, req, res, next) => {
+  // Body parser errors (oversized or undecodable bodies) carry their own 4xx status
+  if (err.type && err.status >= 400 && err.status < 500) {
+    return res.status(err.status).json({
+      error: 'Invalid request body',
+      message: err.message
+    });
+  }
+
   console.error(err.stack);
   res.status(500).json({ 
     error: 'Something went wrong!',
@@ -766,11 +768,43 @@ pool.on('error', (err) => {
   console.error('Database connection error:', err);
 });
 
+replicaPool?.on('error', (err) => {
+  console.error('Replica connection error:', err);
+});
+
+// Monthly submissions partitions (migrate-partition-submissions.sql): create the coming months'
+// partitions at startup and then daily, so new rows do not pile up in submissions_default when
+// `exercise1 retention` is not run
+const PARTITION_CHECK_INTERVAL_MS = envInt('PARTITION_CHECK_INTERVAL_MS', 24 * 60 * 60 * 1000);
+
+async function ensureSubmissionPartitions() {
+  try {
+    const rows = await executeQuery('SELECT ensure_submission_partitions() AS created');
+    if (rows[0].created > 0) {
+      console.log(`📅 Created ${rows[0].created} submissions partition(s)`);
+    }
+  } catch (error) {
+    if (error.code === '42883') {
+      // undefined_function: submissions is not partitioned, nothing to maintain
+      clearInterval(partitionTimer);
+      return;
+    }
+    console.error('Failed to create submissions partitions:', error.message);
+  }
+}
+
+const partitionTimer = setInterval(ensureSubmissionPartitions, PARTITION_CHECK_INTERVAL_MS);
+partitionTimer.unref();
+ensureSubmissionPartitions();
+
 // Start server
 app.listen(PORT, () => {
   console.log(`🚀 Exercise 1 API Server running on port ${PORT}`);
   console.log(`📋 API Documentation: http://localhost:${PORT}/api`);
   console.log(`🏥 Health Check: http://localhost:${PORT}/health`);
+  if (replicaPool) {
+    console.log(`📖 Read replica: ${process.env.DB_READ_HOST} (max lag ${REPLICA_MAX_LAG_MS}ms)`);
+  }
   console.log('\n📚 Available Endpoints:');
   console.log('   POST /api/auth/student/register');
   console.log('   GET  /api/auth/student/lookup/:name');
@@ -785,13 +819,13 @@ app.listen(PORT, () => {
 // Graceful shutdown
 process.on('SIGINT', async () => {
   console.log('Closing database connections...');
-  await pool.end();
+  await Promise.all([pool.end(), readRouting.close()]);
   process.exit(0);
 });
 
 process.on('SIGTERM', async () => {
   console.log('Closing database connections...');
-  await pool.end();
+  await Promise.all([pool.end(), readRouting.close()]);
   process.exit(0);
 });
 
@@ -0,0 +1,16 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+提交风暴测试 (Python版本)
+
+等同于 `exercise1 burst`: 大量并发提交时，读请求 p99 保持有界，被拒绝的提交都带 Retry-After。
+实现位于 exercise1/burst.py。
+"""
+
+import sys
+
+from exercise1.cli import main
+
+if __name__ == '__main__':
+    sys.exit(main(['burst'] + sys.argv[1:]))
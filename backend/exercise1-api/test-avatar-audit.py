@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+头像审计规则测试 (Python版本)
+
+离线校验 `exercise1 audit avatars` 的格式识别、截断判断和修正规则，无需服务器和数据库。
+"""
+
+import base64
+import sys
+
+from exercise1.avatar_audit import inspect_batch, repairs_for, sniff_image
+from exercise1.cases import TEST_AVATAR_BASE64
+
+PNG = base64.b64decode(TEST_AVATAR_BASE64)
+JPEG = b'\xff\xd8\xff\xe0' + b'\x00' * 16 + b'\xff\xd9'
+GIF = b'GIF89a' + b'\x00' * 16 + b'\x3b'
+WEBP = b'RIFF' + (12).to_bytes(4, 'little') + b'WEBPVP8 ' + b'\x00' * 4
+
+
+def test_sniff_image() -> bool:
+    print('=== 检查格式识别和截断判断 ===')
+    expectations = [
+        ('完整PNG', PNG, ('image/png', False)),
+        ('截断PNG', PNG[:-6], ('image/png', True)),
+        ('完整JPEG', JPEG, ('image/jpeg', False)),
+        ('截断JPEG', JPEG[:-2], ('image/jpeg', True)),
+        ('完整GIF', GIF, ('image/gif', False)),
+        ('完整WebP', WEBP, ('image/webp', False)),
+        ('截断WebP', WEBP[:-2], ('image/webp', True)),
+        ('未知格式', b'not an image', (None, False)),
+    ]
+    ok = True
+    for title, data, expected in expectations:
+        actual = sniff_image(data)
+        if actual != expected:
+            print(f'❌ {title}: 期望 {expected}，实际 {actual}')
+            ok = False
+    if ok:
+        print('✅ 格式识别和截断判断正确')
+    return ok
+
+
+def test_inspect_and_repair() -> bool:
+    print('=== 检查问题分类和修正规则 ===')
+    rows = [
+        ('00000000-0000-0000-0000-000000000001', PNG, len(PNG), 'image/png'),
+        ('00000000-0000-0000-0000-000000000002', PNG, len(PNG) + 1, 'image/png'),
+        ('00000000-0000-0000-0000-000000000003', JPEG, len(JPEG), 'image/png'),
+        ('00000000-0000-0000-0000-000000000004', PNG[:-6], len(PNG) - 6, 'image/png'),
+        # 截断且记录的大小不一致: 记录的大小是丢失了多少数据的依据，不能被覆盖
+        ('00000000-0000-0000-0000-000000000005', PNG[:-6], len(PNG), 'image/png'),
+        ('00000000-0000-0000-0000-000000000006', b'not an image', 99, 'image/png'),
+    ]
+    issues = [result['issues'] for result in inspect_batch(rows)]
+    expected_issues = [[], ['size_mismatch'], ['mimetype_mismatch'], ['truncated'],
+                       ['truncated', 'size_mismatch'], ['size_mismatch', 'unknown_format']]
+    repairs = repairs_for(inspect_batch(rows))
+    expected_repairs = [
+        ('00000000-0000-0000-0000-000000000002', len(PNG), 'image/png'),
+        ('00000000-0000-0000-0000-000000000003', len(JPEG), 'image/jpeg'),
+    ]
+
+    ok = True
+    if issues != expected_issues:
+        print(f'❌ 问题分类: 期望 {expected_issues}，实际 {issues}')
+        ok = False
+    if repairs != expected_repairs:
+        print(f'❌ 修正内容: 期望 {expected_repairs}，实际 {repairs}')
+        ok = False
+    if ok:
+        print('✅ 问题分类和修正规则正确 (截断和无法识别的数据不会被修正)')
+    return ok
+
+
+if __name__ == '__main__':
+    results = [test_sniff_image(), test_inspect_and_repair()]
+    sys.exit(0 if all(results) else 1)
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+exercise1 命令行启动时间测试 (Python版本)
+
+1. `exercise1 --help` 不能导入 requests、psycopg2 等重量级依赖
+2. `exercise1 --help` 比空解释器启动多出的时间不能超过预算 (默认 50ms，
+   可用 EXERCISE1_HELP_BUDGET_MS 环境变量调整)
+"""
+
+import os
+import subprocess
+import sys
+import time
+
+BUDGET_MS = float(os.getenv('EXERCISE1_HELP_BUDGET_MS', '50'))
+RUNS = 7
+
+# --help 时不允许加载的模块
+HEAVY_MODULES = (
+    'requests', 'urllib3', 'psycopg2', 'numpy', 'sqlite3', 'http.server',
+    'concurrent.futures', 'xml.etree.ElementTree', 'dataclasses',
+    'exercise1.api', 'exercise1.client', 'exercise1.cases', 'exercise1.fake_server'
+)
+
+LIST_MODULES_SCRIPT = """
+import sys
+from exercise1.cli import main
+try:
+    main(['--help'])
+except SystemExit:
+    pass
+print('\\n'.join(sorted(sys.modules)))
+"""
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+
+def fastest_run_ms(command) -> float:
+    """多次运行取最短耗时，减少系统抖动的影响"""
+    timings = []
+    for _ in range(RUNS):
+        start = time.perf_counter()
+        subprocess.run(command, cwd=HERE, stdout=subprocess.DEVNULL, check=True)
+        timings.append((time.perf_counter() - start) * 1000)
+    return min(timings)
+
+
+def test_help_does_not_import_heavy_modules() -> bool:
+    print('=== 检查 --help 加载的模块 ===')
+    result = subprocess.run([sys.executable, '-c', LIST_MODULES_SCRIPT], cwd=HERE,
+                            capture_output=True, text=True, check=True)
+    loaded = set(result.stdout.split())
+    leaked = [module for module in HEAVY_MODULES if module in loaded]
+    if leaked:
+        print(f"❌ --help 加载了不应加载的模块: {', '.join(leaked)}")
+        return False
+    print('✅ --help 没有加载重量级依赖')
+    return True
+
+
+def test_help_startup_budget() -> bool:
+    print('=== 检查 --help 启动时间 ===')
+    interpreter_ms = fastest_run_ms([sys.executable, '-c', 'pass'])
+    help_ms = fastest_run_ms([sys.executable, '-m', 'exercise1', '--help'])
+    overhead_ms = help_ms - interpreter_ms
+    print(f'   空解释器: {interpreter_ms:.1f}ms')
+    print(f'   exercise1 --help: {help_ms:.1f}ms (额外 {overhead_ms:.1f}ms, 预算 {BUDGET_MS:.0f}ms)')
+    if overhead_ms > BUDGET_MS:
+        print('❌ 启动时间超出预算')
+        return False
+    print('✅ 启动时间在预算之内')
+    return True
+
+
+if __name__ == '__main__':
+    results = [test_help_does_not_import_heavy_modules(), test_help_startup_budget()]
+    sys.exit(0 if all(results) else 1)
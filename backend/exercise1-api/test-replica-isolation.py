@@ -0,0 +1,16 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+读副本隔离测试 (Python版本)
+
+等同于 `exercise1 replica-load`: 排名和统计的读负载转到只读副本时，提交 p99 保持不变，
+学员提交后立即读到自己的提交。服务器没有配置副本时跳过。实现位于 exercise1/replica_load.py。
+"""
+
+import sys
+
+from exercise1.cli import main
+
+if __name__ == '__main__':
+    sys.exit(main(['replica-load'] + sys.argv[1:]))
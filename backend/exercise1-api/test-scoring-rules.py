@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+评分规则测试 (Python版本)
+
+离线检查 scoring_rules.json 与原先的评分结果 (100/90/85/80/60/40) 一致，
+migrate-scoring-rules.sql 的初始规则、server.js 使用的 scoring.js 与其一致，
+以及 `exercise1 rescore` 的向量化评分与逐行评分结果相同。无需服务器和数据库。
+"""
+
+import itertools
+import json
+import os
+import random
+import re
+import shutil
+import subprocess
+import sys
+
+from exercise1.scoring import FEATURES, load_default_rules, score_features
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+# (has_ec2_info, has_elastic_ip, has_avatar) -> 原先提交接口中 if 链的分数
+EXPECTED_SCORES = {
+    (True, True, True): 100,
+    (True, True, False): 90,
+    (True, False, True): 85,
+    (True, False, False): 80,
+    (False, True, True): 60,
+    (False, False, True): 60,
+    (False, True, False): 40,
+    (False, False, False): 40,
+}
+
+SCORE_WITH_NODE_JS = """
+const { DEFAULT_RULESET, scoreFeatures } = await import(process.argv[1]);
+const combos = JSON.parse(process.argv[2]);
+process.stdout.write(JSON.stringify(combos.map(([has_ec2_info, has_elastic_ip, has_avatar]) =>
+  scoreFeatures(DEFAULT_RULESET, { has_ec2_info, has_elastic_ip, has_avatar }))));
+"""
+
+
+def test_default_rules() -> bool:
+    print('=== 检查初始评分规则 ===')
+    rules = load_default_rules()['rules']
+    ok = True
+    for combo, expected in EXPECTED_SCORES.items():
+        actual = score_features(rules, dict(zip(FEATURES, combo)))
+        if actual != expected:
+            print(f'❌ {dict(zip(FEATURES, combo))}: 期望 {expected}，实际 {actual}')
+            ok = False
+    if ok:
+        print('✅ scoring_rules.json 与原先的评分结果一致')
+    return ok
+
+
+def test_migration_seed() -> bool:
+    print('=== 检查 migrate-scoring-rules.sql 的初始规则 ===')
+    with open(os.path.join(HERE, 'migrate-scoring-rules.sql'), encoding='utf-8') as f:
+        sql = f.read()
+    literal = {'true': True, 'false': False, 'NULL': None}
+    seeded = [
+        {'priority': int(priority), 'has_ec2_info': literal[ec2], 'has_elastic_ip': literal[eip],
+         'has_avatar': literal[avatar], 'score': int(score)}
+        for priority, ec2, eip, avatar, score in re.findall(
+            r'\(1, (\d+), (\w+), (\w+), (\w+), (\d+), ', sql)
+    ]
+    expected = [{key: rule[key] for key in ('priority', *FEATURES, 'score')} for rule in load_default_rules()['rules']]
+    if seeded != expected:
+        print(f'❌ 初始规则不一致:\n   SQL:  {seeded}\n   JSON: {expected}')
+        return False
+    print('✅ 迁移脚本的初始规则与 scoring_rules.json 一致')
+    return True
+
+
+def test_server_scoring() -> bool:
+    print('=== 检查 scoring.js ===')
+    if shutil.which('node') is None:
+        print('⚠️  没有 node，跳过')
+        return True
+    combos = list(EXPECTED_SCORES)
+    result = subprocess.run(
+        ['node', '--input-type=module', '-e', SCORE_WITH_NODE_JS,
+         'file://' + os.path.join(HERE, 'scoring.js'), json.dumps(combos)],
+        capture_output=True, text=True
+    )
+    if result.returncode != 0:
+        print(f'❌ scoring.js 执行失败: {result.stderr.strip()}')
+        return False
+    actual = json.loads(result.stdout)
+    expected = [EXPECTED_SCORES[combo] for combo in combos]
+    if actual != expected:
+        print(f'❌ scoring.js 评分不一致: 期望 {expected}，实际 {actual}')
+        return False
+    print('✅ scoring.js 与 Python 的评分结果一致')
+    return True
+
+
+def test_vectorized_rescore() -> bool:
+    print('=== 检查向量化评分 ===')
+    try:
+        import numpy as np
+    except ImportError:
+        print('⚠️  没有 numpy，跳过')
+        return True
+    from exercise1.rescore import evaluate_rules
+
+    # 第二个版本: 弹性IP变为必需，头像加分降低，不满足任何规则时为0分
+    rules_v2 = [
+        {'priority': 10, 'has_ec2_info': True, 'has_elastic_ip': True, 'has_avatar': True, 'score': 100},
+        {'priority': 20, 'has_ec2_info': True, 'has_elastic_ip': True, 'has_avatar': None, 'score': 95},
+        {'priority': 30, 'has_ec2_info': True, 'has_elastic_ip': False, 'has_avatar': None, 'score': 50},
+    ]
+    rng = random.Random(35)
+    rows = [tuple(rng.random() < 0.7 for _ in FEATURES) for _ in range(5000)]
+    rows += list(itertools.product((True, False), repeat=len(FEATURES)))
+    features = {name: np.array([row[index] for row in rows]) for index, name in enumerate(FEATURES)}
+
+    ok = True
+    for title, rules in (('初始规则', load_default_rules()['rules']), ('第二个版本', rules_v2)):
+        vectorized = evaluate_rules(rules, features).tolist()
+        expected = [score_features(rules, dict(zip(FEATURES, row))) for row in rows]
+        mismatches = sum(1 for a, b in zip(vectorized, expected) if a != b)
+        if mismatches:
+            print(f'❌ {title}: {mismatches} 行的向量化评分与逐行评分不同')
+            ok = False
+    if ok:
+        print(f'✅ {len(rows)} 行的向量化评分与逐行评分一致')
+    return ok
+
+
+if __name__ == '__main__':
+    results = [test_default_rules(), test_migration_seed(), test_server_scoring(), test_vectorized_rescore()]
+    sys.exit(0 if all(results) else 1)